@@ -1,20 +1,28 @@
 
 import os
-import time
 from decimal import Decimal
 import asyncio
-import requests
 from web3 import Web3
+from openai import APIConnectionError, APIStatusError, APITimeoutError
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     ApplicationBuilder, CommandHandler, MessageHandler,
     CallbackQueryHandler, ContextTypes, filters
 )
-from yield_farming.AvaYieldInteractor import AvaYieldInteractor
+from yield_farming.AvaYieldInteractor import interactor_pool
 from dotenv import load_dotenv
 from packages.wallet import create_wallet, import_wallet, get_wallet_balance
-from packages.nlp import parse_command_nlp
-from packages.bungee import get_quote, CHAIN_IDS, get_token_address, execute_transaction
+from packages.providers import providers, get_web3
+from packages.fee_oracle import fee_oracle
+from packages.bridge_tracker import bridge_tracker
+from packages.confirmation import confirmation_watcher
+from packages.token_refresh import token_refresher
+from packages.entity_resolver import entity_resolver, suggestions
+from packages.nlp import async_parse_command_nlp
+from packages.conversation import conversations
+from packages.transcription import transcriber
+from packages.update_processor import PerUserUpdateProcessor
+from packages.bungee import async_get_quote, check_route, CHAIN_IDS, get_token_address, execute_transaction, async_prepare_transaction
 
 # ------------------------------
 # Configuration and Setup
@@ -28,8 +36,9 @@ BUNGEE_API_KEY = os.getenv("BUNGEE_API_KEY")
 # Set the base URL for the Socket (Bungee) API v2
 BASE_URL = "https://api.socket.tech/v2"
 
-# Set up DeepSeek and Web3 providers
-w3 = Web3(Web3.HTTPProvider(WEB3_PROVIDER))
+# Web3 instances come from the per-chain provider registry (packages/providers.py)
+AVALANCHE_CHAIN_ID = CHAIN_IDS["Avalanche"]
+AVAYIELD_CONTRACT_ADDRESS = os.getenv("AVAYIELD_CONTRACT_ADDRESS", "0x8B414448de8B609e96bd63Dcf2A8aDbd5ddf7fdd")
 
 # In-memory storage for user wallets and pending transactions (use a secure database in production)
 user_wallets = {}         # key: Telegram user_id, value: wallet dict {address, private_key}
@@ -83,93 +92,93 @@ async def wallet_details_handler(update: Update, context: ContextTypes.DEFAULT_T
     if not wallet:
         await update.message.reply_text("No wallet found. Use /createwallet or /importwallet to set up your wallet.")
         return
-    balance = get_wallet_balance(wallet["address"])
+    balance = await asyncio.to_thread(get_wallet_balance, wallet["address"])
     await update.message.reply_text(
         f"Your Wallet Details:\nAddress: {wallet['address']}\nBalance: {balance} ETH"
     )
 
 
 async def handle_voice_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    voice = update.message.voice
+
+    async def download():
+        # Keep the note in memory; nothing touches the disk
+        voice_file = await context.bot.get_file(voice.file_id)
+        return await voice_file.download_as_bytearray()
+
     try:
-        # Get the voice message file
-        voice_file = await context.bot.get_file(update.message.voice.file_id)
-        voice_path = f"voice_message_{update.message.from_user.id}.ogg"
-        
-        try:
-            # Download the voice file
-            await voice_file.download_to_drive(voice_path)
-            
-            # Send OGG file to OpenAI Whisper API
-            with open(voice_path, "rb") as audio_file:
-                response = requests.post(
-                    "https://api.openai.com/v1/audio/transcriptions",
-                    headers={"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}"},
-                    files={"file": audio_file},
-                    data={"model": "whisper-1"},
-                    timeout=30
-                )
-            
-            if response.status_code == 200:
-                transcribed_text = response.json().get("text", "").strip()
-                if transcribed_text:
-                    # Inform the user what was transcribed
-                    await update.message.reply_text(f"🗣 Voice message transcribed: {transcribed_text}")
-                    
-                    # Get the original message's date as a Unix timestamp
-                    date_timestamp = int(update.message.date.timestamp())
-                    
-                    # Create message dictionary with proper date format
-                    message_dict = {
-                        "message_id": update.message.message_id,
-                        "date": date_timestamp,  # Use Unix timestamp
-                        "chat": update.message.chat.to_dict(),
-                        "from": update.message.from_user.to_dict(),
-                        "text": transcribed_text
-                    }
-                    
-                    # Create a new Update object with the proper message format
-                    new_update = Update.de_json(
-                        {
-                            "update_id": update.update_id,
-                            "message": message_dict
-                        },
-                        context.bot
-                    )
-                    
-                    # Process the transcribed text as a command
-                    await handle_message(new_update, context)
-                else:
-                    await update.message.reply_text("⚠️ No text was detected in the voice message.")
-            else:
-                error_msg = response.json().get("error", {}).get("message", "Unknown error")
-                await update.message.reply_text(f"❌ Transcription failed: {error_msg}")
-                
-        except requests.exceptions.Timeout:
-            await update.message.reply_text("❌ Request timed out. Please try again.")
-        except requests.exceptions.RequestException as e:
-            await update.message.reply_text(f"❌ Network error occurred: {str(e)}")
-        except Exception as e:
-            await update.message.reply_text(f"❌ Error processing voice message: {str(e)}")
-            print(f"Debug - Error details: {str(e)}")  # Added debug print
-            
-    finally:
-        # Clean up the temporary file
-        if 'voice_path' in locals() and os.path.exists(voice_path):
-            try:
-                os.remove(voice_path)
-            except Exception as e:
-                print(f"Warning: Could not remove temporary file {voice_path}: {str(e)}")
+        transcribed_text = await transcriber.transcribe(voice.file_unique_id, download)
+    except APITimeoutError:
+        await update.message.reply_text("❌ Request timed out. Please try again.")
+        return
+    except APIConnectionError as e:
+        await update.message.reply_text(f"❌ Network error occurred: {str(e)}")
+        return
+    except APIStatusError as e:
+        await update.message.reply_text(f"❌ Transcription failed: {e.message}")
+        return
+    except Exception as e:
+        await update.message.reply_text(f"❌ Error processing voice message: {str(e)}")
+        print(f"Debug - Error details: {str(e)}")
+        return
+
+    if not transcribed_text:
+        await update.message.reply_text("⚠️ No text was detected in the voice message.")
+        return
+
+    # Inform the user what was transcribed, then process it as a command
+    await update.message.reply_text(f"🗣 Voice message transcribed: {transcribed_text}")
+    await process_command(update.message, transcribed_text)
 
 
+def avayield_strategy(private_key):
+    """AvaYield interactor for a user's key from the process-wide pool."""
+    return interactor_pool.get(
+        providers.rpc_url(AVALANCHE_CHAIN_ID),
+        AVAYIELD_CONTRACT_ADDRESS,
+        private_key,
+        w3=get_web3(AVALANCHE_CHAIN_ID)
+    )
+
+def _ignore_failure(task):
+    # A preview nobody confirms still finishes; mark its error as seen so asyncio doesn't log it
+    if not task.cancelled():
+        task.exception()
+
+def discard_pending_transaction(user_id):
+    """Forget the user's pending transaction and stop building it. Returns the entry, or None."""
+    pending = pending_transactions.pop(user_id, None)
+    if pending is not None:
+        pending["prepared"].cancel()
+    return pending
+
+def resolve_token_address(chain_id, symbol):
+    """Registry symbol and address for a token symbol or an alias of it; the error suggests close symbols."""
+    symbol = entity_resolver.resolve_token(chain_id, symbol) or symbol
+    try:
+        return symbol, get_token_address(chain_id, symbol)
+    except ValueError as e:
+        names = suggestions(entity_resolver.token_candidates(chain_id, symbol))
+        if names:
+            raise ValueError(f"{e} Did you mean {' or '.join(names)}?") from e
+        raise
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = update.message.from_user.id
-    text = update.message.text
+    await process_command(update.message, update.message.text)
 
-    # Process command with NLP
-    command_data = parse_command_nlp(text)
+async def process_command(message, text):
+    """Parse and run a text command; replies go to `message`, the text or voice message it came from."""
+    user_id = message.from_user.id
+
+    # Follow-ups like "same but 50" or "now to Arbitrum" patch the previous command locally
+    command_data = conversations.apply_delta(user_id, text)
+    if command_data is None:
+        # Process command with NLP
+        command_data = await async_parse_command_nlp(text)
     if not command_data:
-        await update.message.reply_text("❌ Couldn't understand command. Try: 'Transfer 100 USDC from Ethereum to Binance Smart Chain'")
+        await message.reply_text("❌ Couldn't understand command. Try: 'Transfer 100 USDC from Ethereum to Binance Smart Chain'")
         return
+    conversations.remember(user_id, command_data)
     
     action = command_data.get("action")
     if action == "cross_chain_send&transfer":
@@ -180,25 +189,28 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         to_token_symbol = command_data.get("to_token")
         amount = command_data.get("amount")
 
-        # Validate chain names
-        from_chain_id = CHAIN_IDS.get(from_chain_name)
-        to_chain_id = CHAIN_IDS.get(to_chain_name)
+        # Validate chain names, accepting aliases ("BSC", "avax c-chain") and small misspellings
+        from_chain_id = CHAIN_IDS.get(entity_resolver.resolve_chain(from_chain_name))
+        to_chain_id = CHAIN_IDS.get(entity_resolver.resolve_chain(to_chain_name))
         if not from_chain_id or not to_chain_id:
-            await update.message.reply_text("❌ Invalid chain name. Supported chains: Ethereum, Binance Smart Chain, Polygon, Avalanche, Arbitrum, Optimism, Base.")
+            unknown = from_chain_name if not from_chain_id else to_chain_name
+            names = suggestions(entity_resolver.chain_candidates(unknown))
+            hint = f" Did you mean {' or '.join(names)}?" if names else ""
+            await message.reply_text(f"❌ Invalid chain name '{unknown}'.{hint} Supported chains: {', '.join(CHAIN_IDS)}.")
             return
 
-        # Fetch token addresses from the registry
+        # Fetch token addresses from the registry, resolving spellings like "usdc.e" to registry symbols
         try:
-            from_token_address = get_token_address(from_chain_id, from_token_symbol)
-            to_token_address = get_token_address(to_chain_id, to_token_symbol)
+            from_token_symbol, from_token_address = resolve_token_address(from_chain_id, from_token_symbol)
+            to_token_symbol, to_token_address = resolve_token_address(to_chain_id, to_token_symbol)
         except ValueError as e:
-            await update.message.reply_text(f"❌ {str(e)}")
+            await message.reply_text(f"❌ {str(e)}")
             return
 
         # Get user wallet address
         user_wallet = user_wallets.get(user_id, {}).get("address")
         if not user_wallet:
-            await update.message.reply_text("⚠️ Please create/import a wallet first!")
+            await message.reply_text("⚠️ Please create/import a wallet first!")
             return
 
         print(f"Migration request: {from_chain_name} -> {to_chain_name} | {amount} {from_token_symbol} -> {to_token_symbol}")
@@ -207,9 +219,15 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         print(f"User Wallet: {user_wallet}")
         print(f"Command Data: {command_data}")
 
+        # Reject transfers that can't be routed without spending a quote call
+        reason = check_route(from_chain_id, from_token_address, to_chain_id, to_token_address)
+        if reason:
+            await message.reply_text(f"❌ {reason}")
+            return
+
         # Get Bungee quote
         try:
-            quote = get_quote(
+            quote = await async_get_quote(
                 from_chain_id=from_chain_id,
                 from_token_address=from_token_address,
                 to_chain_id=to_chain_id,
@@ -221,11 +239,11 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 single_tx_only=True
             )
         except Exception as e:
-            await update.message.reply_text(f"❌ Failed to get migration quote: {str(e)}")
+            await message.reply_text(f"❌ Failed to get migration quote: {str(e)}")
             return
         
         if not quote.get("result", {}).get("routes"):
-            await update.message.reply_text("❌ No routes available for the provided parameters.")
+            await message.reply_text("❌ No routes available for the provided parameters.")
             return
 
         # Extract the first route from the quote
@@ -239,17 +257,25 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"• From: {from_chain_name} (Chain ID: {from_chain_id})\n"
             f"• To: {to_chain_name} (Chain ID: {to_chain_id})\n"
             f"• Amount: {amount} {from_token_symbol}\n"
-            f"• From Token Address: {from_token_address}\n"
-            f"• To Token Address: {to_token_address}\n\n"
+            f"• From Token: {from_token_symbol} ({from_token_address})\n"
+            f"• To Token: {to_token_symbol} ({to_token_address})\n\n"
             f"**Available Bridge Routes:**\n{bridge_names}\n\n"
             "Confirm to proceed with this transaction."
         )
 
-        # Save pending transaction details
+        # Start building and signing the transaction while the user reads the preview,
+        # so Confirm only has to broadcast it
+        private_key = user_wallets[user_id]["private_key"]
+        prepared = asyncio.create_task(async_prepare_transaction(route, user_wallet, private_key))
+        prepared.add_done_callback(_ignore_failure)
+
+        # Save pending transaction details, replacing (and no longer building) any earlier preview
+        discard_pending_transaction(user_id)
         pending_transactions[user_id] = {
             "quote": quote,
             "wallet": user_wallet,
-            "command_data": command_data
+            "command_data": command_data,
+            "prepared": prepared
         }
 
         # Confirmation buttons
@@ -257,40 +283,30 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             InlineKeyboardButton("✅ Confirm", callback_data="confirm"),
             InlineKeyboardButton("❌ Cancel", callback_data="cancel")
         ]]
-        await update.message.reply_text(
+        await message.reply_text(
             preview_message,
             reply_markup=InlineKeyboardMarkup(keyboard),
             parse_mode="Markdown"
         )
     else:
-        user_id = update.message.from_user.id
+        user_id = message.from_user.id
         user_wallet = user_wallets.get(user_id, {}).get("address")
         private_key = user_wallets.get(user_id, {}).get("private_key")
 
         if not user_wallet:
-            await update.message.reply_text("⚠️ Please create/import a wallet first!")
+            await message.reply_text("⚠️ Please create/import a wallet first!")
             return
 
-        # Read environment variables to set contract address and RPC URL
-        CONTRACT_ADDRESS = os.getenv("AVAYIELD_CONTRACT_ADDRESS", "0x8B414448de8B609e96bd63Dcf2A8aDbd5ddf7fdd")
-        RPC_URL = os.getenv("AVAX_RPC_URL", "https://api.avax.network/ext/bc/C/rpc")
-
-        print("Initializing AvaYield Strategy Interactor...")
-
-        # Create AvaYield Interactor object
-        strategy = AvaYieldInteractor(
-            rpc_url=RPC_URL,
-            contract_address=CONTRACT_ADDRESS,
-            private_key=private_key
-        )
+        # Pooled AvaYield Interactor: the contract object and RPC connection are shared
+        strategy = avayield_strategy(private_key)
         if action == "get_pool_deposits":
             try:
-                # Fetch wallet AVAX balance
-                balance_wei = strategy.w3.eth.get_balance(strategy.account.address)
-                balance_avax = Web3.from_wei(balance_wei, "ether")
-
-                # Fetch the total deposits in the AvaYield strategy
-                total_deposits = strategy.get_pool_deposits()
+                # Wallet AVAX balance and the total deposits in the AvaYield strategy, in one round-trip
+                position = await asyncio.to_thread(strategy.get_my_position)
+                if position is None:
+                    raise Exception("Could not read the strategy state.")
+                balance_avax = position["wallet_balance"]
+                total_deposits = position["total_deposits"]
 
                 # Generate interactive message
                 response_message = (
@@ -300,15 +316,15 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     f"• **Total Deposits in Strategy:** {total_deposits:.4f} AVAX\n"
                 )
 
-                await update.message.reply_text(response_message, parse_mode="Markdown")
+                await message.reply_text(response_message, parse_mode="Markdown")
 
             except Exception as e:
                 print(f"\nError occurred: {str(e)}")
-                await update.message.reply_text(f"❌ Error fetching AvaYield data: {str(e)}")
+                await message.reply_text(f"❌ Error fetching AvaYield data: {str(e)}")
         elif action == "get_pool_rewards":
             try:
                 # Check current rewards
-                rewards = strategy.get_pool_rewards()
+                rewards = await asyncio.to_thread(strategy.get_pool_rewards)
                 print(f"Current Rewards: {rewards} AVAX")
 
                 # Generate interactive message
@@ -317,14 +333,14 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     f"• **Wallet Address:** `{user_wallet}`\n"
                     f"• **Current Rewards:** {rewards:.3f} AVAX 🏆\n"
                 )
-                await update.message.reply_text(response_message, parse_mode="Markdown")
+                await message.reply_text(response_message, parse_mode="Markdown")
             except Exception as e:
                 print(f"\nError occurred: {str(e)}")
-                await update.message.reply_text(f"❌ Error fetching AvaYield rewards: {str(e)}")
+                await message.reply_text(f"❌ Error fetching AvaYield rewards: {str(e)}")
         elif action == "get_leverage":
             try:
                 # Check current leverage
-                leverage = strategy.get_leverage()
+                leverage = await asyncio.to_thread(strategy.get_leverage)
                 print(f"Current Leverage: {leverage}x")
 
                 # Generate interactive message
@@ -333,14 +349,14 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     f"• **Wallet Address:** `{user_wallet}`\n"
                     f"• **Current Leverage:** {leverage:.4f}x 🔥\n"
                 )
-                await update.message.reply_text(response_message, parse_mode="Markdown")
+                await message.reply_text(response_message, parse_mode="Markdown")
             except Exception as e:
                 print(f"\nError occurred: {str(e)}")
-                await update.message.reply_text(f"❌ Error fetching AvaYield leverage: {str(e)}")
+                await message.reply_text(f"❌ Error fetching AvaYield leverage: {str(e)}")
         elif action == 'get_my_balance':
             try:
                 # Check user balance
-                user_balance = strategy.w3.eth.get_balance(strategy.account.address)
+                user_balance = await asyncio.to_thread(strategy.w3.eth.get_balance, strategy.account.address)
                 print(f"\nWallet Balance: {Web3.from_wei(user_balance, 'ether')} AVAX")
 
                 # Generate interactive message
@@ -349,14 +365,14 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     f"• **Wallet Address:** `{user_wallet}`\n"
                     f"• **Your Balance:** {Web3.from_wei(user_balance, 'ether'):.3f} shares 🚀\n"
                 )
-                await update.message.reply_text(response_message, parse_mode="Markdown")
+                await message.reply_text(response_message, parse_mode="Markdown")
             except Exception as e:
                 print(f"\nError occurred: {str(e)}")
-                await update.message.reply_text(f"❌ Error fetching AvaYield user balance: {str(e)}")
+                await message.reply_text(f"❌ Error fetching AvaYield user balance: {str(e)}")
         elif action == 'get_my_rewards':
             try:
                 # Check user rewards
-                user_rewards = strategy.get_my_rewards()
+                user_rewards = await asyncio.to_thread(strategy.get_my_rewards)
                 print(f"User Rewards: {Web3.from_wei(user_rewards, 'ether')} AVAX")
                 # Generate interactive message
                 response_message = (
@@ -364,14 +380,14 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     f"• **Wallet Address:** `{user_wallet}`\n"
                     f"• **Your Rewards:** {Web3.from_wei(user_rewards, 'ether'):.3f} AVAX 🏆\n"
                 )
-                await update.message.reply_text(response_message, parse_mode="Markdown")
+                await message.reply_text(response_message, parse_mode="Markdown")
             except Exception as e:
                 print(f"\nError occurred: {str(e)}")
-                await update.message.reply_text(f"❌ Error fetching AvaYield user rewards: {str(e)}")
+                await message.reply_text(f"❌ Error fetching AvaYield user rewards: {str(e)}")
         elif action == 'check_apr':
             try:
                 # Check APR
-                apr = strategy.get_apr()
+                apr = await asyncio.to_thread(strategy.get_apr)
                 print(f"\nEstimated APR: {apr:.3f}%")
                 # Generate interactive message
                 response_message = (
@@ -379,20 +395,20 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     f"• **Wallet Address:** `{user_wallet}`\n"
                     f"• **Estimated APR:** {apr:.3f}% 💸\n"
                 )
-                await update.message.reply_text(response_message, parse_mode="Markdown")
+                await message.reply_text(response_message, parse_mode="Markdown")
             except Exception as e:
                 print(f"\nError occurred: {str(e)}")
-                await update.message.reply_text(f"❌ Error fetching AvaYield APR: {str(e)}")
+                await message.reply_text(f"❌ Error fetching AvaYield APR: {str(e)}")
         elif action == 'deposits':
             amount_avax = command_data.get('amount_avax') # 假设用户输入的是金额
             if not amount_avax:
-                await update.message.reply_text("❌ Please provide the amount of AVAX to deposit.")
+                await message.reply_text("❌ Please provide the amount of AVAX to deposit.")
                 return
 
             print(f"\n--- Depositing {amount_avax} AVAX ---")
 
             # Fetch current balance
-            balance_before = strategy.w3.eth.get_balance(strategy.account.address)
+            balance_before = await asyncio.to_thread(strategy.w3.eth.get_balance, strategy.account.address)
             balance_before_avax = Web3.from_wei(balance_before, 'ether')
 
             # Build a preview message
@@ -412,16 +428,19 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 InlineKeyboardButton("✅ Confirm", callback_data=callback_data_confirm),
                 InlineKeyboardButton("❌ Cancel", callback_data=callback_data_cancel)
             ]]
-            await update.message.reply_text(
+            await message.reply_text(
                 preview_message,
                 reply_markup=InlineKeyboardMarkup(keyboard),
                 parse_mode="Markdown"
             )
         elif action == 'reinvest_rewards':
             print("\n--- Reinvesting Rewards ---")
-            # Fetch pending rewards
-            rewards = strategy.get_my_rewards()
-            min_reinvest = Web3.from_wei(strategy.contract.functions.MIN_TOKENS_TO_REINVEST().call(), 'ether')
+            # Pending rewards and the reinvest threshold, read together
+            position = await asyncio.to_thread(strategy.get_my_position)
+            if position is None:
+                await message.reply_text("❌ Could not read your position. Please try again.")
+                return
+            rewards, min_reinvest = position["my_rewards"], position["min_reinvest"]
 
             if rewards >= min_reinvest:
                 # Build a preview message
@@ -437,18 +456,18 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     InlineKeyboardButton("✅ Confirm", callback_data="confirm_reinvest"),
                     InlineKeyboardButton("❌ Cancel", callback_data="cancel_reinvest")
                 ]]
-                await update.message.reply_text(
+                await message.reply_text(
                     preview_message,
                     reply_markup=InlineKeyboardMarkup(keyboard),
                     parse_mode="Markdown"
                 )
             else:
                 print(f"Not enough rewards to reinvest. Need at least {min_reinvest} AVAX.")
-                await update.message.reply_text(f"❌ Not enough rewards to reinvest. Need at least {min_reinvest} AVAX.")
+                await message.reply_text(f"❌ Not enough rewards to reinvest. Need at least {min_reinvest} AVAX.")
         elif action == 'withdraw_rewards':
             print("\n--- Withdrawing Only Rewards ---")
             # Fetch pending rewards
-            rewards = strategy.get_my_rewards()  # Get user's pending rewards in AVAX
+            rewards = await asyncio.to_thread(strategy.get_my_rewards)  # Get user's pending rewards in AVAX
             if rewards > 0:
                 # Build a preview message
                 preview_message = (
@@ -462,23 +481,23 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     InlineKeyboardButton("✅ Confirm", callback_data="confirm_withdraw"),
                     InlineKeyboardButton("❌ Cancel", callback_data="cancel_withdraw")
                 ]]
-                await update.message.reply_text(
+                await message.reply_text(
                     preview_message,
                     reply_markup=InlineKeyboardMarkup(keyboard),
                     parse_mode="Markdown"
                 )
             else:
                 print("No rewards available to withdraw.")
-                await update.message.reply_text("❌ No rewards available to withdraw.")
+                await message.reply_text("❌ No rewards available to withdraw.")
         elif action == 'withdraw_partial':
             # Extract the percentage of shares to withdraw
             percentage = command_data.get("percentage")
             if not percentage:
-                await update.message.reply_text("❌ Please provide the percentage of shares to withdraw.")
+                await message.reply_text("❌ Please provide the percentage of shares to withdraw.")
                 return
 
             # Fetch the user's current shares
-            user_shares = Decimal(strategy.get_my_balance())
+            user_shares = Decimal(await asyncio.to_thread(strategy.get_my_balance))
 
             if user_shares > 0:
                 # Calculate the withdrawal amount
@@ -497,19 +516,22 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     InlineKeyboardButton("✅ Confirm", callback_data=f"confirm_withdraw_shares:{percentage}"),
                     InlineKeyboardButton("❌ Cancel", callback_data="cancel_withdraw_shares")
                 ]]
-                await update.message.reply_text(
+                await message.reply_text(
                     preview_message,
                     reply_markup=InlineKeyboardMarkup(keyboard),
                     parse_mode="Markdown"
                 )
             else:
                 print("No shares to withdraw.")
-                await update.message.reply_text("❌ No shares to withdraw.")
+                await message.reply_text("❌ No shares to withdraw.")
         elif action == 'withdraw_everything':
             print("\n--- Withdrawing Everything ---")
             # Fetch user's rewards and shares
-            rewards = strategy.get_my_rewards()
-            user_shares = Decimal(strategy.get_my_balance())
+            position = await asyncio.to_thread(strategy.get_my_position)
+            if position is None:
+                await message.reply_text("❌ Could not read your position. Please try again.")
+                return
+            rewards, user_shares = position["my_rewards"], Decimal(position["my_shares"])
 
             preview_message = (
                 f"🚀 Withdraw Everything Preview:\n"
@@ -522,7 +544,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 InlineKeyboardButton("✅ Confirm", callback_data="confirm_withdraw_all"),
                 InlineKeyboardButton("❌ Cancel", callback_data="cancel_withdraw_all")
             ]]
-            await update.message.reply_text(
+            await message.reply_text(
                 preview_message,
                 reply_markup=InlineKeyboardMarkup(keyboard),
                 parse_mode="Markdown"
@@ -530,16 +552,41 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 
+async def wallet_avax_balance(strategy):
+    balance_wei = await asyncio.to_thread(strategy.w3.eth.get_balance, strategy.account.address)
+    return Web3.from_wei(balance_wei, "ether")
+
+async def watch_confirmation(query, w3, tx_hash, action, describe):
+    """
+    Show `action` as pending and return right away; the confirmation watcher edits
+    in the outcome once the transaction is mined. `describe(receipt)` is awaited
+    for the success text, e.g. with post-transaction balances.
+    """
+    tx = Web3.to_hex(tx_hash)
+    links = f"Transaction hash: {tx}\nTrack on: https://www.snowtrace.io/tx/{tx}"
+    await query.edit_message_text(f"⏳ {action} submitted, waiting for confirmation...\n{links}")
+
+    async def confirmed(receipt):
+        try:
+            text = await describe(receipt)
+        except Exception as e:
+            text = f"✅ {action} confirmed, but the new balances couldn't be read: {str(e)}"
+        await query.edit_message_text(f"{text}\n{links}")
+
+    async def failed(error):
+        await query.edit_message_text(f"❌ {action} failed: {str(error)}\n{links}")
+
+    confirmation_watcher.watch(w3, tx_hash, confirmed, failed)
+
 async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     user_id = query.from_user.id
     await query.answer()
 
     if query.data == "cancel":
-        if user_id not in pending_transactions:
+        if discard_pending_transaction(user_id) is None:
             await query.edit_message_text("⚠️ Transaction expired. Please start over.")
             return
-        pending_transactions.pop(user_id)
         await query.edit_message_text("❌ Transaction cancelled.")
         return
     if query.data == "confirm":
@@ -551,27 +598,30 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         private_key = user_wallets[user_id]["private_key"]
         route = pending["quote"]["result"]["routes"][0]
 
+        # Use the transaction prepared at preview time; if that failed, execute_transaction rebuilds it
+        try:
+            prepared = await pending["prepared"]
+        except Exception as e:
+            print(f"Prepared transaction unavailable, rebuilding: {e}")
+            prepared = None
+
         try:
-            tx_hash = await execute_transaction(user_id, route, private_key, user_wallets)
+            tx_hash = await execute_transaction(user_id, route, private_key, user_wallets, prepared)
+            # Tell the user when the transfer lands (or fails) on the destination chain
+            bridge_tracker.register(user_id, tx_hash, route["fromChainId"], route["toChainId"])
             message = (
                 f"✅ Transaction submitted successfully!\n"
                 f"Hash: {tx_hash}\n"
-                f"Track on: https://www.socketscan.io/tx/{tx_hash}"
+                f"Track on: https://www.socketscan.io/tx/{tx_hash}\n"
+                f"I'll message you when the bridge transfer completes."
             )
         except Exception as e:
             message = f"❌ Transaction failed: {str(e)}"
 
         await query.edit_message_text(message)
     
-    # Read environment variables to set contract address and RPC URL
-    CONTRACT_ADDRESS = os.getenv("AVAYIELD_CONTRACT_ADDRESS", "0x8B414448de8B609e96bd63Dcf2A8aDbd5ddf7fdd")
-    RPC_URL = os.getenv("AVAX_RPC_URL", "https://api.avax.network/ext/bc/C/rpc")
-    # Create AvaYield Interactor object
-    strategy = AvaYieldInteractor(
-        rpc_url=RPC_URL,
-        contract_address=CONTRACT_ADDRESS,
-        private_key=user_wallets[user_id]["private_key"]
-    )
+    # Pooled AvaYield Interactor: the contract object and RPC connection are shared
+    strategy = avayield_strategy(user_wallets[user_id]["private_key"])
     if query.data == "cancel_deposit":
         await query.edit_message_text("❌ Deposit cancelled.")
         return
@@ -583,30 +633,23 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Deposit AVAX into the strategy
         print(f"\n--- Depositing {amount_avax} AVAX ---")
         try:
-            receipt = strategy.deposit(Decimal(amount_avax))
-            if receipt:
-                print(f"Deposit successful! Transaction hash: {receipt['transactionHash'].hex()}")
-            else:
+            tx_hash = await asyncio.to_thread(strategy.deposit, Decimal(amount_avax), False)
+            if tx_hash is None:
                 raise Exception("Deposit failed.")
+        except Exception as e:
+            await query.edit_message_text(f"❌ Deposit failed: {str(e)}")
+            return
 
-            time.sleep(10)  # Wait for confirmation
-
-            balance_after = strategy.w3.eth.get_balance(strategy.account.address)
+        async def deposited(receipt):
+            balance_after = await asyncio.to_thread(strategy.w3.eth.get_balance, strategy.account.address)
             difference = Web3.from_wei(balance_before - balance_after, 'ether')
             print(f"Balance change after deposit: {difference} AVAX (includes gas fees)")
-            print("--------------------------------\n")
-
-            # Send success message to the user
-            message = (
+            return (
                 f"✅ Deposit successful!\n"
-                f"Transaction hash: {receipt['transactionHash'].hex()}\n"
-                f"Track on: https://www.snowtrace.io/tx/{receipt['transactionHash'].hex()}\n"
                 f"Balance change: {difference:.3f} AVAX (includes gas fees)"
             )
-        except Exception as e:
-            message = f"❌ Deposit failed: {str(e)}"
 
-        await query.edit_message_text(message)
+        await watch_confirmation(query, strategy.w3, tx_hash, "Deposit", deposited)
 
     # Handle cancel operation
     if query.data == "cancel_reinvest":
@@ -616,22 +659,24 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Handle reinvest confirmation
     if query.data == "confirm_reinvest":
         # Fetch pending rewards
-        rewards = strategy.get_my_rewards()
+        rewards = await asyncio.to_thread(strategy.get_my_rewards)
 
         # Execute reinvestment
         print(f"Reinvesting {rewards} AVAX...")
         try:
-            strategy.reinvest()
-            time.sleep(10)  # Wait for transaction confirmation
-            new_rewards = strategy.get_my_rewards()
-            print(f"Rewards after reinvest: {new_rewards} AVAX (should be 0 or near 0)")
-
-            # Send success message to the user
-            message = f"✅ Reinvestment successful! New rewards: {new_rewards} AVAX"
+            tx_hash = await asyncio.to_thread(strategy.reinvest, False)
+            if tx_hash is None:
+                raise Exception("Reinvest transaction could not be sent.")
         except Exception as e:
-            message = f"❌ Reinvestment failed: {str(e)}"
+            await query.edit_message_text(f"❌ Reinvestment failed: {str(e)}")
+            return
 
-        await query.edit_message_text(message)
+        async def reinvested(receipt):
+            new_rewards = await asyncio.to_thread(strategy.get_my_rewards, receipt["blockNumber"])
+            print(f"Rewards after reinvest: {new_rewards} AVAX (should be 0 or near 0)")
+            return f"✅ Reinvestment successful! New rewards: {new_rewards} AVAX"
+
+        await watch_confirmation(query, strategy.w3, tx_hash, "Reinvestment", reinvested)
 
     if query.data == "cancel_withdraw":
         await query.edit_message_text("❌ Withdrawal canceled.")
@@ -639,23 +684,23 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     if query.data == "confirm_withdraw":
         # Fetch pending rewards
-        rewards = strategy.get_my_rewards()
+        rewards = await asyncio.to_thread(strategy.get_my_rewards)
 
         # Execute withdrawal
         print(f"Attempting to withdraw {rewards} AVAX directly...")
         try:
-            receipt = strategy.withdraw(rewards)  # Attempt direct AVAX withdrawal
-            if receipt:
-                print(f"Withdrawal successful! Transaction hash: {receipt['transactionHash'].hex()}")
-
-                # Send success message to the user
-                message = f"✅ Withdrawal successful! Transaction hash: {receipt['transactionHash'].hex()}"
-            else:
+            tx_hash = await asyncio.to_thread(strategy.withdraw, rewards, False)  # Attempt direct AVAX withdrawal
+            if tx_hash is None:
                 raise Exception("Withdrawal failed! Check contract requirements.")
         except Exception as e:
-            message = f"❌ Withdrawal failed: {str(e)}"
+            await query.edit_message_text(f"❌ Withdrawal failed: {str(e)}")
+            return
 
-        await query.edit_message_text(message)
+        async def withdrawn(receipt):
+            balance = await wallet_avax_balance(strategy)
+            return f"✅ Withdrawal successful! {rewards} AVAX withdrawn.\nWallet balance: {balance:.3f} AVAX"
+
+        await watch_confirmation(query, strategy.w3, tx_hash, "Withdrawal", withdrawn)
 
     if query.data == "cancel_withdraw_shares":
         await query.edit_message_text("❌ Withdrawal canceled.")
@@ -664,49 +709,68 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if query.data.startswith("confirm_withdraw_shares:"):
         percentage = query.data.split(":")[1]
 
-        user_shares = Decimal(strategy.get_my_balance())
+        user_shares = Decimal(await asyncio.to_thread(strategy.get_my_balance))
 
         withdraw_amount = user_shares * Decimal(percentage) / Decimal(100)
 
         print(f"\n--- Withdrawing {percentage}% of Shares ---")
         print(f"Withdrawing {withdraw_amount} AVAX ({percentage}% of total)...")
         try:
-            strategy.withdraw(withdraw_amount)
-            time.sleep(10)  # Wait for transaction confirmation
-
-            message = f"✅ Withdrawal successful! {withdraw_amount} AVAX withdrawn."
+            tx_hash = await asyncio.to_thread(strategy.withdraw, withdraw_amount, False)
+            if tx_hash is None:
+                raise Exception("Withdrawal failed! Check contract requirements.")
         except Exception as e:
-            message = f"❌ Withdrawal failed: {str(e)}"
+            await query.edit_message_text(f"❌ Withdrawal failed: {str(e)}")
+            return
 
-        await query.edit_message_text(message)
+        async def shares_withdrawn(receipt):
+            position = await asyncio.to_thread(strategy.get_my_position, receipt["blockNumber"])
+            return (
+                f"✅ Withdrawal successful! {withdraw_amount} AVAX withdrawn.\n"
+                f"Remaining shares: {position['my_shares']}\n"
+                f"Wallet balance: {position['wallet_balance']:.3f} AVAX"
+            )
+
+        await watch_confirmation(query, strategy.w3, tx_hash, "Withdrawal", shares_withdrawn)
 
     if query.data == "confirm_withdraw_all":
-        # Step 1: Reinvest rewards (if any)
-        rewards = strategy.get_my_rewards()
+        position = await asyncio.to_thread(strategy.get_my_position)
+        if position is None:
+            await query.edit_message_text("❌ Could not read your position. Please try again.")
+            return
+        rewards, user_shares = position["my_rewards"], Decimal(position["my_shares"])
+
+        # Step 1: Reinvest rewards (if any). Reinvesting doesn't change our shares, so the
+        # withdrawal below goes out right behind it with the next nonce instead of waiting
         if rewards > 0:
             print("Reinvesting rewards before withdrawal...")
             try:
-                strategy.reinvest()
-                time.sleep(10)  # Wait for transaction confirmation
-                await query.edit_message_text("✅ Rewards reinvested successfully.")
+                if await asyncio.to_thread(strategy.reinvest, False) is None:
+                    raise Exception("Reinvest transaction could not be sent.")
+                await query.edit_message_text("✅ Rewards reinvestment submitted.")
             except Exception as e:
                 await query.edit_message_text(f"❌ Rewards reinvestment failed: {str(e)}")
                 return
 
         # Step 2: Withdraw all shares
-        user_shares = Decimal(strategy.get_my_balance())
         if user_shares > 0:
             print(f"Withdrawing all {user_shares} AVAX...")
             try:
-                strategy.withdraw(user_shares)
-                time.sleep(10)  # Wait for transaction confirmation
-                await query.edit_message_text(f"✅ Full withdrawal successful! {user_shares} AVAX withdrawn.")
+                tx_hash = await asyncio.to_thread(strategy.withdraw, user_shares, False)
+                if tx_hash is None:
+                    raise Exception("Withdrawal failed! Check contract requirements.")
             except Exception as e:
                 await query.edit_message_text(f"❌ Full withdrawal failed: {str(e)}")
+                return
+
+            async def all_withdrawn(receipt):
+                balance = await wallet_avax_balance(strategy)
+                return f"✅ Full withdrawal successful! {user_shares} AVAX withdrawn.\nWallet balance: {balance:.3f} AVAX"
+
+            await watch_confirmation(query, strategy.w3, tx_hash, "Full withdrawal", all_withdrawn)
         else:
             await query.edit_message_text("❌ No shares left to withdraw.")
 
-        print("Withdrawal complete.")
         print("--------------------------------\n")
     if query.data == "cancel_withdraw_all":
         await query.edit_message_text("❌ Withdrawal canceled.")
@@ -714,8 +778,36 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # Main Entry Point
 # ------------------------------
 
+async def post_init(application):
+    # Keep fee estimates warm so building a transaction needs no fee round-trip
+    fee_oracle.start([AVALANCHE_CHAIN_ID])
+
+    async def notify(user_id, text):
+        await application.bot.send_message(chat_id=user_id, text=text)
+
+    # Poll the status of submitted bridge transfers and report the outcome to their users
+    bridge_tracker.start(notify)
+
+    # Pick up new tokens from the token list without a restart
+    token_refresher.start()
+
+    # Serve AvaYield pool-wide values (deposits, rewards, leverage...) from a snapshot refreshed once per block
+    interactor_pool.pool_state(
+        providers.rpc_url(AVALANCHE_CHAIN_ID),
+        AVAYIELD_CONTRACT_ADDRESS,
+        w3=get_web3(AVALANCHE_CHAIN_ID)
+    ).start()
+
 def main():
-    application = ApplicationBuilder().token(TELEGRAM_TOKEN).build()
+    # Handle users concurrently so one user's pending transaction doesn't stall everyone else,
+    # but each user's own updates in order so a Confirm tap never races the command it confirms
+    application = (
+        ApplicationBuilder()
+        .token(TELEGRAM_TOKEN)
+        .concurrent_updates(PerUserUpdateProcessor())
+        .post_init(post_init)
+        .build()
+    )
 
     # Wallet management commands.
     application.add_handler(CommandHandler("start", start))
@@ -0,0 +1,139 @@
+import asyncio
+import heapq
+import time
+from packages.bungee import async_get_bridge_status
+
+# ------------------------------
+# Bridge Status Tracker
+# ------------------------------
+
+TICK_INTERVAL = 5            # seconds between scheduler passes
+MAX_CONCURRENT_POLLS = 8     # /bridge-status calls in flight at once
+MAX_POLLS_PER_TICK = 100     # due transfers polled per pass; the rest wait for the next one
+INITIAL_BACKOFF = 15         # first poll after submission; bridges rarely finish sooner
+MAX_BACKOFF = 300
+MAX_TRACKING_AGE = 6 * 3600  # give up on transfers still pending after this long
+
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+
+def transfer_outcome(status):
+    """Return COMPLETED, FAILED or None (still in progress) for a /bridge-status response."""
+    result = status.get("result") or {}
+    source = result.get("sourceTxStatus")
+    destination = result.get("destinationTxStatus")
+    if source == FAILED or destination == FAILED:
+        return FAILED
+    if destination == COMPLETED:
+        return COMPLETED
+    return None
+
+
+class _Transfer:
+    def __init__(self, user_id, tx_hash, from_chain_id, to_chain_id, registered_at):
+        self.user_id = user_id
+        self.tx_hash = tx_hash
+        self.from_chain_id = from_chain_id
+        self.to_chain_id = to_chain_id
+        self.registered_at = registered_at
+        self.backoff = INITIAL_BACKOFF
+        self.polls = 0
+
+
+class BridgeTracker:
+    """
+    Follows submitted bridge transfers until they complete or fail.
+
+    All transfers share one scheduler loop: every TICK_INTERVAL seconds the
+    transfers that are due are polled, at most MAX_POLLS_PER_TICK per pass and
+    MAX_CONCURRENT_POLLS at a time, so load stays flat however many transfers
+    are in flight. Each transfer backs off exponentially between polls. When a
+    transfer finishes, `notify(user_id, text)` is awaited with a message for
+    the user.
+    """
+
+    def __init__(self, fetch_status=async_get_bridge_status, notify=None, clock=time.monotonic):
+        self.fetch_status = fetch_status
+        self.notify = notify
+        self.clock = clock
+        self.transfers = {}   # tx_hash -> _Transfer
+        self.schedule = []    # heap of (next poll time, tx_hash)
+        self.task = None
+
+    def register(self, user_id, tx_hash, from_chain_id, to_chain_id):
+        """Start tracking a submitted transfer."""
+        if tx_hash in self.transfers:
+            return
+        now = self.clock()
+        self.transfers[tx_hash] = _Transfer(user_id, tx_hash, from_chain_id, to_chain_id, now)
+        heapq.heappush(self.schedule, (now + INITIAL_BACKOFF, tx_hash))
+
+    def pending(self):
+        return len(self.transfers)
+
+    def _due(self):
+        now = self.clock()
+        due = []
+        while self.schedule and self.schedule[0][0] <= now and len(due) < MAX_POLLS_PER_TICK:
+            _, tx_hash = heapq.heappop(self.schedule)
+            transfer = self.transfers.get(tx_hash)
+            if transfer is not None:
+                due.append(transfer)
+        return due
+
+    def _reschedule(self, transfer):
+        heapq.heappush(self.schedule, (self.clock() + transfer.backoff, transfer.tx_hash))
+        transfer.backoff = min(transfer.backoff * 2, MAX_BACKOFF)
+
+    async def _finish(self, transfer, text):
+        self.transfers.pop(transfer.tx_hash, None)
+        if self.notify is not None:
+            try:
+                await self.notify(transfer.user_id, text)
+            except Exception as e:
+                print(f"Error notifying user {transfer.user_id} about {transfer.tx_hash}: {e}")
+
+    async def poll(self, transfer, semaphore):
+        """Check one transfer and either finish it or schedule its next poll."""
+        async with semaphore:
+            transfer.polls += 1
+            try:
+                status = await self.fetch_status(transfer.tx_hash, transfer.from_chain_id, transfer.to_chain_id)
+                outcome = transfer_outcome(status)
+            except Exception as e:
+                print(f"Error checking bridge status for {transfer.tx_hash}: {e}")
+                outcome = None
+
+        link = f"https://www.socketscan.io/tx/{transfer.tx_hash}"
+        if outcome == COMPLETED:
+            await self._finish(transfer, f"✅ Bridge transfer completed!\nTrack on: {link}")
+        elif outcome == FAILED:
+            await self._finish(transfer, f"❌ Bridge transfer failed.\nDetails: {link}")
+        elif self.clock() - transfer.registered_at > MAX_TRACKING_AGE:
+            await self._finish(transfer, f"⚠️ Bridge transfer is still pending, stopped tracking it.\nCheck: {link}")
+        else:
+            self._reschedule(transfer)
+
+    async def tick(self, semaphore):
+        due = self._due()
+        if due:
+            await asyncio.gather(*(self.poll(transfer, semaphore) for transfer in due))
+
+    async def run(self):
+        """Poll due transfers every TICK_INTERVAL seconds until cancelled."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        while True:
+            await self.tick(semaphore)
+            await asyncio.sleep(TICK_INTERVAL)
+
+    def start(self, notify=None):
+        """Start the scheduler on the running event loop."""
+        if notify is not None:
+            self.notify = notify
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return self.task
+
+
+bridge_tracker = BridgeTracker()
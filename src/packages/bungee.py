@@ -1,19 +1,55 @@
 import os
-import requests
+import time
+import asyncio
 from dotenv import load_dotenv
-import json
+from eth_account import Account
 from web3 import Web3
+from packages.token_index import normalize_address
+from packages.token_snapshot import load_token_index
+from packages.bungee_client import BungeeClient
+from packages.rate_limiter import RateLimiter
+from packages.quote_cache import QuoteCache
+from packages.route_index import RouteIndex
+from packages.nonce_manager import nonce_manager
+from packages.providers import get_web3, get_async_web3
+from packages.fee_oracle import fee_oracle
 
 load_dotenv()
 
 BUNGEE_API_KEY = os.getenv("BUNGEE_API_KEY")
 BASE_URL = "https://api.socket.tech/v2"
-WEB3_PROVIDER = os.getenv("WEB3_PROVIDER", "https://mainnet.infura.io/v3/YOUR_INFURA_PROJECT_ID")
-w3 = Web3(Web3.HTTPProvider(WEB3_PROVIDER))
 
-# Token Registry (example structure)
-with open('token_registry.json', 'r') as file:
-    TOKEN_REGISTRY = json.load(file)
+# Every user shares one API key, so all calls go through one rate limiter
+rate_limiter = RateLimiter(
+    rate=float(os.getenv("BUNGEE_RATE_LIMIT", "5")),
+    burst=float(os.getenv("BUNGEE_RATE_BURST", "10")),
+)
+
+# Shared keep-alive client used for every Bungee API call
+bungee_client = BungeeClient(BASE_URL, BUNGEE_API_KEY, limiter=rate_limiter)
+
+# Short-lived cache so repeated identical transfer commands share one /quote call
+quote_cache = QuoteCache(
+    ttl=float(os.getenv("QUOTE_CACHE_TTL", "10")),
+    max_size=int(os.getenv("QUOTE_CACHE_SIZE", "256")),
+)
+
+# Token registry index, loaded on first use (from the compiled snapshot when available)
+_token_index = None
+
+def get_token_index():
+    """Return the shared token index, loading it on first call."""
+    global _token_index
+    if _token_index is None:
+        _token_index = load_token_index()
+    return _token_index
+
+def set_token_index(token_index):
+    """Swap in a refreshed token index; callers mid-lookup keep the one they already hold."""
+    global _token_index, _route_index
+    _token_index = token_index
+    if _route_index is not None:
+        _route_index = _route_index.with_token_index(token_index)
 
 
 # ------------------------------
@@ -33,74 +69,70 @@ CHAIN_IDS = {
     "Scroll": 534352
 }
 
+# Local feasibility check consulted before spending a /quote call, built on first use
+_route_index = None
+
+def get_route_index():
+    global _route_index
+    if _route_index is None:
+        _route_index = RouteIndex(get_token_index(), CHAIN_IDS.values())
+    return _route_index
+
+def check_route(from_chain_id, from_token_address, to_chain_id, to_token_address):
+    """Return why a transfer can't be routed, or None if it's worth requesting a quote."""
+    return get_route_index().check(from_chain_id, from_token_address, to_chain_id, to_token_address)
+
 def get_token_address(chain_id, symbol):
     """Fetch token address from the registry based on chain ID and symbol."""
-    chain_key = str(chain_id)
-    if chain_key not in TOKEN_REGISTRY:
+    token_index = get_token_index()
+    if not token_index.has_chain(chain_id):
         raise ValueError(f"Chain ID {chain_id} not supported in the token registry.")
-    
-    for token in TOKEN_REGISTRY[chain_key]:
-        if token["symbol"].lower() == symbol.lower():
-            return Web3.to_checksum_address(token["address"])
-    raise ValueError(f"Token {symbol} not found on chain {chain_id}.")
-
-def get_bungee_headers():
-    """Generate headers for Bungee API requests."""
-    return {
-        "API-KEY": BUNGEE_API_KEY,
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
+
+    token = token_index.by_symbol(chain_id, symbol)
+    if token is None:
+        raise ValueError(f"Token {symbol} not found on chain {chain_id}.")
+    return token.address
+
+def lookup_token(chain_id, token_address):
+    """Return the registry record for a token address, raising if it isn't listed."""
+    token_index = get_token_index()
+    if not token_index.has_chain(chain_id):
+        raise ValueError(f"Chain ID {chain_id} not supported")
+
+    token = token_index.by_address(chain_id, token_address)
+    if token is None:
+        raise ValueError(f"Token {normalize_address(token_address)} not found on chain {chain_id}")
+    return token
 
 def validate_token_address(chain_id, token_address):
     """Validate if a token exists in the registry for the given chain."""
-    chain_key = str(chain_id)
-    if chain_key not in TOKEN_REGISTRY:
-        raise ValueError(f"Chain ID {chain_id} not supported")
-    
-    token_address = Web3.to_checksum_address(token_address)
-    tokens = TOKEN_REGISTRY[chain_key]
-    
-    for token in tokens:
-        registry_address = Web3.to_checksum_address(token["address"])
-        if registry_address == token_address and token["chainId"] == chain_id:
-            return
-    raise ValueError(f"Token {token_address} not found on chain {chain_id}")
+    lookup_token(chain_id, token_address)
 
 def convert_token_amount(amount, chain_id, token_address):
-    chain_key = str(chain_id)
-    if chain_key not in TOKEN_REGISTRY:
+    token_index = get_token_index()
+    if not token_index.has_chain(chain_id):
         raise ValueError(f"Chain ID {chain_id} not supported")
 
-    token_address = Web3.to_checksum_address(token_address)
-    tokens = TOKEN_REGISTRY[chain_key]
-
-    for token in tokens:
-        registry_address = Web3.to_checksum_address(token["address"])
-        if registry_address == token_address and token["chainId"] == chain_id:
-            return amount * 10 ** token["decimals"]
+    token = token_index.by_address(chain_id, token_address)
+    if token is not None:
+        return amount * 10 ** token.decimals
 
 # ------------------------------
 # Core API Functions
 # ------------------------------
 
-def get_quote(from_chain_id, from_token_address, to_chain_id, to_token_address, from_amount, user_address,
-              unique_routes_per_bridge=True, sort="output", single_tx_only=True):
-    """
-    Get cross-chain swap quote with proper parameter formatting and validation.
-    """
-    # Validate tokens against registry
-    validate_token_address(from_chain_id, from_token_address)
-    validate_token_address(to_chain_id, to_token_address)
-
-    from_amount = convert_token_amount(from_amount, from_chain_id, from_token_address)
+def _quote_request(from_chain_id, from_token_address, to_chain_id, to_token_address, from_amount, user_address,
+                   unique_routes_per_bridge, sort, single_tx_only):
+    """Validate and format quote parameters. Returns (cache key, params)."""
+    # Validate tokens against registry; the records carry checksummed addresses
+    from_token = lookup_token(from_chain_id, from_token_address)
+    to_token = lookup_token(to_chain_id, to_token_address)
 
-    # Convert addresses to checksum format
-    from_token_address = Web3.to_checksum_address(from_token_address)
-    to_token_address = Web3.to_checksum_address(to_token_address)
+    from_amount = from_amount * 10 ** from_token.decimals
+    from_token_address = from_token.address
+    to_token_address = to_token.address
     user_address = Web3.to_checksum_address(user_address)
 
-    url = f"{BASE_URL}/quote"
     params = {
         "fromChainId": from_chain_id,
         "fromTokenAddress": from_token_address,
@@ -112,168 +144,353 @@ def get_quote(from_chain_id, from_token_address, to_chain_id, to_token_address,
         "sort": sort,
         "singleTxOnly": str(single_tx_only).lower()
     }
-    
-    response = requests.get(url, headers=get_bungee_headers(), params=params)
-    response.raise_for_status()
-    return response.json()
+
+    # Normalized so "1" and 1, or differently cased addresses, share an entry
+    key = (int(from_chain_id), from_token_address, int(to_chain_id), to_token_address,
+           params["fromAmount"], user_address, params["uniqueRoutesPerBridge"], sort, params["singleTxOnly"])
+    return key, params
+
+def _learn_route(key, quote):
+    """Record whether a fetched quote had routes so dead pairs are skipped next time."""
+    from_chain_id, from_token_address, to_chain_id, to_token_address = key[:4]
+    routable = bool(quote.get("result", {}).get("routes"))
+    get_route_index().record(from_chain_id, from_token_address, to_chain_id, to_token_address, routable)
+    return quote
+
+def _allowance_params(chain_id, owner, allowance_target, token_address):
+    return {
+        "chainID": chain_id,
+        "owner": Web3.to_checksum_address(owner),
+        "allowanceTarget": Web3.to_checksum_address(allowance_target),
+        "tokenAddress": Web3.to_checksum_address(token_address)
+    }
+
+def _bridge_status_params(transaction_hash, from_chain_id, to_chain_id):
+    return {
+        "transactionHash": transaction_hash,
+        "fromChainId": int(from_chain_id),
+        "toChainId": int(to_chain_id)
+    }
+
+def get_quote(from_chain_id, from_token_address, to_chain_id, to_token_address, from_amount, user_address,
+              unique_routes_per_bridge=True, sort="output", single_tx_only=True):
+    """
+    Get cross-chain swap quote with proper parameter formatting and validation.
+
+    Identical requests within QUOTE_CACHE_TTL seconds are served from `quote_cache`.
+    """
+    key, params = _quote_request(from_chain_id, from_token_address, to_chain_id, to_token_address, from_amount,
+                                 user_address, unique_routes_per_bridge, sort, single_tx_only)
+    return quote_cache.get_or_fetch(key, lambda: _learn_route(key, bungee_client.get("quote", params=params)))
 
 def build_transaction(route, sender_address):
     """Build transaction with checksummed sender address."""
-    sender_address = Web3.to_checksum_address(sender_address)
-    url = f"{BASE_URL}/build-tx"
     payload = {
         "route": route,
-        "senderAddress": sender_address
+        "senderAddress": Web3.to_checksum_address(sender_address)
     }
-    response = requests.post(url, headers=get_bungee_headers(), json=payload)
-    response.raise_for_status()
-    return response.json()
+    return bungee_client.post("build-tx", json=payload)
 
 
 def get_route_transaction_data(route):
     """Fetch transaction data for a given route."""
-    url = f"{BASE_URL}/build-tx"
-    headers = {
-        "API-KEY": BUNGEE_API_KEY,
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    body = json.dumps({"route": route})
-    response = requests.post(url, headers=headers, data=body)
-    print(f"response: {response}")
+    response = bungee_client.post("build-tx", json={"route": route}, raise_for_status=False)
 
-    return response.json()
+    return response
 
 def check_allowance(chain_id, owner, allowance_target, token_address):
     """Check allowance with validated addresses."""
-    owner = Web3.to_checksum_address(owner)
-    allowance_target = Web3.to_checksum_address(allowance_target)
-    token_address = Web3.to_checksum_address(token_address)
-    
-    url = f"{BASE_URL}/approval/check-allowance"
-    params = {
-        "chainID": chain_id,
-        "owner": owner,
-        "allowanceTarget": allowance_target,
-        "tokenAddress": token_address
-    }
-    response = requests.get(url, headers=get_bungee_headers(), params=params)
-    response.raise_for_status()
-    return response.json()
+    params = _allowance_params(chain_id, owner, allowance_target, token_address)
+    return bungee_client.get("approval/check-allowance", params=params)
 
 def get_approval_transaction_data(chain_id, owner, allowance_target, token_address, amount):
     """Get approval TX data with checksummed addresses."""
-    owner = Web3.to_checksum_address(owner)
-    allowance_target = Web3.to_checksum_address(allowance_target)
-    token_address = Web3.to_checksum_address(token_address)
-    
-    url = f"{BASE_URL}/approval/build-tx"
-    params = {
-        "chainID": chain_id,
-        "owner": owner,
-        "allowanceTarget": allowance_target,
-        "tokenAddress": token_address,
-        "amount": amount
-    }
-    response = requests.get(url, headers=get_bungee_headers(), params=params)
-    response.raise_for_status()
-    return response.json()
+    params = {**_allowance_params(chain_id, owner, allowance_target, token_address), "amount": amount}
+    return bungee_client.get("approval/build-tx", params=params)
 
 def get_bridge_status(transaction_hash, from_chain_id, to_chain_id):
     """Check bridge status with proper parameter types."""
-    url = f"{BASE_URL}/bridge-status"
-    params = {
-        "transactionHash": transaction_hash,
-        "fromChainId": int(from_chain_id),
-        "toChainId": int(to_chain_id)
+    params = _bridge_status_params(transaction_hash, from_chain_id, to_chain_id)
+    return bungee_client.get("bridge-status", params=params)
+
+
+# ------------------------------
+# Async API Functions
+# ------------------------------
+
+async def async_get_quote(from_chain_id, from_token_address, to_chain_id, to_token_address, from_amount, user_address,
+                          unique_routes_per_bridge=True, sort="output", single_tx_only=True):
+    """Non-blocking get_quote; shares `quote_cache` with the sync version."""
+    key, params = _quote_request(from_chain_id, from_token_address, to_chain_id, to_token_address, from_amount,
+                                 user_address, unique_routes_per_bridge, sort, single_tx_only)
+
+    async def fetch():
+        return _learn_route(key, await bungee_client.aget("quote", params=params))
+
+    return await quote_cache.aget_or_fetch(key, fetch)
+
+async def async_build_transaction(route, sender_address):
+    payload = {
+        "route": route,
+        "senderAddress": Web3.to_checksum_address(sender_address)
     }
-    response = requests.get(url, headers=get_bungee_headers(), params=params)
-    response.raise_for_status()
-    return response.json()
+    return await bungee_client.apost("build-tx", json=payload)
+
+async def async_get_route_transaction_data(route):
+    response = await bungee_client.apost("build-tx", json={"route": route}, raise_for_status=False)
+
+    return response
+
+async def async_check_allowance(chain_id, owner, allowance_target, token_address):
+    params = _allowance_params(chain_id, owner, allowance_target, token_address)
+    return await bungee_client.aget("approval/check-allowance", params=params)
+
+async def async_get_approval_transaction_data(chain_id, owner, allowance_target, token_address, amount):
+    params = {**_allowance_params(chain_id, owner, allowance_target, token_address), "amount": amount}
+    return await bungee_client.aget("approval/build-tx", params=params)
+
+async def async_get_bridge_status(transaction_hash, from_chain_id, to_chain_id):
+    params = _bridge_status_params(transaction_hash, from_chain_id, to_chain_id)
+    return await bungee_client.aget("bridge-status", params=params)
 
 
 # ------------------------------
 # Transaction Execution Logic
 # ------------------------------
 
-async def execute_transaction(user_id, route, private_key, user_wallets):
-    """Execute the cross-chain transaction."""
+PREPARED_TX_MAX_AGE = float(os.getenv("PREPARED_TX_MAX_AGE", "60"))  # seconds a pre-signed transaction stays valid
+APPROVAL_GAS_LIMIT = 200000
+# Used when the main transaction can't be estimated yet because its approval isn't mined
+FALLBACK_GAS_LIMIT = 1000000
+
+# RPC errors meaning the pre-signed transaction no longer fits the chain state
+STALE_TX_ERRORS = (
+    "nonce too low",
+    "replacement transaction underpriced",
+    "transaction underpriced",
+    "max fee per gas less than block base fee",
+)
+# The node already has this exact signed transaction (e.g. a retried broadcast), so it was sent
+ALREADY_KNOWN_ERROR = "already known"
+
+
+class StalePreparedTransaction(Exception):
+    """Raised when a pre-signed transaction was rejected and must be rebuilt."""
+
+
+def _required_approval(approval_data, allowance_check):
+    """Return the amount to approve, or None when the current allowance already covers the route."""
+    minimum_approval_amount = int(approval_data["minimumApprovalAmount"], 16)
+    current_allowance = int(allowance_check.get("result", {}).get("value", "0x0"), 16)
+    if current_allowance < minimum_approval_amount:
+        print("Approval Required")
+        return minimum_approval_amount
+    return None
+
+def _approval_transaction(approval_tx_data, nonce, chain_id, fees):
+    return {
+        "to": approval_tx_data["result"]["to"],
+        "data": approval_tx_data["result"]["data"],
+        "value": 0,
+        "gas": APPROVAL_GAS_LIMIT,
+        "nonce": nonce,
+        "chainId": chain_id,
+        **fees,
+    }
+
+def _main_call(sender_address, tx_data):
+    return {
+        'from': sender_address,
+        'to': tx_data['txTarget'],
+        'value': int(tx_data['value'], 16),
+        'data': tx_data['txData'],
+    }
+
+def _main_transaction(call, gas, nonce, chain_id, fees):
+    return {
+        **call,
+        'gas': gas,
+        'nonce': nonce,
+        'chainId': chain_id,
+        **fees,
+    }
+
+def _prepared(route, sender_address, first_nonce, raw_transactions):
+    return {
+        "route": route,
+        "sender": sender_address,
+        "chain_id": int(route["fromChainId"]),
+        "nonce": first_nonce,
+        "raw_transactions": raw_transactions,
+        "prepared_at": time.monotonic(),
+    }
+
+def _fallback_gas(error, approval_tx_data):
+    """Gas limit for a main transaction whose estimate failed; only expected while its approval is unmined."""
+    if approval_tx_data is None:
+        raise error
+    print(f"Gas estimation deferred to fallback limit: {error}")
+    return FALLBACK_GAS_LIMIT
+
+def _sign_prepared(route, sender_address, private_key, tx_data, nonce, fees, approval_tx_data, gas_estimate):
+    """Sign the approval (if one is needed) and the main transaction with consecutive nonces from `nonce`."""
+    raw_transactions = []
+    if approval_tx_data is not None:
+        approval_tx = _approval_transaction(approval_tx_data, nonce, route["fromChainId"], fees)
+        raw_transactions.append(Account.sign_transaction(approval_tx, private_key).raw_transaction)
+    call = _main_call(sender_address, tx_data)
+    transaction = _main_transaction(call, gas_estimate, nonce + len(raw_transactions), tx_data['chainId'], fees)
+    raw_transactions.append(Account.sign_transaction(transaction, private_key).raw_transaction)
+    return _prepared(route, sender_address, nonce, raw_transactions)
+
+def _claim_nonces(prepared):
+    """Take the prepared nonces from the nonce manager, or flag the transaction stale if they're gone."""
+    if not nonce_manager.claim(prepared["chain_id"], prepared["sender"], prepared["nonce"],
+                               len(prepared["raw_transactions"])):
+        raise StalePreparedTransaction(f"nonce {prepared['nonce']} was used by another transaction")
+
+def _send_failed(prepared, error, index, raw_transaction):
+    """Return the hash of a transaction the node already has; otherwise raise for the failed send."""
+    if ALREADY_KNOWN_ERROR in str(error).lower():
+        return Web3.keccak(raw_transaction)
+    # The reserved nonces may not have been used; read them from the chain next time
+    nonce_manager.resync(prepared["chain_id"], prepared["sender"])
+    # Only safe to rebuild when nothing has been broadcast yet
+    if index == 0 and any(stale in str(error).lower() for stale in STALE_TX_ERRORS):
+        raise StalePreparedTransaction(str(error)) from error
+    raise error
+
+
+def prepare_transaction(route, sender_address, private_key):
+    """
+    Do everything Confirm needs ahead of time: fetch /build-tx, check the
+    allowance, build the approval if one is needed, fetch the nonce, estimate
+    gas and sign. The result only has to be broadcast.
+    """
+    sender_address = Web3.to_checksum_address(sender_address)
+    tx_data = get_route_transaction_data(route)["result"]
+    approval_data = tx_data.get("approvalData")
+    from_chain_id = route["fromChainId"]
+    approval_tx_data = None
+
+    # Transactions are signed for and sent to the route's source chain
+    w3 = get_web3(from_chain_id)
+
+    # Nonces are only reserved at broadcast time, so an unconfirmed preview leaves no gap
+    nonce = nonce_manager.next_nonce(w3, from_chain_id, sender_address)
+    fees = fee_oracle.get_fees(from_chain_id)
+
+    # Handle token approval if required
+    if approval_data:
+        allowance_target = approval_data["allowanceTarget"]
+        allowance_check = check_allowance(from_chain_id, sender_address, allowance_target, route["fromTokenAddress"])
+        amount = _required_approval(approval_data, allowance_check)
+        if amount is not None:
+            approval_tx_data = get_approval_transaction_data(
+                from_chain_id, sender_address, allowance_target, route["fromTokenAddress"], amount
+            )
+
     try:
-        # Fetch transaction data
-        api_return_data = get_route_transaction_data(route)
-        approval_data = api_return_data.get("result", {}).get("approvalData")
-
-        print(f"Transaction Data: {api_return_data}")
-
-        # Handle token approval if required
-        if approval_data:
-            print("Approval Required")
-            allowance_target = approval_data["allowanceTarget"]
-            minimum_approval_amount = int(approval_data["minimumApprovalAmount"], 16)
-            from_chain_id = route["fromChainId"]
-            from_token_address = route["fromTokenAddress"]
-
-            # Check current allowance
-            allowance_check = check_allowance(
-                from_chain_id,
-                user_wallets[user_id]["address"],
-                allowance_target,
-                from_token_address
+        gas_estimate = w3.eth.estimate_gas(_main_call(sender_address, tx_data))
+    except Exception as e:
+        gas_estimate = _fallback_gas(e, approval_tx_data)
+    return _sign_prepared(route, sender_address, private_key, tx_data, nonce, fees, approval_tx_data, gas_estimate)
+
+
+def is_prepared_stale(prepared, route=None):
+    """A prepared transaction is stale once it is too old or was built for another route."""
+    if time.monotonic() - prepared["prepared_at"] > PREPARED_TX_MAX_AGE:
+        return True
+    return route is not None and prepared["route"] is not route
+
+
+def send_prepared_transaction(prepared):
+    """
+    Broadcast a prepared transaction and return the main tx hash. An approval
+    and the main transaction carry consecutive nonces and go out back-to-back.
+    """
+    w3 = get_web3(prepared["chain_id"])
+    _claim_nonces(prepared)
+    tx_hash = None
+    for i, raw_transaction in enumerate(prepared["raw_transactions"]):
+        try:
+            tx_hash = w3.eth.send_raw_transaction(raw_transaction)
+        except Exception as e:
+            tx_hash = _send_failed(prepared, e, i, raw_transaction)
+        if i < len(prepared["raw_transactions"]) - 1:
+            print(f"Approval Transaction Hash: {Web3.to_hex(tx_hash)}")
+    return Web3.to_hex(tx_hash)
+
+
+# ------------------------------
+# Async Transaction Execution
+# ------------------------------
+
+async def async_prepare_transaction(route, sender_address, private_key):
+    """Non-blocking prepare_transaction; the allowance check, nonce and fees are fetched concurrently."""
+    sender_address = Web3.to_checksum_address(sender_address)
+    tx_data = (await async_get_route_transaction_data(route))["result"]
+    approval_data = tx_data.get("approvalData")
+    from_chain_id = route["fromChainId"]
+    approval_tx_data = None
+
+    async_w3 = get_async_web3(from_chain_id)
+    nonce_request = nonce_manager.async_next_nonce(async_w3, from_chain_id, sender_address)
+    fees_request = fee_oracle.async_get_fees(from_chain_id)
+    if approval_data:
+        allowance_target = approval_data["allowanceTarget"]
+        nonce, fees, allowance_check = await asyncio.gather(
+            nonce_request,
+            fees_request,
+            async_check_allowance(from_chain_id, sender_address, allowance_target, route["fromTokenAddress"]),
+        )
+        amount = _required_approval(approval_data, allowance_check)
+        if amount is not None:
+            approval_tx_data = await async_get_approval_transaction_data(
+                from_chain_id, sender_address, allowance_target, route["fromTokenAddress"], amount
             )
-            current_allowance = int(allowance_check.get("result", {}).get("value", "0x0"), 16)
-
-            if current_allowance < minimum_approval_amount:
-                # Fetch approval transaction data
-                approval_tx_data = get_approval_transaction_data(
-                    from_chain_id,
-                    user_wallets[user_id]["address"],
-                    allowance_target,
-                    from_token_address,
-                    minimum_approval_amount,
-                )
-
-                # Build and send approval transaction
-                nonce = w3.eth.get_transaction_count(user_wallets[user_id]["address"])
-                approval_tx = {
-                    "to": approval_tx_data["result"]["to"],
-                    "data": approval_tx_data["result"]["data"],
-                    "value": 0,
-                    "gas": 200000,  # Adjust gas limit as needed
-                    "nonce": nonce,
-                    "chainId": from_chain_id,
-                    "maxFeePerGas": w3.toWei('2', 'gwei'),  # Example max fee per gas
-                    "maxPriorityFeePerGas": w3.toWei('1', 'gwei'),  # Example priority fee
-                }
-                signed_approval_tx = w3.eth.account.sign_transaction(approval_tx, private_key)
-                approval_tx_hash = w3.eth.send_raw_transaction(signed_approval_tx.rawTransaction)
-                print(f"Approval Transaction Hash: {w3.toHex(approval_tx_hash)}")
-
-        # Prepare main transaction
-        tx_data = api_return_data["result"]
-        value = int(tx_data['value'], 16)
-        nonce = w3.eth.get_transaction_count(user_wallets[user_id]["address"])
-        gas_estimate = w3.eth.estimate_gas({
-            'from': user_wallets[user_id]["address"],
-            'to': tx_data['txTarget'],
-            'value': value,
-            'data': tx_data['txData'],
-        })
-
-        transaction = {
-            'from': user_wallets[user_id]["address"],
-            'to': tx_data['txTarget'],
-            'value': value,
-            'data': tx_data['txData'],
-            'gas': gas_estimate,
-            'nonce': nonce,
-            'chainId': tx_data['chainId'],
-            'maxFeePerGas': w3.to_wei('2', 'gwei'),  # Example max fee per gas
-            'maxPriorityFeePerGas': w3.to_wei('1', 'gwei'),  # Example priority fee
-        }
-
-        signed_main_tx = w3.eth.account.sign_transaction(transaction, private_key)
-        main_tx_hash = w3.eth.send_raw_transaction(signed_main_tx.raw_transaction)
-        return w3.to_hex(main_tx_hash)
+    else:
+        nonce, fees = await asyncio.gather(nonce_request, fees_request)
+
+    try:
+        gas_estimate = await async_w3.eth.estimate_gas(_main_call(sender_address, tx_data))
+    except Exception as e:
+        gas_estimate = _fallback_gas(e, approval_tx_data)
+    return _sign_prepared(route, sender_address, private_key, tx_data, nonce, fees, approval_tx_data, gas_estimate)
+
+
+async def async_send_prepared_transaction(prepared):
+    """Non-blocking send_prepared_transaction."""
+    async_w3 = get_async_web3(prepared["chain_id"])
+    _claim_nonces(prepared)
+    tx_hash = None
+    for i, raw_transaction in enumerate(prepared["raw_transactions"]):
+        try:
+            tx_hash = await async_w3.eth.send_raw_transaction(raw_transaction)
+        except Exception as e:
+            tx_hash = _send_failed(prepared, e, i, raw_transaction)
+        if i < len(prepared["raw_transactions"]) - 1:
+            print(f"Approval Transaction Hash: {Web3.to_hex(tx_hash)}")
+    return Web3.to_hex(tx_hash)
+
+
+async def execute_transaction(user_id, route, private_key, user_wallets, prepared=None):
+    """
+    Execute the cross-chain transaction without blocking the event loop.
+
+    When `prepared` comes from async_prepare_transaction at preview time and is
+    still fresh, this only broadcasts it; otherwise the transaction is rebuilt.
+    """
+    try:
+        sender_address = user_wallets[user_id]["address"]
+        if prepared is None or is_prepared_stale(prepared, route):
+            prepared = await async_prepare_transaction(route, sender_address, private_key)
+        try:
+            return await async_send_prepared_transaction(prepared)
+        except StalePreparedTransaction as e:
+            print(f"Prepared transaction went stale ({e}), rebuilding")
+            prepared = await async_prepare_transaction(route, sender_address, private_key)
+            return await async_send_prepared_transaction(prepared)
 
     except Exception as e:
-        raise Exception(f"Transaction execution failed: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Transaction execution failed: {str(e)}")
@@ -0,0 +1,183 @@
+import asyncio
+import requests
+import aiohttp
+from requests.adapters import HTTPAdapter
+from packages.rate_limiter import EXECUTION, STATUS, QUOTE
+
+# ------------------------------
+# Bungee HTTP Client
+# ------------------------------
+
+# (connect, read) timeouts in seconds per endpoint; building routes is the slowest call
+DEFAULT_TIMEOUTS = {
+    "quote": (3.05, 15),
+    "build-tx": (3.05, 20),
+    "approval/check-allowance": (3.05, 10),
+    "approval/build-tx": (3.05, 10),
+    "bridge-status": (3.05, 10),
+    "token-lists/chain": (3.05, 30),
+}
+FALLBACK_TIMEOUT = (3.05, 15)
+
+# Rate limiter priority per endpoint: calls for confirmed transfers go first
+ENDPOINT_PRIORITIES = {
+    "build-tx": EXECUTION,
+    "approval/check-allowance": EXECUTION,
+    "approval/build-tx": EXECUTION,
+    "bridge-status": STATUS,
+    "quote": QUOTE,
+}
+
+# Seconds a call may wait in the rate limiter queue before giving up
+QUEUE_DEADLINES = {
+    EXECUTION: 30,
+    STATUS: 15,
+    QUOTE: 5,
+}
+
+
+class BungeeClient:
+    """
+    Shared client for the Bungee (Socket) API.
+
+    Keeps a bounded pool of keep-alive connections so consecutive calls of a
+    transfer reuse the same TCP/TLS connection, sends the API headers once per
+    session and applies a timeout to every endpoint. `get`/`post` are blocking,
+    `aget`/`apost` are their asyncio counterparts. With a `limiter`, every call
+    first takes a token at its endpoint's priority.
+    """
+
+    def __init__(self, base_url, api_key, pool_size=10, timeouts=None, keepalive_timeout=30, limiter=None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {
+            "API-KEY": api_key or "",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        self.pool_size = pool_size
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.keepalive_timeout = keepalive_timeout
+        self.limiter = limiter
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # pool_block keeps the pool bounded: extra callers wait for a free connection
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._async_session = None
+        self._async_loop = None
+
+    def url(self, endpoint):
+        return f"{self.base_url}/{endpoint}"
+
+    def timeout(self, endpoint):
+        return self.timeouts.get(endpoint, FALLBACK_TIMEOUT)
+
+    def priority(self, endpoint):
+        return ENDPOINT_PRIORITIES.get(endpoint, QUOTE)
+
+    # ------------------------------
+    # Blocking interface
+    # ------------------------------
+
+    def _acquire(self, endpoint, deadline):
+        if self.limiter is not None:
+            priority = self.priority(endpoint)
+            self.limiter.acquire(priority, deadline or QUEUE_DEADLINES[priority])
+
+    def request(self, method, endpoint, params=None, json=None, raise_for_status=True, deadline=None):
+        self._acquire(endpoint, deadline)
+        response = self.session.request(
+            method, self.url(endpoint), params=params, json=json, timeout=self.timeout(endpoint)
+        )
+        if raise_for_status:
+            response.raise_for_status()
+        return response.json()
+
+    def get(self, endpoint, params=None, **kwargs):
+        return self.request("GET", endpoint, params=params, **kwargs)
+
+    def post(self, endpoint, json=None, **kwargs):
+        return self.request("POST", endpoint, json=json, **kwargs)
+
+    def conditional_get(self, endpoint, params=None, validators=None, deadline=None):
+        """
+        GET that sends If-None-Match / If-Modified-Since from the `validators` of a
+        previous call. Returns (json, validators), with json None when the server
+        answered 304 Not Modified.
+        """
+        validators = validators or {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        self._acquire(endpoint, deadline)
+        response = self.session.get(self.url(endpoint), params=params, headers=headers, timeout=self.timeout(endpoint))
+        if response.status_code == 304:
+            return None, validators
+        response.raise_for_status()
+        return response.json(), {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    def close(self):
+        self.session.close()
+
+    # ------------------------------
+    # asyncio interface
+    # ------------------------------
+
+    async def async_session(self):
+        """
+        Return the aiohttp session for the running event loop, creating it on first use.
+        A session only works on the loop that created it, so when the loop changes
+        the previous session is closed before a new one is opened.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_session is not None and self._async_loop is not loop:
+            session, self._async_session = self._async_session, None
+            await self._close_session(session, self._async_loop)
+        if self._async_session is None or self._async_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive_timeout)
+            self._async_session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+            self._async_loop = loop
+        return self._async_session
+
+    async def _close_session(self, session, loop):
+        if session.closed:
+            return
+        if loop.is_running():
+            # Still serving another thread: close it there, on its own loop
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            await session.close()
+
+    async def arequest(self, method, endpoint, params=None, json=None, raise_for_status=True, deadline=None):
+        if self.limiter is not None:
+            priority = self.priority(endpoint)
+            await self.limiter.async_acquire(priority, deadline or QUEUE_DEADLINES[priority])
+        connect, read = self.timeout(endpoint)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        session = await self.async_session()
+        async with session.request(
+            method, self.url(endpoint), params=params, json=json, timeout=timeout
+        ) as response:
+            if raise_for_status:
+                response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def aget(self, endpoint, params=None, **kwargs):
+        return await self.arequest("GET", endpoint, params=params, **kwargs)
+
+    async def apost(self, endpoint, json=None, **kwargs):
+        return await self.arequest("POST", endpoint, json=json, **kwargs)
+
+    async def aclose(self):
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
@@ -0,0 +1,124 @@
+import re
+from packages.entity_resolver import entity_resolver
+
+# ------------------------------
+# Rule-based Command Parser
+# ------------------------------
+
+NUMBER = r"(?:\d+(?:\.\d*)?|\.\d+)"
+
+# Optional politeness / question lead-ins in front of read-only commands
+QUERY = r"(?:(?:please\s+)?(?:can you\s+)?(?:check|show|get|view|display|tell me|what(?:'s| is| are))\s+)?(?:me\s+)?(?:the\s+|my\s+|current\s+)*"
+
+TRANSFER = re.compile(
+    rf"(?:transfer|send|bridge|move|migrate|swap)\s+(?P<amount>{NUMBER})\s+(?P<from_token>[a-z0-9.$]+)"
+    rf"\s+(?:from|on)\s+(?P<from_chain>.+?)\s+to\s+(?:(?P<to_token>[a-z0-9.$]+)\s+on\s+)?(?P<to_chain>.+?)"
+    rf"(?:\s+(?:as|for|into)\s+(?P<to_token_suffix>[a-z0-9.$]+))?"
+)
+
+# action -> pattern matched against the whole normalized message
+RULES = [
+    ("cross_chain_send&transfer", TRANSFER),
+    ("deposits", re.compile(
+        rf"(?:deposit|stake|invest)\s+(?P<amount_avax>{NUMBER})\s*(?:avax)?"
+        r"(?:\s+(?:into|in|to)\s+(?:the\s+)?(?:pool|strategy|vault|avayield))?"
+    )),
+    ("withdraw_partial", re.compile(
+        rf"withdraw\s+(?P<percentage>{NUMBER})\s*(?:%|percent)"
+        r"(?:\s+of\s+(?:my\s+)?(?:shares|deposit|balance|position))?"
+    )),
+    ("withdraw_everything", re.compile(
+        r"withdraw\s+(?:everything|all(?: of it)?|my (?:entire|whole) (?:balance|position|deposit))"
+    )),
+    ("withdraw_rewards", re.compile(r"(?:withdraw|claim|collect|harvest)\s+(?:my\s+|the\s+)?rewards?")),
+    ("reinvest_rewards", re.compile(r"(?:reinvest|compound)(?:\s+(?:my\s+|the\s+)?rewards?)?")),
+    ("check_apr", re.compile(rf"{QUERY}(?:apr|apy)")),
+    ("get_pool_deposits", re.compile(rf"{QUERY}(?:pool|total)\s+deposits?")),
+    ("get_pool_rewards", re.compile(rf"{QUERY}pool\s+rewards?")),
+    ("get_my_rewards", re.compile(rf"{QUERY}(?:pending\s+)?rewards?")),
+    ("get_my_balance", re.compile(rf"{QUERY}(?:balance|shares)")),
+    ("get_leverage", re.compile(rf"{QUERY}leverage")),
+]
+
+
+def normalize(text):
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return " ".join(text.lower().split()).rstrip(".!?")
+
+
+def to_number(value):
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+class CommandParser:
+    """
+    Deterministic parser for commands with an obvious structure.
+
+    Each action in RULES has one pattern that must match the whole message.
+    Chain names and token symbols go through the entity resolver, so aliases
+    and small misspellings are accepted; anything it can't resolve with
+    certainty returns None so the caller can fall back to the LLM.
+    """
+
+    def __init__(self, resolver=entity_resolver):
+        self.resolver = resolver
+        self.hits = 0
+        self.misses = 0
+
+    def resolve_chain(self, name):
+        return self.resolver.resolve_chain(name.strip())
+
+    def resolve_token(self, chain_name, symbol):
+        return self.resolver.resolve_token(self.resolver.chain_ids[chain_name], symbol)
+
+    def _transfer(self, match):
+        from_chain = self.resolve_chain(match["from_chain"])
+        to_chain = self.resolve_chain(match["to_chain"])
+        if from_chain is None or to_chain is None:
+            return None
+        to_symbol = match["to_token"] or match["to_token_suffix"] or match["from_token"]
+        from_token = self.resolve_token(from_chain, match["from_token"])
+        to_token = self.resolve_token(to_chain, to_symbol)
+        if from_token is None or to_token is None:
+            return None
+        return {
+            "amount": to_number(match["amount"]),
+            "from_token": from_token,
+            "to_token": to_token,
+            "from_chain": from_chain,
+            "to_chain": to_chain,
+        }
+
+    def _match(self, text):
+        for action, pattern in RULES:
+            match = pattern.fullmatch(text)
+            if match is None:
+                continue
+            if action == "cross_chain_send&transfer":
+                fields = self._transfer(match)
+                # An unresolvable transfer is ambiguous, let the LLM have a go
+                return None if fields is None else {"action": action, **fields}
+            fields = {key: to_number(value) for key, value in match.groupdict().items()}
+            return {"action": action, **fields}
+        return None
+
+    def parse(self, text):
+        """Return the parsed command dict, or None when the message needs the LLM."""
+        parsed = self._match(normalize(text))
+        if parsed is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return parsed
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+command_parser = CommandParser()
@@ -0,0 +1,85 @@
+import asyncio
+from web3 import Web3
+from packages.receipt_resolver import receipt_resolvers
+
+# ------------------------------
+# Confirmation Watcher
+# ------------------------------
+
+CONFIRM_TIMEOUT = 180        # give up waiting for a receipt after this long
+
+
+class ConfirmationTimeout(Exception):
+    pass
+
+
+class TransactionReverted(Exception):
+    pass
+
+
+class ConfirmationWatcher:
+    """
+    Waits for transaction receipts without blocking the event loop.
+
+    `watch` returns immediately and follows the transaction in a background
+    task: once it is mined, `on_confirmed(receipt)` is awaited, and if it
+    reverts or no receipt shows up within the timeout, `on_failed(error)` is.
+    Receipts come from the chain's shared ReceiptResolver, so any number of
+    confirmations in flight costs one block scan per chain.
+    """
+
+    def __init__(self, timeout=CONFIRM_TIMEOUT, resolvers=receipt_resolvers):
+        self.timeout = timeout
+        self.resolvers = resolvers
+        self.tasks = set()
+        self.confirmed = 0
+        self.reverted = 0
+        self.timed_out = 0
+
+    async def wait(self, w3, tx_hash):
+        """Receipt of `tx_hash` once mined; raises ConfirmationTimeout if it takes too long."""
+        try:
+            return await self.resolvers.get(w3).async_wait(tx_hash, self.timeout)
+        except asyncio.TimeoutError:
+            raise ConfirmationTimeout(f"No receipt after {self.timeout:.0f}s; the transaction may still be mined.")
+
+    async def _follow(self, w3, tx_hash, on_confirmed, on_failed):
+        try:
+            receipt = await self.wait(w3, tx_hash)
+            if receipt["status"] != 1:
+                raise TransactionReverted("Transaction reverted on-chain.")
+        except Exception as e:
+            if isinstance(e, TransactionReverted):
+                self.reverted += 1
+            elif isinstance(e, ConfirmationTimeout):
+                self.timed_out += 1
+            print(f"Confirmation of {Web3.to_hex(tx_hash)} failed: {e}")
+            await self._call(on_failed, e)
+            return
+        self.confirmed += 1
+        await self._call(on_confirmed, receipt)
+
+    async def _call(self, callback, value):
+        try:
+            await callback(value)
+        except Exception as e:
+            print(f"Confirmation callback failed: {e}")
+
+    def watch(self, w3, tx_hash, on_confirmed, on_failed):
+        """Follow `tx_hash` in the background and return its task."""
+        task = asyncio.create_task(self._follow(w3, tx_hash, on_confirmed, on_failed))
+        # Keep a reference so the task isn't garbage collected while it waits
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def stats(self):
+        return {
+            "in_flight": len(self.tasks),
+            "confirmed": self.confirmed,
+            "reverted": self.reverted,
+            "timed_out": self.timed_out,
+        }
+
+
+confirmation_watcher = ConfirmationWatcher()
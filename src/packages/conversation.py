@@ -0,0 +1,190 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from packages.entity_resolver import entity_resolver
+
+# ------------------------------
+# Conversation State
+# ------------------------------
+
+CONTEXT_TTL = 900       # seconds a previous command can still be refined
+MAX_USERS = 10000
+
+NUMBER = re.compile(r"(?:\d+(?:\.\d*)?|\.\d+)")
+
+# Field a bare number replaces, per action
+AMOUNT_FIELDS = {
+    "cross_chain_send&transfer": "amount",
+    "deposits": "amount_avax",
+    "withdraw_partial": "percentage",
+}
+
+LEAD_IN = re.compile(
+    r"^(?:(?:ok(?:ay)?|and|now|then|actually|but|same(?: thing| again)?|again|do it|do that|make it|"
+    r"change it|change|switch|try|repeat|please|instead)\b\s*)+"
+)
+TRAILER = re.compile(r"(?:\s+(?:instead|please|again|then|too))+$")
+REPEAT = re.compile(r"\b(?:same|again|repeat)\b")
+REVERSE = re.compile(r"(?:(?:same|now|do it|and)\s+)*(?:reverse(?: it)?|the other way(?: round| around)?|back again)")
+KEYWORD = re.compile(r"\b(to|from|use|using|with|as|into|in|for)\b")
+SYMBOL = re.compile(r"[a-z0-9][a-z0-9.\-]*")
+
+CHAIN_FIELDS = {"from_token": "from_chain", "to_token": "to_chain"}
+
+
+def to_number(value):
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+class ConversationState:
+    """
+    Remembers each user's last parsed command so follow-ups can refine it.
+
+    `apply_delta` understands short refinements such as "same but 50",
+    "now to Arbitrum", "use USDT instead" or "the other way round" and
+    returns the previous command with those fields patched, without any
+    LLM call. Anything it doesn't fully understand returns None and goes
+    through the normal parser.
+    """
+
+    def __init__(self, resolver=entity_resolver, ttl=CONTEXT_TTL, max_users=MAX_USERS, clock=time.monotonic):
+        self.resolver = resolver
+        self.ttl = ttl
+        self.max_users = max_users
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.commands = OrderedDict()   # user_id -> (stored_at, command)
+        self.deltas = 0
+
+    def remember(self, user_id, command):
+        with self.lock:
+            self.commands[user_id] = (self.clock(), dict(command))
+            self.commands.move_to_end(user_id)
+            while len(self.commands) > self.max_users:
+                self.commands.popitem(last=False)
+
+    def last(self, user_id):
+        with self.lock:
+            entry = self.commands.get(user_id)
+            if entry is None or self.clock() - entry[0] > self.ttl:
+                return None
+            return dict(entry[1])
+
+    def forget(self, user_id):
+        with self.lock:
+            self.commands.pop(user_id, None)
+
+    # ------------------------------
+    # Delta parsing
+    # ------------------------------
+
+    def _set_amount(self, command, value):
+        field = AMOUNT_FIELDS.get(command["action"])
+        if field is None:
+            return False
+        command[field] = to_number(value)
+        return True
+
+    def _set_chain(self, command, field, name):
+        chain = self.resolver.resolve_chain(name)
+        if chain is None or command["action"] != "cross_chain_send&transfer":
+            return False
+        command[field] = chain
+        # Respell the token only when the new chain lists it (e.g. usdc.e -> USDC.E); otherwise
+        # it's kept as is, so the address lookup reports it instead of swapping in a similar asset
+        token_field = "from_token" if field == "from_chain" else "to_token"
+        token = self._token_symbol(command, token_field, command.get(token_field) or "")
+        if token is not None:
+            command[token_field] = token
+        return True
+
+    def _token_symbol(self, command, field, symbol):
+        """Registry spelling of `symbol` on the chain of token `field`, or None."""
+        chain_id = self.resolver.chain_ids.get(command.get(CHAIN_FIELDS[field]))
+        return self.resolver.resolve_token(chain_id, symbol) if chain_id else None
+
+    def _set_token(self, command, fields, symbol):
+        if command["action"] != "cross_chain_send&transfer":
+            return False
+        symbols = {field: self._token_symbol(command, field, symbol) for field in fields}
+        if not any(symbols.values()) and not SYMBOL.fullmatch(symbol):
+            return False
+        for field, token in symbols.items():
+            # A symbol the chain doesn't list is kept as typed, for the address lookup to report
+            command[field] = token or symbol.upper()
+        return True
+
+    def _sent_token_fields(self, command):
+        """"use X" changes what is sent, and what is received too when both were the same token."""
+        if command.get("from_token") == command.get("to_token"):
+            return ("from_token", "to_token")
+        return ("from_token",)
+
+    def _apply_clause(self, command, keyword, phrase):
+        if NUMBER.fullmatch(phrase):
+            return self._set_amount(command, phrase)
+        if keyword == "from":
+            return self._set_chain(command, "from_chain", phrase)
+        if keyword == "to":
+            # "to arbitrum" changes the destination chain, "to usdt" the token received
+            return (self._set_chain(command, "to_chain", phrase)
+                    or (self._token_symbol(command, "to_token", phrase) is not None
+                        and self._set_token(command, ("to_token",), phrase)))
+        if keyword in ("as", "into", "in", "for"):
+            return self._set_token(command, ("to_token",), phrase)
+        return self._set_token(command, self._sent_token_fields(command), phrase)
+
+    def _reverse(self, command):
+        if command["action"] != "cross_chain_send&transfer":
+            return False
+        command["from_chain"], command["to_chain"] = command["to_chain"], command["from_chain"]
+        command["from_token"], command["to_token"] = command["to_token"], command["from_token"]
+        return True
+
+    def parse_delta(self, previous, text):
+        """Return `previous` patched by the refinement in `text`, or None if `text` isn't one."""
+        text = " ".join(text.lower().split()).rstrip(".!?")
+        command = dict(previous)
+        if REVERSE.fullmatch(text):
+            return command if self._reverse(command) else None
+
+        body = TRAILER.sub("", LEAD_IN.sub("", text)).strip()
+        if not body:
+            return command if REPEAT.search(text) else None
+
+        # Split into a leading chunk and (keyword, phrase) clauses: "50 to arbitrum as usdt"
+        parts = KEYWORD.split(body)
+        head, clauses = parts[0].strip(), list(zip(parts[1::2], (part.strip() for part in parts[2::2])))
+        if head:
+            amount = re.fullmatch(rf"({NUMBER.pattern})\s*(%|percent)?(?:\s+(\S+))?", head)
+            if amount is None or not self._set_amount(command, amount.group(1)):
+                return None
+            # "50%" only makes sense for a percentage; it's not 50 tokens or 50 AVAX
+            if amount.group(2) and AMOUNT_FIELDS[command["action"]] != "percentage":
+                return None
+            if amount.group(3) and not self._set_token(command, self._sent_token_fields(previous), amount.group(3)):
+                return None
+        if not head and not clauses:
+            return None
+        for keyword, phrase in clauses:
+            if not phrase or not self._apply_clause(command, keyword, phrase):
+                return None
+        return command
+
+    def apply_delta(self, user_id, text):
+        """Patch the user's previous command with a follow-up, or return None."""
+        previous = self.last(user_id)
+        if previous is None:
+            return None
+        command = self.parse_delta(previous, text)
+        if command is not None:
+            self.deltas += 1
+        return command
+
+    def stats(self):
+        return {"users": len(self.commands), "deltas": self.deltas}
+
+
+conversations = ConversationState()
@@ -0,0 +1,162 @@
+import re
+from collections import defaultdict
+from packages.bungee import CHAIN_IDS, get_token_index
+
+# ------------------------------
+# Entity Resolver
+# ------------------------------
+
+MIN_SCORE = 0.6      # trigram similarity needed to accept a fuzzy chain match
+MIN_MARGIN = 0.1     # lead over the next canonical name, otherwise the name is ambiguous
+SUGGEST_SCORE = 0.35 # candidates worth offering as "did you mean"
+
+# Alternative spellings of CHAIN_IDS names
+CHAIN_ALIASES = {
+    "Ethereum": ["eth", "mainnet", "ethereum mainnet", "erc20"],
+    "Binance Smart Chain": ["bsc", "bnb", "bnb chain", "bnb smart chain", "binance", "bep20"],
+    "Polygon": ["matic", "polygon pos", "pol"],
+    "Avalanche": ["avax", "avalanche c-chain", "avax c-chain", "c-chain"],
+    "Arbitrum": ["arb", "arbitrum one", "arb1"],
+    "Optimism": ["op", "op mainnet", "optimism mainnet"],
+    "Base": ["base mainnet"],
+    "ZKSync": ["zksync era", "zk sync", "zksync"],
+    "Linea": ["linea mainnet"],
+    "Scroll": ["scroll mainnet"],
+}
+
+# Names people use for a token symbol; applied only where the symbol exists on the chain
+TOKEN_ALIASES = {
+    "ether": "ETH",
+    "tether": "USDT",
+    "usd coin": "USDC",
+    "bitcoin": "WBTC",
+    "btc": "WBTC",
+    "bnb": "WBNB",
+}
+
+
+def compact(name):
+    """Lowercase alphanumerics only: "AVAX C-Chain" -> "avaxcchain", "usdc.e" -> "usdce"."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Exact alias table plus a trigram inverted index over the same names.
+
+    `lookup` returns canonical values ranked by Dice similarity of trigrams,
+    scoring only names that share at least one trigram with the query;
+    `exact` only matches aliases, ignoring case and punctuation.
+    """
+
+    def __init__(self, entries):
+        self.aliases = {}                 # compact alias -> canonical
+        self.grams = {}                   # compact alias -> trigram set
+        self.postings = defaultdict(set)  # trigram -> compact aliases
+        for alias, canonical in entries:
+            key = compact(alias)
+            if not key or key in self.aliases:
+                continue
+            self.aliases[key] = canonical
+            self.grams[key] = trigrams(key)
+            for gram in self.grams[key]:
+                self.postings[gram].add(key)
+
+    def exact(self, name):
+        """Canonical value for an alias of `name`, or None."""
+        return self.aliases.get(compact(name))
+
+    def lookup(self, name, limit=3):
+        """Return up to `limit` (canonical, score) pairs, best first; an exact alias scores 1.0."""
+        key = compact(name)
+        if key in self.aliases:
+            return [(self.aliases[key], 1.0)]
+
+        query = trigrams(key)
+        candidates = set().union(*(self.postings.get(gram, ()) for gram in query)) if query else set()
+        best = {}
+        for alias in candidates:
+            grams = self.grams[alias]
+            score = 2 * len(query & grams) / (len(query) + len(grams))
+            canonical = self.aliases[alias]
+            if score > best.get(canonical, 0):
+                best[canonical] = score
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def pick(candidates):
+    """The canonical value when the best candidate is good and unambiguous, else None."""
+    if not candidates or candidates[0][1] < MIN_SCORE:
+        return None
+    if len(candidates) > 1 and candidates[0][1] - candidates[1][1] < MIN_MARGIN:
+        return None
+    return candidates[0][0]
+
+
+def suggestions(candidates):
+    """Candidate names similar enough to offer the user."""
+    return [canonical for canonical, score in candidates if score >= SUGGEST_SCORE]
+
+
+class EntityResolver:
+    """
+    Resolves chain names and token symbols, including aliases and misspellings,
+    to CHAIN_IDS names and registry symbols.
+
+    Token indexes are built per chain on first use and rebuilt when the
+    shared token index is swapped by a registry refresh.
+    """
+
+    def __init__(self, chain_ids=CHAIN_IDS, get_index=get_token_index):
+        self.chain_ids = chain_ids
+        self.get_index = get_index
+        entries = [(name, name) for name in chain_ids]
+        entries += [(alias, name) for name, aliases in CHAIN_ALIASES.items() if name in chain_ids for alias in aliases]
+        self.chains = FuzzyIndex(entries)
+        self.token_index = None
+        self.tokens = {}   # chain_id -> FuzzyIndex of that chain's symbols
+
+    def _tokens(self, chain_id):
+        token_index = self.get_index()
+        if token_index is not self.token_index:
+            self.token_index = token_index
+            self.tokens = {}
+        chain_id = int(chain_id)
+        index = self.tokens.get(chain_id)
+        if index is None:
+            chain = token_index.chain(chain_id)
+            records = chain.by_symbol.values() if chain is not None else []
+            symbols = {record.symbol.lower(): record.symbol for record in records}
+            entries = [(record.symbol, record.symbol) for record in records]
+            entries += [(alias, symbols[symbol.lower()]) for alias, symbol in TOKEN_ALIASES.items()
+                        if symbol.lower() in symbols]
+            index = self.tokens[chain_id] = FuzzyIndex(entries)
+        return index
+
+    def chain_candidates(self, name, limit=3):
+        return self.chains.lookup(name, limit) if name else []
+
+    def token_candidates(self, chain_id, symbol, limit=3):
+        return self._tokens(chain_id).lookup(symbol, limit) if symbol else []
+
+    def resolve_chain(self, name):
+        """CHAIN_IDS name for `name`, or None when it's unknown or ambiguous."""
+        return pick(self.chain_candidates(name))
+
+    def resolve_token(self, chain_id, symbol):
+        """
+        Registry symbol on `chain_id` for `symbol` or an alias of it, or None.
+
+        Unlike chains, tokens are never picked by similarity: near spellings are
+        usually different assets (USDT/USDC, MATIC/MIMATIC, DAI/DAI.E), so those
+        are only offered through token_candidates as suggestions.
+        """
+        return self._tokens(chain_id).exact(symbol) if symbol else None
+
+
+entity_resolver = EntityResolver()
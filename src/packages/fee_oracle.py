@@ -0,0 +1,119 @@
+import asyncio
+import statistics
+import time
+from packages.providers import providers
+
+# ------------------------------
+# EIP-1559 Fee Oracle
+# ------------------------------
+
+FEE_HISTORY_BLOCKS = 20
+PRIORITY_PERCENTILE = 50        # percentile of tips paid in recent blocks
+BASE_FEE_MULTIPLIER = 2         # headroom for the base fee rising while the tx waits
+REFRESH_INTERVAL = 12           # seconds between background refreshes
+MAX_AGE = 60                    # serve cached fees up to this old before refetching inline
+IDLE_TIMEOUT = 600              # stop refreshing chains nobody asked about for this long
+
+
+def compute_fees(fee_history):
+    """
+    Turn an eth_feeHistory result into transaction fee fields.
+
+    The base fee is the projected base fee of the next block (the last entry of
+    baseFeePerGas), the tip is the median of the recent blocks' tips at
+    PRIORITY_PERCENTILE. Chains without a base fee get legacy gasPrice fields
+    from `compute_legacy_fees` instead.
+    """
+    base_fee = fee_history["baseFeePerGas"][-1]
+    tips = [reward[0] for reward in fee_history.get("reward") or [] if reward]
+    priority_fee = int(statistics.median(tips)) if tips else 0
+    return {
+        "maxFeePerGas": base_fee * BASE_FEE_MULTIPLIER + priority_fee,
+        "maxPriorityFeePerGas": priority_fee,
+    }
+
+
+def compute_legacy_fees(gas_price):
+    return {"gasPrice": gas_price}
+
+
+class FeeOracle:
+    """
+    Per-chain fee estimates refreshed from eth_feeHistory in the background.
+
+    Transaction building reads fees from memory with `get_fees` /
+    `async_get_fees`; only a chain seen for the first time (or one whose
+    refresh loop isn't running) costs an inline RPC round-trip.
+    """
+
+    def __init__(self, providers=providers, clock=time.monotonic):
+        self.providers = providers
+        self.clock = clock
+        self.fees = {}        # chain_id -> (fee fields, fetched_at)
+        self.last_used = {}   # chain_id -> last time fees were requested
+        self.task = None
+
+    def _cached(self, chain_id):
+        self.last_used[chain_id] = self.clock()
+        entry = self.fees.get(chain_id)
+        if entry is not None and self.clock() - entry[1] <= MAX_AGE:
+            return entry[0]
+        return None
+
+    def _store(self, chain_id, fees):
+        self.fees[chain_id] = (fees, self.clock())
+        return fees
+
+    def refresh(self, chain_id, w3=None):
+        """Fetch fees for a chain now (blocking)."""
+        chain_id = int(chain_id)
+        w3 = w3 or self.providers.web3(chain_id)
+        history = w3.eth.fee_history(FEE_HISTORY_BLOCKS, "latest", [PRIORITY_PERCENTILE])
+        if history["baseFeePerGas"][-1]:
+            return self._store(chain_id, compute_fees(history))
+        return self._store(chain_id, compute_legacy_fees(w3.eth.gas_price))
+
+    async def async_refresh(self, chain_id):
+        chain_id = int(chain_id)
+        w3 = self.providers.async_web3(chain_id)
+        history = await w3.eth.fee_history(FEE_HISTORY_BLOCKS, "latest", [PRIORITY_PERCENTILE])
+        if history["baseFeePerGas"][-1]:
+            return self._store(chain_id, compute_fees(history))
+        return self._store(chain_id, compute_legacy_fees(await w3.eth.gas_price))
+
+    def get_fees(self, chain_id, w3=None):
+        """Fee fields to merge into a transaction dict for `chain_id`."""
+        fees = self._cached(int(chain_id))
+        return fees if fees is not None else self.refresh(chain_id, w3)
+
+    async def async_get_fees(self, chain_id):
+        fees = self._cached(int(chain_id))
+        return fees if fees is not None else await self.async_refresh(chain_id)
+
+    # ------------------------------
+    # Background refresh
+    # ------------------------------
+
+    async def run(self, chain_ids=()):
+        """Refresh every chain in use each REFRESH_INTERVAL seconds until cancelled."""
+        for chain_id in chain_ids:
+            self.last_used.setdefault(int(chain_id), self.clock())
+
+        while True:
+            now = self.clock()
+            active = [chain_id for chain_id, used in self.last_used.items() if now - used <= IDLE_TIMEOUT]
+            results = await asyncio.gather(*(self.async_refresh(chain_id) for chain_id in active),
+                                           return_exceptions=True)
+            for chain_id, result in zip(active, results):
+                if isinstance(result, Exception):
+                    print(f"Error refreshing fees for chain {chain_id}: {result}")
+            await asyncio.sleep(REFRESH_INTERVAL)
+
+    def start(self, chain_ids=()):
+        """Start the background refresh on the running event loop."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run(chain_ids))
+        return self.task
+
+
+fee_oracle = FeeOracle()
@@ -0,0 +1,110 @@
+import json
+import os
+import zlib
+import numpy as np
+from packages.parse_cache import normalize_command
+
+# ------------------------------
+# Intent Classifier
+# ------------------------------
+
+EXAMPLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_examples.json")
+DIMENSIONS = 2 ** 12        # hashed feature space
+MIN_CONFIDENCE = 0.30       # cosine similarity to the best action's centroid
+MIN_MARGIN = 0.15           # lead over the runner-up
+
+
+def features(text):
+    """Hashed word unigrams, word bigrams and character 3/4-grams of the normalized text."""
+    normalized, _ = normalize_command(text)
+    words = normalized.split()
+    grams = [f"w:{word}" for word in words]
+    grams += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+    padded = f" {normalized} "
+    for n in (3, 4):
+        grams += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+    # crc32 rather than hash() so indices are stable across processes
+    return [zlib.crc32(gram.encode("utf-8")) % DIMENSIONS for gram in grams]
+
+
+class IntentClassifier:
+    """
+    Nearest-centroid classifier over hashed TF-IDF n-gram vectors.
+
+    Each action's centroid is the normalized mean of its example vectors, so
+    predicting is one matrix product: `predict_batch` scores any number of
+    messages against all actions at once. A prediction only counts when it
+    is similar enough to its centroid and clearly ahead of the runner-up.
+    """
+
+    def __init__(self, actions, centroids, idf):
+        self.actions = actions
+        self.centroids = centroids
+        self.idf = idf
+        self.confident = 0
+        self.unsure = 0
+
+    @classmethod
+    def from_examples(cls, examples):
+        """Train on {action: [example message, ...]}."""
+        actions = list(examples)
+        texts = [text for action in actions for text in examples[action]]
+        labels = np.array([index for index, action in enumerate(actions) for _ in examples[action]])
+
+        counts = cls._counts(texts)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        vectors = cls._weigh(counts, idf)
+        centroids = np.stack([vectors[labels == index].mean(axis=0) for index in range(len(actions))])
+        centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+        return cls(actions, centroids, idf)
+
+    @classmethod
+    def load(cls, path=EXAMPLES_PATH):
+        with open(path, "r") as f:
+            return cls.from_examples(json.load(f))
+
+    @staticmethod
+    def _counts(texts):
+        counts = np.zeros((len(texts), DIMENSIONS), dtype=np.float32)
+        for row, text in enumerate(texts):
+            np.add.at(counts[row], features(text), 1)
+        return counts
+
+    @staticmethod
+    def _weigh(counts, idf):
+        vectors = np.log1p(counts) * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def scores(self, texts):
+        """Cosine similarity of each message to each action, shape (len(texts), len(actions))."""
+        return self._weigh(self._counts(texts), self.idf) @ self.centroids.T
+
+    def predict_batch(self, texts):
+        """Return [(action or None, confidence), ...], None where the classifier isn't sure."""
+        scores = self.scores(texts)
+        best = scores.argmax(axis=1)
+        top_two = np.sort(scores, axis=1)[:, -2:]
+        sure = (top_two[:, 1] >= MIN_CONFIDENCE) & (top_two[:, 1] - top_two[:, 0] >= MIN_MARGIN)
+        self.confident += int(sure.sum())
+        self.unsure += int(len(texts) - sure.sum())
+        return [
+            (self.actions[index] if is_sure else None, float(confidence))
+            for index, is_sure, confidence in zip(best, sure, top_two[:, 1])
+        ]
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
+
+    def stats(self):
+        total = self.confident + self.unsure
+        return {
+            "confident": self.confident,
+            "unsure": self.unsure,
+            "confident_rate": self.confident / total if total else 0.0,
+        }
+
+
+intent_classifier = IntentClassifier.load()
@@ -0,0 +1,63 @@
+import math
+import threading
+from collections import deque
+
+# ------------------------------
+# LLM Usage Accounting
+# ------------------------------
+
+LATENCY_SAMPLES = 1000   # most recent calls kept per action for percentiles
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class _ActionUsage:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+
+class LLMUsage:
+    """
+    Token and latency totals for LLM calls, grouped by the action they resolved to.
+
+    Calls that produced no valid command are grouped under "unparsed".
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.actions = {}
+
+    def record(self, action, latency, prompt_tokens=0, completion_tokens=0, failed=False):
+        with self.lock:
+            usage = self.actions.setdefault(action or "unparsed", _ActionUsage())
+            usage.calls += 1
+            usage.failures += int(failed)
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            usage.latencies.append(latency)
+
+    def stats(self):
+        with self.lock:
+            return {
+                action: {
+                    "calls": usage.calls,
+                    "failures": usage.failures,
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                    "avg_tokens": (usage.prompt_tokens + usage.completion_tokens) / usage.calls,
+                    "p50_latency": percentile(usage.latencies, 0.50),
+                    "p95_latency": percentile(usage.latencies, 0.95),
+                    "p99_latency": percentile(usage.latencies, 0.99),
+                }
+                for action, usage in self.actions.items()
+            }
@@ -1,45 +1,219 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 import json
 import os
 import re
+import time
+from packages.command_parser import command_parser
+from packages.parse_cache import ParseCache
+from packages.llm_usage import LLMUsage
+from packages.intent_classifier import intent_classifier
 
 # Load environment variables
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Initialize OpenAI client
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+NLP_TIMEOUT = float(os.getenv("NLP_TIMEOUT", "10"))   # seconds before giving up on a completion
+NLP_MAX_TOKENS = 120                                  # a parse_command call is a few dozen tokens
+
+# Initialize OpenAI clients
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
+async_openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=NLP_TIMEOUT, max_retries=1)
+
+# Prompt/completion tokens and latency of every async LLM parse, per action
+llm_usage = LLMUsage()
 
 # ------------------------------
 # NLP Processing using OpenAI
 # ------------------------------
 
+# Possible actions and their required fields
+ACTION_FIELDS = {
+    "cross_chain_send&transfer": ["amount", "from_token", "to_token", "from_chain", "to_chain"],
+    "get_pool_deposits": [],
+    "get_pool_rewards": [],
+    "get_my_balance": [],
+    "get_my_rewards": [],
+    "get_leverage": [],
+    "deposits": ["amount_avax"],
+    "withdraw_rewards": [],
+    "reinvest_rewards": [],
+    "withdraw_partial": ["percentage"],
+    "withdraw_everything": [],
+    "check_apr":[]
+}
+
+# Actions that only read state; a confident classifier pick of one of these is answered directly.
+# Anything that moves funds always goes through the full parser, which can tell
+# "withdraw everything" from "don't withdraw everything" or "how do I withdraw everything?"
+READ_ONLY_ACTIONS = {"get_pool_deposits", "get_pool_rewards", "get_my_balance", "get_my_rewards", "get_leverage", "check_apr"}
+
+# Validated LLM parses, reused for messages that only differ in case, spacing or numbers
+parse_cache = ParseCache(
+    ACTION_FIELDS,
+    ttl=float(os.getenv("PARSE_CACHE_TTL", "86400")),
+    max_size=int(os.getenv("PARSE_CACHE_SIZE", "1024")),
+    path=os.getenv("PARSE_CACHE_PATH"),
+    save_delay=float(os.getenv("PARSE_CACHE_SAVE_DELAY", "5")),
+)
+
+# JSON schema types of the numeric fields; every other field is a string
+FIELD_TYPES = {
+    "amount": "number",
+    "amount_avax": "number",
+    "percentage": "number",
+}
+
+def command_tool(action_fields=ACTION_FIELDS):
+    """Function-calling tool whose arguments are an action and the union of all action fields."""
+    fields = sorted({field for required in action_fields.values() for field in required})
+    return {
+        "type": "function",
+        "function": {
+            "name": "parse_command",
+            "description": "Record the action the user asked for and the fields it needs.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "action": {"type": "string", "enum": list(action_fields)},
+                    **{field: {"type": [FIELD_TYPES.get(field, "string"), "null"]} for field in fields},
+                },
+                "required": ["action"],
+            },
+        },
+    }
+
+def command_system_prompt(action_fields=ACTION_FIELDS):
+    lines = [f"- {action}: {', '.join(fields) or 'no fields required'}" for action, fields in action_fields.items()]
+    return (
+        "You extract structured commands for a DeFi Telegram bot. Call parse_command with the action "
+        "the user asked for and the fields that action requires:\n" + "\n".join(lines) +
+        "\nUse null for any field that is missing or ambiguous."
+    )
+
+COMMAND_TOOL = command_tool()
+COMMAND_SYSTEM_PROMPT = command_system_prompt()
+
+def validate_command(parsed):
+    """Return `parsed` if its action is known and every required field has a value, else None."""
+    action = parsed.get("action")
+    if action not in ACTION_FIELDS:
+        print(f"Unknown action: {action}")
+        return None
+    # The model returns null for fields it couldn't find; those count as missing
+    if not all(parsed.get(key) is not None for key in ACTION_FIELDS[action]):
+        print(f"Missing or ambiguous fields in the parsed response for action: {action}")
+        return None
+    return parsed
+
+def _parse_without_llm(text):
+    """Rule-based fast path, then the parse cache. Returns None when the LLM is needed."""
+    # Commands with an obvious structure skip the LLM entirely
+    parsed = command_parser.parse(text)
+    if parsed is not None:
+        print("Fast path parsed:", parsed)
+        return parsed
+
+    parsed = parse_cache.get(text)
+    if parsed is not None:
+        print("Parse cache hit:", parsed)
+    return parsed
+
+def _classify(text):
+    """Action picked by the local intent classifier, or None when it isn't confident."""
+    action, confidence = intent_classifier.predict(text)
+    if action is not None:
+        print(f"Intent classifier picked {action} ({confidence:.2f})")
+    return action
+
+def _remember(text, parsed):
+    if parsed is not None:
+        parse_cache.put(text, parsed)
+    return parsed
+
 def parse_command_nlp(text: str):
     """
-    Use OpenAI's language model to parse the user's command.
+    Parse the user's command: rule-based fast path first, then the parse
+    cache, then the local intent classifier, then OpenAI's language model.
     Expected keys vary based on the action type.
     """
-    # Define possible actions and their required fields
-    action_fields = {
-        "cross_chain_send&transfer": ["amount", "from_token", "to_token", "from_chain", "to_chain"],
-        "get_pool_deposits": [],
-        "get_pool_rewards": [],
-        "get_my_balance": [],
-        "get_my_rewards": [],
-        "get_leverage": [],
-        "deposits": ["amount_avax"],
-        "withdraw_rewards": [],
-        "reinvest_rewards": [],
-        "withdraw_partial": ["percentage"],
-        "withdraw_everything": [],
-        "check_apr":[]
-    }
+    parsed = _parse_without_llm(text)
+    if parsed is not None:
+        return parsed
+
+    action = _classify(text)
+    if action in READ_ONLY_ACTIONS:
+        return {"action": action}
+    return _remember(text, parse_command_llm(text))
 
+async def async_parse_command_nlp(text: str):
+    """Non-blocking parse_command_nlp for the bot's handlers."""
+    parsed = _parse_without_llm(text)
+    if parsed is not None:
+        return parsed
+
+    # Read-only actions are fully answered by the classifier
+    action = _classify(text)
+    if action in READ_ONLY_ACTIONS:
+        return {"action": action}
+    return _remember(text, await async_parse_command_llm(text))
+
+async def async_parse_command_llm(text: str):
+    """
+    Parse the command with one forced parse_command function call, so the
+    reply is schema-shaped JSON instead of free text to scrape. Tokens and
+    latency are recorded in `llm_usage`.
+    """
+    started = time.perf_counter()
+    try:
+        response = await async_openai_client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": COMMAND_SYSTEM_PROMPT},
+                {"role": "user", "content": text}
+            ],
+            tools=[COMMAND_TOOL],
+            tool_choice={"type": "function", "function": {"name": "parse_command"}},
+            max_tokens=NLP_MAX_TOKENS,
+            temperature=0
+        )
+    except Exception as e:
+        llm_usage.record(None, time.perf_counter() - started, failed=True)
+        print(f"Error parsing command via NLP: {e}")
+        return None
+    latency = time.perf_counter() - started
+
+    parsed = None
+    tool_calls = response.choices[0].message.tool_calls
+    if tool_calls:
+        try:
+            parsed = validate_command(json.loads(tool_calls[0].function.arguments))
+            print("Parsed function call:", parsed)
+        except json.JSONDecodeError as e:
+            print(f"Error decoding function arguments: {e}")
+    else:
+        print("No function call in the response.")
+
+    usage = response.usage
+    llm_usage.record(
+        parsed["action"] if parsed else None,
+        latency,
+        prompt_tokens=usage.prompt_tokens if usage else 0,
+        completion_tokens=usage.completion_tokens if usage else 0,
+        failed=parsed is None,
+    )
+    return parsed
+
+def parse_command_llm(text: str):
+    """
+    Use OpenAI's language model to parse the user's command.
+    Returns the parsed dict once its action and required fields check out, else None.
+    """
     # Generate the prompt dynamically based on the action type
     prompt = f"""
 Extract the following information from the command below:
-- action: one of {list(action_fields.keys())}
+- action: one of {list(ACTION_FIELDS.keys())}
 - fields: depending on the action, extract the relevant fields from the command.
 
 For each action, the required fields are:
@@ -92,17 +266,7 @@ Example:
                 print("Parsed JSON:", parsed)
 
                 # Validate the parsed response based on the action type
-                action = parsed.get("action")
-                if action not in action_fields:
-                    print(f"Unknown action: {action}")
-                    return None
-
-                required_fields = action_fields[action]
-                if all(key in parsed for key in required_fields):
-                    return parsed
-                else:
-                    print(f"Missing or ambiguous fields in the parsed response for action: {action}")
-                    return None
+                return validate_command(parsed)
             else:
                 print("No JSON found in the response.")
                 return None
@@ -0,0 +1,119 @@
+import threading
+import time
+
+# ------------------------------
+# Nonce Manager
+# ------------------------------
+
+class NonceManager:
+    """
+    Hands out nonces locally per (chain_id, address).
+
+    The first allocation for an account reads the `pending` transaction count;
+    after that nonces are counted locally, so several transactions (e.g. an
+    approval and the transfer it unlocks) can be signed with consecutive
+    nonces and broadcast back-to-back. Call `resync` when a send fails so the
+    next allocation reads the chain again. Accounts idle for `idle_timeout`
+    seconds are re-read too, which recovers from dropped transactions.
+    """
+
+    def __init__(self, idle_timeout=60.0, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.accounts = {}   # (chain_id, address) -> [next nonce, last used]
+
+    def _key(self, chain_id, address):
+        return (int(chain_id), address.lower())
+
+    def _is_fresh(self, account):
+        return account is not None and self.clock() - account[1] <= self.idle_timeout
+
+    def _peek(self, key, chain_nonce):
+        with self.lock:
+            account = self.accounts.get(key)
+            if self._is_fresh(account):
+                return account[0]
+            if chain_nonce is None:
+                return None
+            self.accounts[key] = [chain_nonce, self.clock()]
+            return chain_nonce
+
+    def _reserve(self, key, chain_nonce, count):
+        """Reserve nonces, or return None when the chain has to be read first."""
+        with self.lock:
+            account = self.accounts.get(key)
+            if not self._is_fresh(account):
+                if chain_nonce is None:
+                    return None
+                # A fresh read from the chain replaces whatever was counted locally
+                account = self.accounts[key] = [chain_nonce, 0]
+            nonce = account[0]
+            account[0] += count
+            account[1] = self.clock()
+            return nonce
+
+    # ------------------------------
+    # Blocking interface
+    # ------------------------------
+
+    def next_nonce(self, w3, chain_id, address):
+        """Return the next nonce without reserving it."""
+        key = self._key(chain_id, address)
+        nonce = self._peek(key, None)
+        if nonce is None:
+            nonce = self._peek(key, w3.eth.get_transaction_count(address, "pending"))
+        return nonce
+
+    def allocate(self, w3, chain_id, address, count=1):
+        """Reserve `count` consecutive nonces and return the first."""
+        key = self._key(chain_id, address)
+        nonce = self._reserve(key, None, count)
+        if nonce is None:
+            nonce = self._reserve(key, w3.eth.get_transaction_count(address, "pending"), count)
+        return nonce
+
+    # ------------------------------
+    # asyncio interface
+    # ------------------------------
+
+    async def async_next_nonce(self, async_w3, chain_id, address):
+        key = self._key(chain_id, address)
+        nonce = self._peek(key, None)
+        if nonce is None:
+            nonce = self._peek(key, await async_w3.eth.get_transaction_count(address, "pending"))
+        return nonce
+
+    async def async_allocate(self, async_w3, chain_id, address, count=1):
+        key = self._key(chain_id, address)
+        nonce = self._reserve(key, None, count)
+        if nonce is None:
+            nonce = self._reserve(key, await async_w3.eth.get_transaction_count(address, "pending"), count)
+        return nonce
+
+    # ------------------------------
+    # Bookkeeping
+    # ------------------------------
+
+    def claim(self, chain_id, address, first_nonce, count=1):
+        """
+        Reserve exactly `first_nonce`..`first_nonce + count - 1` if they are
+        still next in line. Used for transactions signed ahead of time with a
+        nonce from `next_nonce`; returns False if another send took them first.
+        """
+        key = self._key(chain_id, address)
+        with self.lock:
+            account = self.accounts.get(key)
+            if account is not None and account[0] != first_nonce:
+                return False
+            self.accounts[key] = [first_nonce + count, self.clock()]
+            return True
+
+    def resync(self, chain_id, address):
+        """Forget the local count so the next allocation reads `pending` from the chain."""
+        with self.lock:
+            self.accounts.pop(self._key(chain_id, address), None)
+
+
+# Shared by the bridge flow and AvaYieldInteractor so they never hand out the same nonce
+nonce_manager = NonceManager()
@@ -0,0 +1,217 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# ------------------------------
+# Parse Cache
+# ------------------------------
+
+SAVE_DELAY = 5.0   # seconds changes are batched before the file is rewritten
+
+NUMBER = re.compile(r"\d+(?:\.\d*)?|\.\d+")
+PLACEHOLDER = "<num>"
+
+
+def normalize_command(text):
+    """
+    Fold a command to its cache key: lowercase, single spaces, no trailing
+    punctuation, numbers replaced by a placeholder. Returns (key, numbers).
+    "Send 100 USDC" and "send 5 usdc!" share the key "send <num> usdc".
+    """
+    text = " ".join(text.lower().split()).rstrip(".!?")
+    numbers = [float(value) for value in NUMBER.findall(text)]
+    return NUMBER.sub(PLACEHOLDER, text), numbers
+
+
+def schema_fingerprint(action_fields):
+    """Short hash of the action/field schema; cached parses are only valid for the schema they were made with."""
+    return hashlib.sha256(json.dumps(action_fields, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _as_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and NUMBER.fullmatch(value.strip()):
+        return float(value)
+    return None
+
+
+def _to_number(value):
+    return int(value) if value.is_integer() else value
+
+
+class ParseCache:
+    """
+    LRU + TTL cache of validated command parses keyed on normalized text.
+
+    Numeric fields are stored as references to the numbers in the message
+    ({"$num": i}), so one entry serves every amount typed with the same
+    phrasing. Parses whose numbers can't be traced back to the message are
+    not cached. With `path`, entries are saved to a JSON file and reloaded
+    on restart; changes are written in the background at most every
+    `save_delay` seconds, and once more at exit. Entries are tied to a schema fingerprint; `set_schema`
+    drops them when ACTION_FIELDS changes.
+    """
+
+    def __init__(self, action_fields, ttl=86400.0, max_size=1024, path=None, save_delay=SAVE_DELAY, clock=time.time):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.path = path
+        self.save_delay = save_delay
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()   # one writer at a time, so an older copy never lands last
+        self.save_timer = None
+        self.dirty = False
+        self.entries = OrderedDict()   # key -> (expires_at, template)
+        self.fingerprint = schema_fingerprint(action_fields)
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.uncacheable = 0
+
+        if path:
+            self.load()
+            atexit.register(self.flush)
+
+    def _template(self, parsed, numbers):
+        template = {}
+        for field, value in parsed.items():
+            number = _as_number(value) if field != "action" else None
+            if number is None:
+                template[field] = value
+            elif number in numbers:
+                template[field] = {"$num": numbers.index(number)}
+            else:
+                return None
+        return template
+
+    def _fill(self, template, numbers):
+        parsed = {}
+        for field, value in template.items():
+            if isinstance(value, dict) and "$num" in value:
+                if value["$num"] >= len(numbers):
+                    return None
+                value = _to_number(numbers[value["$num"]])
+            parsed[field] = value
+        return parsed
+
+    def get(self, text):
+        """Return the cached parse for `text` with its own numbers filled in, or None."""
+        key, numbers = normalize_command(text)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self._fill(entry[1], numbers)
+
+    def put(self, text, parsed):
+        """Cache a parse that already passed validation."""
+        key, numbers = normalize_command(text)
+        template = self._template(parsed, numbers)
+        with self.lock:
+            if template is None:
+                self.uncacheable += 1
+                return
+            self.entries[key] = (self.clock() + self.ttl, template)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            self.stores += 1
+        self._schedule_save()
+
+    # ------------------------------
+    # Invalidation
+    # ------------------------------
+
+    def invalidate(self):
+        """Drop every cached parse."""
+        with self.lock:
+            self.entries.clear()
+        self._schedule_save()
+
+    def set_schema(self, action_fields):
+        """Call when ACTION_FIELDS changes; clears the cache if the schema is different."""
+        fingerprint = schema_fingerprint(action_fields)
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.invalidate()
+
+    # ------------------------------
+    # Persistence
+    # ------------------------------
+
+    def _schedule_save(self):
+        if not self.path:
+            return
+        with self.lock:
+            self.dirty = True
+            if self.save_timer is not None:
+                return
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        """Write pending changes now instead of waiting for the timer."""
+        with self.save_lock:
+            with self.lock:
+                if self.save_timer is not None:
+                    self.save_timer.cancel()
+                    self.save_timer = None
+                if not self.dirty:
+                    return
+                self.dirty = False
+            self.save()
+
+    def save(self):
+        with self.lock:
+            data = {"fingerprint": self.fingerprint, "entries": list(self.entries.items())}
+        # Write then rename so a crash never leaves a truncated file behind
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        """Load entries saved by a previous run, skipping expired ones and other schemas."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading parse cache: {e}")
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            return
+        now = self.clock()
+        with self.lock:
+            for key, (expires_at, template) in data.get("entries", []):
+                if expires_at > now:
+                    self.entries[key] = (expires_at, template)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "uncacheable": self.uncacheable,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from collections import namedtuple
+
+# ------------------------------
+# AvaYield Pool State
+# ------------------------------
+
+POLL_INTERVAL = 2   # seconds between new-block checks; Avalanche makes a block every ~2s
+MAX_AGE = 30        # a snapshot not confirmed current for this long is refetched inline
+
+# Pool-wide strategy values (raw uint256 / wei) as of `block_number`. `checked_at` is
+# when the snapshot was last confirmed to match the chain head.
+PoolSnapshot = namedtuple("PoolSnapshot", [
+    "block_number", "total_deposits", "total_rewards", "leverage", "total_supply", "min_reinvest", "checked_at",
+])
+
+
+def pool_calls(reader):
+    """View calls for the snapshot fields, in PoolSnapshot order."""
+    functions = reader.contract.functions
+    return [
+        functions.totalDeposits(),
+        functions.checkReward(),
+        functions.getActualLeverage(),
+        functions.totalSupply(),
+        functions.MIN_TOKENS_TO_REINVEST(),
+    ]
+
+
+def read_snapshot(reader, block_number, checked_at=None):
+    """Read the pool-wide values at `block_number` with one batched call through an AvaYieldInteractor."""
+    values = reader.read(*pool_calls(reader), block_identifier=block_number)
+    return PoolSnapshot(block_number, *values, checked_at)
+
+
+class PoolState:
+    """
+    Shared in-memory snapshot of the AvaYield pool, refreshed once per new block.
+
+    A background task checks the block number every POLL_INTERVAL seconds and,
+    when the chain has moved, reads the pool values pinned to that block and
+    swaps in a new immutable PoolSnapshot. Every user's reads come from the
+    snapshot, so RPC load for pool values doesn't grow with the number of
+    users. If the task isn't running (or keeps failing) `get` refetches inline
+    once the snapshot is older than MAX_AGE.
+    """
+
+    def __init__(self, reader, poll_interval=POLL_INTERVAL, max_age=MAX_AGE, clock=time.monotonic):
+        self.reader = reader   # read-only AvaYieldInteractor on the shared contract
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.clock = clock
+        self.lock = threading.Lock()         # publishing a snapshot
+        self.fetch_lock = threading.Lock()   # one inline fetch at a time from `get`
+        self.snapshot = None
+        self.task = None
+        self.refreshes = 0
+
+    def _publish(self, snapshot):
+        """
+        Swap in `snapshot` unless one of a later block was published meanwhile
+        (the refresh task and an inline fetch can race); returns the current snapshot.
+        """
+        with self.lock:
+            if self.snapshot is None or snapshot.block_number >= self.snapshot.block_number:
+                self.snapshot = snapshot
+            return self.snapshot
+
+    def fetch(self, block_number=None):
+        """Read a new snapshot at `block_number` (the chain head by default) and publish it."""
+        if block_number is None:
+            block_number = self.reader.w3.eth.block_number
+        snapshot = read_snapshot(self.reader, block_number, self.clock())
+        self.refreshes += 1
+        return self._publish(snapshot)
+
+    def refresh(self):
+        """Fetch a snapshot if a new block has been produced since the current one."""
+        block_number = self.reader.w3.eth.block_number
+        current = self.snapshot
+        if current is not None and current.block_number >= block_number:
+            return self._publish(current._replace(checked_at=self.clock()))
+        return self.fetch(block_number)
+
+    def _fresh(self, snapshot, min_block):
+        if snapshot is None or self.clock() - snapshot.checked_at > self.max_age:
+            return False
+        return min_block is None or snapshot.block_number >= min_block
+
+    def get(self, min_block=None):
+        """
+        The current snapshot; blocking callers share one inline fetch when it's
+        missing, stale, or older than `min_block` (e.g. a just-mined transaction's block).
+        """
+        snapshot = self.snapshot
+        if self._fresh(snapshot, min_block):
+            return snapshot
+        with self.fetch_lock:
+            snapshot = self.snapshot
+            if self._fresh(snapshot, min_block):
+                return snapshot
+            return self.fetch()
+
+    # ------------------------------
+    # Background refresh
+    # ------------------------------
+
+    async def run(self):
+        """Follow new blocks until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                print(f"Error refreshing AvaYield pool state: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        """Start the background refresh on the running event loop."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return self.task
+
+    def stats(self):
+        snapshot = self.snapshot
+        return {
+            "block_number": snapshot.block_number if snapshot else None,
+            "age": self.clock() - snapshot.checked_at if snapshot else None,
+            "refreshes": self.refreshes,
+        }
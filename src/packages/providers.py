@@ -0,0 +1,101 @@
+import json
+import os
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from web3 import Web3, AsyncWeb3
+
+load_dotenv()
+
+# ------------------------------
+# Web3 Provider Registry
+# ------------------------------
+
+# Public endpoints used when no RPC is configured for a chain
+DEFAULT_RPC_URLS = {
+    1: os.getenv("WEB3_PROVIDER", "https://mainnet.infura.io/v3/YOUR_INFURA_PROJECT_ID"),
+    10: "https://mainnet.optimism.io",
+    56: "https://bsc-dataseed.bnbchain.org",
+    137: "https://polygon-rpc.com",
+    324: "https://mainnet.era.zksync.io",
+    8453: "https://mainnet.base.org",
+    42161: "https://arb1.arbitrum.io/rpc",
+    43114: os.getenv("AVAX_RPC_URL", "https://api.avax.network/ext/bc/C/rpc"),
+    59144: "https://rpc.linea.build",
+    534352: "https://rpc.scroll.io",
+}
+
+
+class ProviderRegistry:
+    """
+    One Web3 instance per chain ID, each with its own pooled HTTP session.
+
+    Instances are created on first use and reused afterwards, so every chain
+    operation goes to that chain's RPC over warm connections.
+    """
+
+    def __init__(self, rpc_urls, pool_size=10):
+        self.rpc_urls = {int(chain_id): url for chain_id, url in rpc_urls.items()}
+        self.pool_size = pool_size
+        self.web3s = {}
+        self.async_web3s = {}
+
+    @classmethod
+    def from_env(cls, config_path=None):
+        """
+        Build the registry from DEFAULT_RPC_URLS, then an optional JSON file
+        ({"<chain_id>": "<url>"}, path in RPC_CONFIG_PATH), then RPC_URL_<chain_id>
+        environment variables, later sources overriding earlier ones.
+        """
+        rpc_urls = dict(DEFAULT_RPC_URLS)
+
+        config_path = config_path or os.getenv("RPC_CONFIG_PATH")
+        if config_path:
+            with open(config_path, "r") as f:
+                rpc_urls.update({int(chain_id): url for chain_id, url in json.load(f).items()})
+
+        for name, url in os.environ.items():
+            if name.startswith("RPC_URL_") and name[len("RPC_URL_"):].isdigit():
+                rpc_urls[int(name[len("RPC_URL_"):])] = url
+
+        return cls(rpc_urls, pool_size=int(os.getenv("RPC_POOL_SIZE", "10")))
+
+    def rpc_url(self, chain_id):
+        url = self.rpc_urls.get(int(chain_id))
+        if url is None:
+            raise ValueError(f"No RPC configured for chain ID {chain_id}")
+        return url
+
+    def chain_ids(self):
+        return list(self.rpc_urls)
+
+    def web3(self, chain_id):
+        """Blocking Web3 for a chain."""
+        chain_id = int(chain_id)
+        w3 = self.web3s.get(chain_id)
+        if w3 is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            w3 = Web3(Web3.HTTPProvider(self.rpc_url(chain_id), session=session))
+            self.web3s[chain_id] = w3
+        return w3
+
+    def async_web3(self, chain_id):
+        """AsyncWeb3 for a chain; the provider keeps one aiohttp session per event loop."""
+        chain_id = int(chain_id)
+        w3 = self.async_web3s.get(chain_id)
+        if w3 is None:
+            w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.rpc_url(chain_id)))
+            self.async_web3s[chain_id] = w3
+        return w3
+
+
+providers = ProviderRegistry.from_env()
+
+def get_web3(chain_id):
+    return providers.web3(chain_id)
+
+def get_async_web3(chain_id):
+    return providers.async_web3(chain_id)
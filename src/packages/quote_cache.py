@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+# ------------------------------
+# Quote Cache
+# ------------------------------
+
+class _Flight:
+    """An upstream call in progress that identical requests wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class QuoteCache:
+    """
+    TTL + LRU cache for Bungee quotes with single-flight coalescing.
+
+    Entries live for `ttl` seconds and the least recently used entry is
+    evicted once `max_size` is reached. Concurrent requests for the same key
+    share one upstream call instead of each hitting /quote. Only successful
+    responses are cached; a failed fetch is raised to every waiter.
+    """
+
+    def __init__(self, ttl=10.0, max_size=256, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.entries = OrderedDict()     # key -> (expires_at, quote)
+        self.lock = threading.Lock()
+        self.flights = {}                # key -> _Flight (threads)
+        self.async_flights = {}          # key -> asyncio.Future (event loop)
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _lookup(self, key):
+        """Return a fresh cached quote or None. Caller holds the lock."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, quote = entry
+        if expires_at <= self.clock():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return quote
+
+    def _store(self, key, quote):
+        with self.lock:
+            self.entries[key] = (self.clock() + self.ttl, quote)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_fetch(self, key, fetch):
+        """Return the cached quote for `key`, calling `fetch()` once on a miss."""
+        with self.lock:
+            quote = self._lookup(key)
+            if quote is not None:
+                self.hits += 1
+                return quote
+            flight = self.flights.get(key)
+            if flight is None:
+                self.misses += 1
+                flight = self.flights[key] = _Flight()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fetch()
+            self._store(key, flight.result)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self.flights.pop(key, None)
+            flight.done.set()
+
+    async def aget_or_fetch(self, key, fetch):
+        """asyncio variant of get_or_fetch; `fetch` is a coroutine function."""
+        with self.lock:
+            quote = self._lookup(key)
+            if quote is not None:
+                self.hits += 1
+                return quote
+            future = self.async_flights.get(key)
+            if future is None:
+                self.misses += 1
+                future = self.async_flights[key] = asyncio.get_running_loop().create_future()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            # Shield so one cancelled waiter doesn't cancel the shared call
+            return await asyncio.shield(future)
+
+        try:
+            quote = await fetch()
+            self._store(key, quote)
+            future.set_result(quote)
+            return quote
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved so a future nobody else awaited doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            with self.lock:
+                self.async_flights.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self.entries),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
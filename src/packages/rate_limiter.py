@@ -0,0 +1,190 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+# ------------------------------
+# Priority Rate Limiter
+# ------------------------------
+
+# Lower value = served first
+EXECUTION = 0   # build-tx and approvals for users who already confirmed
+STATUS = 1      # bridge status polling
+QUOTE = 2       # quotes for users who are still browsing
+
+PRIORITY_NAMES = {EXECUTION: "execution", STATUS: "status", QUOTE: "quote"}
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request couldn't be scheduled before its deadline."""
+
+
+class _Waiter:
+    def __init__(self, priority, seq, enqueued_at, wake):
+        self.priority = priority
+        self.seq = seq
+        self.enqueued_at = enqueued_at
+        self.wake = wake
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every caller of an API key, with a priority queue.
+
+    Tokens refill at `rate` per second up to `burst`. Callers that can't get a
+    token right away queue up and are served strictly by priority class, then
+    arrival order, so execution calls overtake queued quote calls. A caller
+    gives up with RateLimitTimeout once its deadline passes. Works from both
+    threads (`acquire`) and coroutines (`async_acquire`).
+    """
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated_at = clock()
+        self.lock = threading.Lock()
+        self.queue = []
+        self.seq = itertools.count()
+
+        self.depth = {priority: 0 for priority in PRIORITY_NAMES}
+        self.granted = {priority: 0 for priority in PRIORITY_NAMES}
+        self.timeouts = {priority: 0 for priority in PRIORITY_NAMES}
+        self.total_wait = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self.max_wait = {priority: 0.0 for priority in PRIORITY_NAMES}
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _pop_cancelled(self):
+        while self.queue and self.queue[0].cancelled:
+            heapq.heappop(self.queue)
+
+    def _enqueue(self, priority, wake):
+        with self.lock:
+            waiter = _Waiter(priority, next(self.seq), self.clock(), wake)
+            heapq.heappush(self.queue, waiter)
+            self.depth[priority] += 1
+            return waiter
+
+    def _try_acquire(self, waiter):
+        """
+        Returns (True, None) once the waiter holds a token, otherwise (False, delay)
+        where delay is how long until the next token if the waiter is first in line,
+        or None if it has to wait to be woken up.
+        """
+        with self.lock:
+            self._refill()
+            self._pop_cancelled()
+            if self.queue[0] is not waiter:
+                return False, None
+            if self.tokens < 1:
+                return False, (1 - self.tokens) / self.rate
+
+            self.tokens -= 1
+            heapq.heappop(self.queue)
+            self._record(waiter)
+            self._wake_next()
+            return True, None
+
+    def _record(self, waiter):
+        waited = self.clock() - waiter.enqueued_at
+        self.depth[waiter.priority] -= 1
+        self.granted[waiter.priority] += 1
+        self.total_wait[waiter.priority] += waited
+        self.max_wait[waiter.priority] = max(self.max_wait[waiter.priority], waited)
+
+    def _wake_next(self):
+        self._pop_cancelled()
+        if self.queue:
+            self.queue[0].wake()
+
+    def _cancel(self, waiter):
+        with self.lock:
+            waiter.cancelled = True
+            self.depth[waiter.priority] -= 1
+            self.timeouts[waiter.priority] += 1
+            self._wake_next()
+
+    def _remaining(self, deadline):
+        return None if deadline is None else deadline - self.clock()
+
+    # ------------------------------
+    # Blocking interface
+    # ------------------------------
+
+    def acquire(self, priority=QUOTE, timeout=None):
+        """Block until a token is available for this priority class."""
+        deadline = None if timeout is None else self.clock() + timeout
+        event = threading.Event()
+        waiter = self._enqueue(priority, event.set)
+        while True:
+            acquired, delay = self._try_acquire(waiter)
+            if acquired:
+                return
+            remaining = self._remaining(deadline)
+            if remaining is not None and remaining <= 0:
+                self._cancel(waiter)
+                raise RateLimitTimeout(f"{PRIORITY_NAMES[priority]} request not scheduled within {timeout}s")
+            waits = [value for value in (delay, remaining) if value is not None]
+            event.wait(min(waits) if waits else None)
+            event.clear()
+
+    # ------------------------------
+    # asyncio interface
+    # ------------------------------
+
+    async def async_acquire(self, priority=QUOTE, timeout=None):
+        """Wait without blocking the event loop until a token is available."""
+        deadline = None if timeout is None else self.clock() + timeout
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._enqueue(priority, lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            while True:
+                acquired, delay = self._try_acquire(waiter)
+                if acquired:
+                    return
+                remaining = self._remaining(deadline)
+                if remaining is not None and remaining <= 0:
+                    raise RateLimitTimeout(f"{PRIORITY_NAMES[priority]} request not scheduled within {timeout}s")
+                waits = [value for value in (delay, remaining) if value is not None]
+                try:
+                    await asyncio.wait_for(event.wait(), min(waits) if waits else None)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        except BaseException:
+            self._cancel(waiter)
+            raise
+
+    # ------------------------------
+    # Metrics
+    # ------------------------------
+
+    def stats(self):
+        """Queue depth and wait times per priority class."""
+        with self.lock:
+            self._refill()
+            return {
+                "tokens": round(self.tokens, 2),
+                "queued": sum(self.depth.values()),
+                **{
+                    name: {
+                        "queue_depth": self.depth[priority],
+                        "granted": self.granted[priority],
+                        "timeouts": self.timeouts[priority],
+                        "avg_wait": self.total_wait[priority] / self.granted[priority] if self.granted[priority] else 0.0,
+                        "max_wait": self.max_wait[priority],
+                    }
+                    for priority, name in PRIORITY_NAMES.items()
+                },
+            }
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from web3 import Web3
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+# ------------------------------
+# Receipt Resolver
+# ------------------------------
+
+POLL_INTERVAL = 1            # seconds between checks for new blocks
+MAX_BLOCKS_PER_PASS = 50     # further behind than this, look pending hashes up directly instead
+MAX_PENDING_AGE = 600        # forget hashes nobody has seen mined for this long
+RECEIPT_TIMEOUT = 120        # default wait, same as web3's wait_for_transaction_receipt
+
+
+def tx_key(tx_hash):
+    return (tx_hash if isinstance(tx_hash, str) else Web3.to_hex(tx_hash)).lower()
+
+
+class ReceiptResolver:
+    """
+    Resolves receipts of every pending transaction on one chain from a single block scan.
+
+    A background thread follows new blocks while anything is pending and
+    matches each block's transaction hashes against the pending set; a
+    receipt is only fetched for hashes that show up in a block. Hashes are
+    also looked up directly once when registered, in case they were mined
+    before the scan reached them. RPC load therefore grows with the block
+    rate, not with the number of waiters.
+
+    `wait` blocks the calling thread, `async_wait` awaits on the event loop;
+    both share the same pending set.
+    """
+
+    def __init__(self, w3, poll_interval=POLL_INTERVAL, max_blocks_per_pass=MAX_BLOCKS_PER_PASS,
+                 max_pending_age=MAX_PENDING_AGE, clock=time.monotonic):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.max_blocks_per_pass = max_blocks_per_pass
+        self.max_pending_age = max_pending_age
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.pending = {}       # tx key -> (Future of the receipt, registered_at)
+        self.unchecked = set()  # registered since the last pass; looked up directly once
+        self.thread = None
+        self.last_block = None
+        self.blocks_scanned = 0
+        self.receipt_calls = 0
+        self.resolved = 0
+
+    def submit(self, tx_hash):
+        """Future resolved with the receipt of `tx_hash` once it is mined."""
+        key = tx_key(tx_hash)
+        with self.lock:
+            entry = self.pending.get(key)
+            if entry is None:
+                entry = self.pending[key] = (Future(), self.clock())
+                self.unchecked.add(key)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="receipt-resolver", daemon=True)
+                self.thread.start()
+            return entry[0]
+
+    def wait(self, tx_hash, timeout=RECEIPT_TIMEOUT):
+        """Block until `tx_hash` is mined; raises TimeExhausted like web3's wait_for_transaction_receipt."""
+        try:
+            return self.submit(tx_hash).result(timeout)
+        except FutureTimeout:
+            raise TimeExhausted(f"Transaction {tx_key(tx_hash)} is not in the chain after {timeout} seconds")
+
+    async def async_wait(self, tx_hash, timeout=RECEIPT_TIMEOUT):
+        """Await the receipt of `tx_hash`; raises asyncio.TimeoutError after `timeout`."""
+        future = asyncio.wrap_future(self.submit(tx_hash))
+        # Shielded: timing out one waiter mustn't cancel the future other waiters share
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    # ------------------------------
+    # Block scanning
+    # ------------------------------
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.thread = None
+                    return
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"Receipt resolver pass failed: {e}")
+            time.sleep(self.poll_interval)
+
+    def _resolve(self, key, receipt):
+        with self.lock:
+            entry = self.pending.pop(key, None)
+        if entry is not None:
+            self.resolved += 1
+            entry[0].set_result(receipt)
+
+    def _lookup(self, keys):
+        for key in keys:
+            self.receipt_calls += 1
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(key)
+            except TransactionNotFound:
+                continue
+            self._resolve(key, receipt)
+
+    def _expire(self):
+        now = self.clock()
+        with self.lock:
+            expired = [key for key, (_, registered_at) in self.pending.items()
+                       if now - registered_at > self.max_pending_age]
+            futures = [self.pending.pop(key)[0] for key in expired]
+        for key, future in zip(expired, futures):
+            future.set_exception(TimeExhausted(f"Transaction {key} was not mined within {self.max_pending_age} seconds"))
+
+    def scan(self):
+        """One pass: scan blocks since the last pass and resolve the pending hashes found in them."""
+        with self.lock:
+            unchecked, self.unchecked = self.unchecked, set()
+        latest = self.w3.eth.block_number
+
+        if self.last_block is None or latest - self.last_block > self.max_blocks_per_pass:
+            # First pass, or too far behind to scan the gap: look every pending hash up once
+            with self.lock:
+                unchecked = set(self.pending)
+            self._lookup(unchecked)
+            self.last_block = latest
+        else:
+            matched = set()
+            for number in range(self.last_block + 1, latest + 1):
+                block = self.w3.eth.get_block(number)
+                self.blocks_scanned += 1
+                hashes = {tx_key(tx_hash) for tx_hash in block["transactions"]}
+                with self.lock:
+                    matched |= hashes & self.pending.keys()
+                self.last_block = number
+            self._lookup(matched | unchecked)
+
+        self._expire()
+
+    def stats(self):
+        return {
+            "pending": len(self.pending),
+            "last_block": self.last_block,
+            "blocks_scanned": self.blocks_scanned,
+            "receipt_calls": self.receipt_calls,
+            "resolved": self.resolved,
+        }
+
+
+class ReceiptResolvers:
+    """One ReceiptResolver per Web3 instance; providers share one instance per chain."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.lock = threading.Lock()
+        self.resolvers = {}   # id(w3) -> ReceiptResolver (which keeps w3 alive, so the id stays valid)
+
+    def get(self, w3):
+        with self.lock:
+            resolver = self.resolvers.get(id(w3))
+            if resolver is None:
+                resolver = self.resolvers[id(w3)] = ReceiptResolver(w3, **self.options)
+            return resolver
+
+
+receipt_resolvers = ReceiptResolvers()
@@ -0,0 +1,111 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+# ------------------------------
+# Route Feasibility Index
+# ------------------------------
+
+DEAD_ROUTE_TTL = 600     # seconds a pair that returned no routes is skipped
+DEAD_AFTER = 2           # consecutive empty quotes before a pair counts as dead
+MAX_OUTCOMES = 4096
+
+
+class RouteIndex:
+    """
+    Answers "is this transfer plausibly routable?" without calling Bungee.
+
+    Two layers: a static check against the token index and the supported
+    chains, and a bounded memory of past quote outcomes per
+    (from_chain, from_token, to_chain, to_token). A pair that came back with no
+    routes DEAD_AFTER times in a row is rejected for DEAD_ROUTE_TTL seconds;
+    any quote with routes clears it. Empty results can depend on the amount,
+    hence the threshold and the expiry instead of a permanent verdict.
+    """
+
+    def __init__(self, token_index, chain_ids, dead_ttl=DEAD_ROUTE_TTL, dead_after=DEAD_AFTER,
+                 max_outcomes=MAX_OUTCOMES, clock=time.monotonic):
+        self.dead_ttl = dead_ttl
+        self.dead_after = dead_after
+        self.max_outcomes = max_outcomes
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.outcomes = OrderedDict()   # pair -> [consecutive empty quotes, last recorded]
+
+        self.checks = 0
+        self.rejected_unsupported = 0
+        self.rejected_dead = 0
+
+        self.chain_ids = frozenset(int(chain_id) for chain_id in chain_ids)
+        self.token_index = token_index
+        self.supported = self.chain_ids & frozenset(token_index.chain_ids())
+
+    def with_token_index(self, token_index):
+        """
+        A new index over `token_index` that shares this one's learned outcomes;
+        publish it with one assignment instead of mutating an index in use.
+        """
+        index = copy.copy(self)
+        index.token_index = token_index
+        index.supported = self.chain_ids & frozenset(token_index.chain_ids())
+        return index
+
+    def _pair(self, from_chain_id, from_token_address, to_chain_id, to_token_address):
+        return (int(from_chain_id), from_token_address.lower(), int(to_chain_id), to_token_address.lower())
+
+    def _unsupported(self, from_chain_id, from_token_address, to_chain_id, to_token_address):
+        for chain_id, token_address in ((from_chain_id, from_token_address), (to_chain_id, to_token_address)):
+            if int(chain_id) not in self.supported:
+                return f"Chain ID {chain_id} is not supported for transfers."
+            if self.token_index.by_address(chain_id, token_address) is None:
+                return f"Token {token_address} not found on chain {chain_id}."
+        if int(from_chain_id) == int(to_chain_id) and from_token_address.lower() == to_token_address.lower():
+            return "Source and destination are the same token on the same chain."
+        return None
+
+    def check(self, from_chain_id, from_token_address, to_chain_id, to_token_address):
+        """Return why the transfer can't be routed, or None if it's worth asking for a quote."""
+        self.checks += 1
+        reason = self._unsupported(from_chain_id, from_token_address, to_chain_id, to_token_address)
+        if reason is not None:
+            self.rejected_unsupported += 1
+            return reason
+
+        pair = self._pair(from_chain_id, from_token_address, to_chain_id, to_token_address)
+        with self.lock:
+            outcome = self.outcomes.get(pair)
+            if outcome is None or outcome[0] < self.dead_after:
+                return None
+            if self.clock() - outcome[1] > self.dead_ttl:
+                del self.outcomes[pair]
+                return None
+        self.rejected_dead += 1
+        return "No routes are currently available between these tokens. Try again later or pick another pair."
+
+    def record(self, from_chain_id, from_token_address, to_chain_id, to_token_address, routable):
+        """Learn from a quote result: `routable` is whether it returned any routes."""
+        pair = self._pair(from_chain_id, from_token_address, to_chain_id, to_token_address)
+        with self.lock:
+            if routable:
+                self.outcomes.pop(pair, None)
+                return
+            outcome = self.outcomes.get(pair)
+            if outcome is None or self.clock() - outcome[1] > self.dead_ttl:
+                outcome = self.outcomes[pair] = [0, 0.0]
+            outcome[0] += 1
+            outcome[1] = self.clock()
+            self.outcomes.move_to_end(pair)
+            while len(self.outcomes) > self.max_outcomes:
+                self.outcomes.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            dead = sum(1 for count, _ in self.outcomes.values() if count >= self.dead_after)
+        return {
+            "checks": self.checks,
+            "rejected_unsupported": self.rejected_unsupported,
+            "rejected_dead": self.rejected_dead,
+            "dead_pairs": dead,
+            "supported_chains": len(self.supported),
+        }
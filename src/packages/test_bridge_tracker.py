@@ -0,0 +1,74 @@
+import unittest
+import asyncio
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.bridge_tracker import BridgeTracker, INITIAL_BACKOFF, MAX_BACKOFF
+from packages.testing import FakeClock
+
+
+def status(source, destination):
+    return {"success": True, "result": {"sourceTxStatus": source, "destinationTxStatus": destination}}
+
+
+class TestBridgeTracker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.statuses = {}
+        self.polled = []
+        self.messages = []
+
+        async def fetch(tx_hash, from_chain_id, to_chain_id):
+            self.polled.append(tx_hash)
+            return self.statuses[tx_hash]
+
+        async def notify(user_id, text):
+            self.messages.append((user_id, text))
+
+        self.tracker = BridgeTracker(fetch_status=fetch, notify=notify, clock=self.clock)
+
+    def tick(self):
+        async def run():
+            await self.tracker.tick(asyncio.Semaphore(2))
+        asyncio.run(run())
+
+    def test_notifies_on_completion_and_failure(self):
+        """Finished transfers notify their user and stop being polled"""
+        self.tracker.register(1, "0xdone", 137, 42161)
+        self.tracker.register(2, "0xfail", 137, 42161)
+        self.statuses = {"0xdone": status("COMPLETED", "COMPLETED"), "0xfail": status("FAILED", "PENDING")}
+
+        self.tick()
+        self.assertEqual(self.polled, [])  # nothing is due before the first backoff
+
+        self.clock.now = INITIAL_BACKOFF
+        self.tick()
+        self.assertEqual(sorted(self.polled), ["0xdone", "0xfail"])
+        self.assertEqual(sorted(user_id for user_id, _ in self.messages), [1, 2])
+        self.assertEqual(self.tracker.pending(), 0)
+
+    def test_pending_transfer_backs_off(self):
+        """A pending transfer is polled again after doubling delays, capped at MAX_BACKOFF"""
+        self.tracker.register(1, "0xslow", 137, 42161)
+        self.statuses = {"0xslow": status("COMPLETED", "PENDING")}
+
+        poll_times = []
+        for second in range(0, 2000):
+            self.clock.now = second
+            before = len(self.polled)
+            self.tick()
+            if len(self.polled) > before:
+                poll_times.append(second)
+
+        gaps = [b - a for a, b in zip(poll_times, poll_times[1:])]
+        self.assertEqual(poll_times[0], INITIAL_BACKOFF)
+        self.assertEqual(gaps[:2], [INITIAL_BACKOFF, INITIAL_BACKOFF * 2])
+        self.assertEqual(max(gaps), MAX_BACKOFF)
+        self.assertEqual(self.messages, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import asyncio
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eth_account import Account
+from eth_account.typed_transactions import TypedTransaction
+from web3 import Web3
+from packages import bungee
+from packages.nonce_manager import NonceManager
+
+CHAIN_ID = 43114
+ROUTE = {"fromChainId": CHAIN_ID, "fromTokenAddress": "0xb97ef9ef8734c71904d8002f8b6bc66dd9c48a6e"}
+TX_DATA = {"txTarget": "0x3a23F943181408EAC424116Af7b7790c94Cb97a5", "value": "0x0", "txData": "0x", "chainId": CHAIN_ID}
+FEES = {"maxFeePerGas": 30 * 10 ** 9, "maxPriorityFeePerGas": 10 ** 9}
+ALLOWANCE_TARGET = "0x3a23F943181408EAC424116Af7b7790c94Cb97a5"
+APPROVAL_DATA = {"allowanceTarget": ALLOWANCE_TARGET, "minimumApprovalAmount": hex(10 ** 6)}
+APPROVAL_TX_DATA = {"result": {"to": "0xB97EF9Ef8734C71904D8002F8b6Bc66Dd9c48a6E", "data": "0x095ea7b3"}}
+
+
+def decode(raw_transaction):
+    return TypedTransaction.from_bytes(raw_transaction).as_dict()
+
+
+class FakeWeb3:
+    """
+    w3 stand-in for the source chain: the pending nonce is `nonce`, each
+    send_raw_transaction raises the next of `errors` (None succeeds) and
+    estimate_gas raises `gas_error` when it is set.
+    """
+
+    def __init__(self, nonce=5, errors=()):
+        self.nonce = nonce
+        self.errors = list(errors)
+        self.gas_error = None
+        self.sent = []
+        self.eth = self
+
+    def get_transaction_count(self, address, block_identifier):
+        return self.nonce
+
+    def estimate_gas(self, call):
+        if self.gas_error is not None:
+            raise self.gas_error
+        return 21000
+
+    def send_raw_transaction(self, raw_transaction):
+        error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise error
+        self.sent.append(raw_transaction)
+        return Web3.keccak(raw_transaction)
+
+
+class FakeAsyncWeb3:
+    """AsyncWeb3 stand-in over a FakeWeb3."""
+
+    def __init__(self, w3):
+        self.w3 = w3
+        self.eth = self
+
+    async def get_transaction_count(self, address, block_identifier):
+        return self.w3.get_transaction_count(address, block_identifier)
+
+    async def estimate_gas(self, call):
+        return self.w3.estimate_gas(call)
+
+    async def send_raw_transaction(self, raw_transaction):
+        return self.w3.send_raw_transaction(raw_transaction)
+
+
+class TestPreparedTransactions(unittest.TestCase):
+    def setUp(self):
+        self.w3 = FakeWeb3()
+        self.nonces = NonceManager()
+        self.account = Account.create()
+        for patcher in (
+            mock.patch.object(bungee, "get_web3", lambda chain_id: self.w3),
+            mock.patch.object(bungee, "get_route_transaction_data", lambda route: {"result": TX_DATA}),
+            mock.patch.object(bungee.fee_oracle, "get_fees", lambda chain_id: FEES),
+            mock.patch.object(bungee, "nonce_manager", self.nonces),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def prepare(self):
+        return bungee.prepare_transaction(ROUTE, self.account.address, self.account.key)
+
+    def test_prepare_and_send(self):
+        """A prepared transaction is signed with the pending nonce and broadcast as is"""
+        prepared = self.prepare()
+        self.assertEqual(prepared["nonce"], 5)
+        self.assertEqual(len(prepared["raw_transactions"]), 1)
+        tx_hash = bungee.send_prepared_transaction(prepared)
+        self.assertEqual(self.w3.sent, prepared["raw_transactions"])
+        self.assertEqual(tx_hash, Web3.to_hex(Web3.keccak(prepared["raw_transactions"][0])))
+        self.assertEqual(self.nonces.next_nonce(self.w3, CHAIN_ID, self.account.address), 6)
+
+    def test_stale_nonce_is_rebuilt(self):
+        """A stale nonce asks for a rebuild, which reads the chain again"""
+        prepared = self.prepare()
+        self.w3.errors = [ValueError("nonce too low")]
+        with self.assertRaises(bungee.StalePreparedTransaction):
+            bungee.send_prepared_transaction(prepared)
+        self.w3.nonce = 9
+        prepared = self.prepare()
+        self.assertEqual(prepared["nonce"], 9)
+        bungee.send_prepared_transaction(prepared)
+        self.assertEqual(len(self.w3.sent), 1)
+
+    def test_other_errors_are_raised(self):
+        """Errors that a rebuild can't fix reach the caller unchanged"""
+        error = ValueError("insufficient funds for gas * price + value")
+        self.w3.errors = [error]
+        with self.assertRaises(ValueError) as raised:
+            bungee.send_prepared_transaction(self.prepare())
+        self.assertIs(raised.exception, error)
+
+    def test_already_known_counts_as_sent(self):
+        """A node that already has the transaction returns its hash"""
+        prepared = self.prepare()
+        self.w3.errors = [ValueError("already known")]
+        tx_hash = bungee.send_prepared_transaction(prepared)
+        self.assertEqual(tx_hash, Web3.to_hex(Web3.keccak(prepared["raw_transactions"][0])))
+
+    def test_claimed_nonce_is_stale(self):
+        """A nonce taken by another send since the preview makes the transaction stale"""
+        prepared = self.prepare()
+        self.nonces.allocate(self.w3, CHAIN_ID, self.account.address)
+        with self.assertRaises(bungee.StalePreparedTransaction):
+            bungee.send_prepared_transaction(prepared)
+        self.assertEqual(self.w3.sent, [])
+
+    def test_approval_is_pipelined(self):
+        """An approval and the main transaction get consecutive nonces and the fallback gas limit"""
+        tx_data = {**TX_DATA, "approvalData": APPROVAL_DATA}
+        self.w3.gas_error = ValueError("execution reverted: insufficient allowance")
+        with mock.patch.object(bungee, "get_route_transaction_data", lambda route: {"result": tx_data}), \
+                mock.patch.object(bungee, "check_allowance", lambda *args: {"result": {"value": "0x0"}}), \
+                mock.patch.object(bungee, "get_approval_transaction_data", lambda *args: APPROVAL_TX_DATA):
+            prepared = self.prepare()
+
+        approval, main = (decode(raw) for raw in prepared["raw_transactions"])
+        self.assertEqual((approval["nonce"], main["nonce"]), (5, 6))
+        self.assertEqual(approval["gas"], bungee.APPROVAL_GAS_LIMIT)
+        self.assertEqual(main["gas"], bungee.FALLBACK_GAS_LIMIT)
+
+        bungee.send_prepared_transaction(prepared)
+        self.assertEqual(self.w3.sent, prepared["raw_transactions"])
+        self.assertEqual(self.nonces.next_nonce(self.w3, CHAIN_ID, self.account.address), 7)
+
+    def test_estimate_failure_without_approval_is_raised(self):
+        """Without a pending approval a failed gas estimate is a real error"""
+        self.w3.gas_error = ValueError("execution reverted")
+        with self.assertRaisesRegex(ValueError, "execution reverted"):
+            self.prepare()
+
+
+class TestAsyncPreparedTransactions(unittest.TestCase):
+    def setUp(self):
+        self.w3 = FakeWeb3()
+        self.nonces = NonceManager()
+        self.account = Account.create()
+        self.wallets = {1: {"address": self.account.address}}
+        self.builds = 0
+
+        async def route_transaction_data(route):
+            self.builds += 1
+            return {"result": TX_DATA}
+
+        async def get_fees(chain_id):
+            return FEES
+
+        for patcher in (
+            mock.patch.object(bungee, "get_async_web3", lambda chain_id: FakeAsyncWeb3(self.w3)),
+            mock.patch.object(bungee, "async_get_route_transaction_data", route_transaction_data),
+            mock.patch.object(bungee.fee_oracle, "async_get_fees", get_fees),
+            mock.patch.object(bungee, "nonce_manager", self.nonces),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def execute(self, prepared=None):
+        return asyncio.run(bungee.execute_transaction(1, ROUTE, self.account.key, self.wallets, prepared))
+
+    def prepare(self):
+        return asyncio.run(bungee.async_prepare_transaction(ROUTE, self.account.address, self.account.key))
+
+    def test_prepared_transaction_is_only_broadcast(self):
+        """A fresh prepared transaction is sent without building it again"""
+        prepared = self.prepare()
+        tx_hash = self.execute(prepared)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(tx_hash, Web3.to_hex(Web3.keccak(prepared["raw_transactions"][0])))
+
+    def test_stale_nonce_is_rebuilt(self):
+        """A stale nonce rebuilds once at the chain's pending nonce and sends again"""
+        prepared = self.prepare()
+        self.w3.errors = [ValueError("nonce too low")]
+        self.w3.nonce = 9
+        self.execute(prepared)
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(len(self.w3.sent), 1)
+        self.assertEqual(self.nonces.next_nonce(self.w3, CHAIN_ID, self.account.address), 10)
+
+    def test_other_errors_are_raised(self):
+        """Errors that a rebuild can't fix fail the transfer without a rebuild"""
+        self.w3.errors = [ValueError("insufficient funds for gas * price + value")]
+        with self.assertRaisesRegex(Exception, "insufficient funds"):
+            self.execute(self.prepare())
+        self.assertEqual(self.builds, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+import requests
+from packages.bungee_client import BungeeClient, DEFAULT_TIMEOUTS, FALLBACK_TIMEOUT
+
+
+class FakeBungee(BaseHTTPRequestHandler):
+    """Keep-alive JSON API: /slow answers after 0.5s, /missing is a 404, anything else echoes the request."""
+
+    protocol_version = "HTTP/1.1"
+    clients = []   # client (host, port) of every request, to see connection reuse
+
+    def do_GET(self):
+        FakeBungee.clients.append(self.client_address)
+        status = 404 if self.path.startswith("/missing") else 200
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+        body = json.dumps({"path": self.path, "api_key": self.headers.get("API-KEY")}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestBungeeClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBungee)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeBungee.clients.clear()
+        self.client = BungeeClient(f"http://127.0.0.1:{self.server.server_port}/", "key",
+                                   timeouts={"slow": (1, 0.1)})
+        self.addCleanup(self.client.close)
+
+    def test_endpoint_timeouts(self):
+        """Each endpoint has its own (connect, read) timeout and slow answers time out"""
+        self.assertEqual(self.client.timeout("build-tx"), DEFAULT_TIMEOUTS["build-tx"])
+        self.assertEqual(self.client.timeout("unknown"), FALLBACK_TIMEOUT)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.client.get("slow")
+
+        async def slow():
+            try:
+                await self.client.aget("slow")
+            finally:
+                await self.client.aclose()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(slow())
+
+    def test_raise_for_status(self):
+        """Error statuses raise unless the caller wants the body"""
+        with self.assertRaises(requests.HTTPError):
+            self.client.get("missing")
+        self.assertEqual(self.client.get("missing", raise_for_status=False)["path"], "/missing")
+
+        async def missing():
+            try:
+                with self.assertRaises(aiohttp.ClientResponseError):
+                    await self.client.aget("missing")
+                return await self.client.aget("missing", raise_for_status=False)
+            finally:
+                await self.client.aclose()
+
+        self.assertEqual(asyncio.run(missing())["path"], "/missing")
+
+    def test_sync_session_reuse(self):
+        """Blocking calls share one keep-alive connection and send the API key"""
+        self.assertEqual(self.client.get("quote", params={"a": 1})["api_key"], "key")
+        self.client.get("quote")
+        self.assertEqual(len(set(FakeBungee.clients)), 1)
+
+    def test_async_session_reuse(self):
+        """Calls on one loop share a session and connection; a new loop closes the old session"""
+        async def calls():
+            first = await self.client.async_session()
+            await self.client.aget("quote")
+            await self.client.aget("quote")
+            self.assertIs(await self.client.async_session(), first)
+            return first
+
+        first = asyncio.run(calls())
+        self.assertEqual(len(set(FakeBungee.clients)), 1)
+
+        async def next_loop():
+            second = await self.client.async_session()
+            await self.client.aclose()
+            return second
+
+        second = asyncio.run(next_loop())
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# nlp builds its OpenAI client at import time; no request is made in these tests
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from packages.token_index import TokenIndex
+from packages.command_parser import CommandParser, RULES
+from packages.entity_resolver import EntityResolver
+from packages.nlp import ACTION_FIELDS
+
+REGISTRY = {
+    "1": [{"chainId": 1, "address": "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48", "symbol": "USDC", "decimals": 6}],
+    "56": [{"chainId": 56, "address": "0x55d398326f99059ff775485246999027b3197955", "symbol": "USDT", "decimals": 18}],
+    "43114": [{"chainId": 43114, "address": "0xb97ef9ef8734c71904d8002f8b6bc66dd9c48a6e", "symbol": "USDC", "decimals": 6}],
+}
+
+
+class TestCommandParser(unittest.TestCase):
+    def setUp(self):
+        index = TokenIndex.from_registry(REGISTRY)
+        self.parser = CommandParser(EntityResolver(get_index=lambda: index))
+
+    def test_every_action_has_a_rule(self):
+        """The fast path covers every action the LLM prompt knows about"""
+        self.assertEqual({action for action, _ in RULES}, set(ACTION_FIELDS))
+
+    def test_transfer(self):
+        """Transfers resolve chain names and registry symbols to their canonical form"""
+        self.assertEqual(
+            self.parser.parse("Transfer 100 usdc from ethereum to Avalanche"),
+            {"action": "cross_chain_send&transfer", "amount": 100, "from_token": "USDC",
+             "to_token": "USDC", "from_chain": "Ethereum", "to_chain": "Avalanche"},
+        )
+        parsed = self.parser.parse("bridge 2.5 USDC from Ethereum to USDT on binance smart chain")
+        self.assertEqual((parsed["amount"], parsed["to_token"], parsed["to_chain"]), (2.5, "USDT", "Binance Smart Chain"))
+        parsed = self.parser.parse("send 3 usdc from etherium to tether on bsc")
+        self.assertEqual((parsed["from_chain"], parsed["to_token"], parsed["to_chain"]), ("Ethereum", "USDT", "Binance Smart Chain"))
+
+    def test_unresolved_transfer_falls_back(self):
+        """Unknown chains or tokens leave the message to the LLM"""
+        self.assertIsNone(self.parser.parse("send 5 USDC from Ethereum to Solana"))
+        self.assertIsNone(self.parser.parse("send 5 DAI from Ethereum to Avalanche"))
+
+    def test_yield_commands(self):
+        """AvaYield commands with and without fields"""
+        self.assertEqual(self.parser.parse("deposit 2 avax"), {"action": "deposits", "amount_avax": 2})
+        self.assertEqual(self.parser.parse("Withdraw 25%"), {"action": "withdraw_partial", "percentage": 25})
+        self.assertEqual(self.parser.parse("withdraw everything"), {"action": "withdraw_everything"})
+        self.assertEqual(self.parser.parse("claim my rewards"), {"action": "withdraw_rewards"})
+        self.assertEqual(self.parser.parse("check APR?"), {"action": "check_apr"})
+        self.assertEqual(self.parser.parse("show pool rewards"), {"action": "get_pool_rewards"})
+        self.assertEqual(self.parser.parse("what are my rewards"), {"action": "get_my_rewards"})
+
+    def test_hit_rate(self):
+        """Free-form messages count as misses"""
+        self.parser.parse("check apr")
+        self.parser.parse("I'd like to move some of my stablecoins over to a cheaper chain")
+        self.assertEqual(self.parser.stats()["hit_rate"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
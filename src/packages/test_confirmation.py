@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.confirmation import ConfirmationWatcher, ConfirmationTimeout, TransactionReverted
+from packages.receipt_resolver import ReceiptResolvers
+from packages.test_receipt_resolver import FakeChain
+
+
+def watcher(**kwargs):
+    return ConfirmationWatcher(resolvers=ReceiptResolvers(poll_interval=0.001), **kwargs)
+
+
+def watch(confirmations, chain, tx_hashes):
+    """Send each hash, watch it and collect ("confirmed"|"failed", value) outcomes."""
+    outcomes = {}
+
+    async def run():
+        for tx_hash in tx_hashes:
+            async def confirmed(receipt, tx_hash=tx_hash):
+                outcomes[tx_hash] = ("confirmed", receipt)
+
+            async def failed(error, tx_hash=tx_hash):
+                outcomes[tx_hash] = ("failed", error)
+
+            chain.send(tx_hash)
+            confirmations.watch(chain, tx_hash, confirmed, failed)
+        await asyncio.gather(*confirmations.tasks)
+
+    asyncio.run(run())
+    return outcomes
+
+
+class TestConfirmationWatcher(unittest.TestCase):
+    def test_confirms_many_transactions_concurrently(self):
+        """Each watched transaction is reported once its receipt appears"""
+        chain = FakeChain(delay=2)
+        confirmations = watcher()
+        hashes = [i.to_bytes(32, "big") for i in range(50)]
+
+        outcomes = watch(confirmations, chain, hashes)
+        self.assertEqual({kind for kind, _ in outcomes.values()}, {"confirmed"})
+        self.assertEqual(set(outcomes), set(hashes))
+        self.assertLessEqual(chain.calls["get_transaction_receipt"], 2 * len(hashes))
+        self.assertEqual(confirmations.stats(), {"in_flight": 0, "confirmed": 50, "reverted": 0, "timed_out": 0})
+
+    def test_reverted_transaction(self):
+        """A receipt with status 0 is reported as a failure"""
+        outcomes = watch(watcher(), FakeChain(status=0), [b"\x01"])
+        kind, error = outcomes[b"\x01"]
+        self.assertEqual(kind, "failed")
+        self.assertIsInstance(error, TransactionReverted)
+
+    def test_timeout(self):
+        """A transaction that never gets a receipt fails after the timeout"""
+        confirmations = watcher(timeout=0.05)
+        outcomes = watch(confirmations, FakeChain(delay=10 ** 9), [b"\x02"])
+        self.assertIsInstance(outcomes[b"\x02"][1], ConfirmationTimeout)
+        self.assertEqual(confirmations.stats()["timed_out"], 1)
+
+    def test_watch_returns_immediately(self):
+        """watch() doesn't wait for the receipt"""
+        confirmations = watcher()
+        chain = FakeChain(delay=3)
+        chain.send(b"\x03")
+
+        async def run():
+            async def ignore(value):
+                pass
+
+            task = confirmations.watch(chain, b"\x03", ignore, ignore)
+            self.assertFalse(task.done())
+            self.assertEqual(confirmations.stats()["in_flight"], 1)
+            await task
+
+        asyncio.run(run())
+        self.assertEqual(confirmations.stats()["confirmed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
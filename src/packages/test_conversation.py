@@ -0,0 +1,98 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.token_index import TokenIndex
+from packages.entity_resolver import EntityResolver
+from packages.conversation import ConversationState
+from packages.testing import FakeClock
+
+REGISTRY = {
+    "1": [
+        {"chainId": 1, "address": "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48", "symbol": "USDC", "decimals": 6},
+        {"chainId": 1, "address": "0xdac17f958d2ee523a2206206994597c13d831ec7", "symbol": "USDT", "decimals": 6},
+    ],
+    "42161": [
+        {"chainId": 42161, "address": "0xaf88d065e77c8cc2239327c5edb3a432268e5831", "symbol": "USDC", "decimals": 6},
+        {"chainId": 42161, "address": "0xfd086bc7cd5c481dcc9c85ebe478a1c0b69fcbb9", "symbol": "USDT", "decimals": 6},
+    ],
+    "43114": [
+        {"chainId": 43114, "address": "0xa7d7079b0fead91f3e65f86e8915cb59c1a4c664", "symbol": "USDC.E", "decimals": 6},
+    ],
+}
+
+TRANSFER = {"action": "cross_chain_send&transfer", "amount": 100, "from_token": "USDC",
+            "to_token": "USDC", "from_chain": "Ethereum", "to_chain": "Arbitrum"}
+
+
+class TestConversationState(unittest.TestCase):
+    def setUp(self):
+        index = TokenIndex.from_registry(REGISTRY)
+        self.clock = FakeClock()
+        self.state = ConversationState(EntityResolver(get_index=lambda: index), ttl=60, clock=self.clock)
+        self.state.remember(7, TRANSFER)
+
+    def test_amount_delta(self):
+        """A new amount keeps the rest of the transfer"""
+        self.assertEqual(self.state.apply_delta(7, "same but 50"), {**TRANSFER, "amount": 50})
+        self.assertEqual(self.state.apply_delta(7, "make it 2.5 instead")["amount"], 2.5)
+
+    def test_percent_only_for_percentages(self):
+        """"50%" patches a partial withdrawal but not a transfer or deposit amount"""
+        self.assertIsNone(self.state.apply_delta(7, "same but 50%"))
+        self.assertIsNone(self.state.parse_delta({"action": "deposits", "amount_avax": 1}, "make it 50 percent"))
+        withdraw = {"action": "withdraw_partial", "percentage": 25}
+        self.assertEqual(self.state.parse_delta(withdraw, "make it 50%")["percentage"], 50)
+
+    def test_chain_delta_keeps_unlisted_token(self):
+        """Changing chain never swaps the token for a similar symbol listed there"""
+        patched = self.state.apply_delta(7, "now to Avalanche")
+        self.assertEqual((patched["to_chain"], patched["to_token"]), ("Avalanche", "USDC"))
+        self.assertEqual(self.state.apply_delta(7, "from arbitrun")["from_chain"], "Arbitrum")
+
+    def test_token_delta_respells_exact_matches_only(self):
+        """Tokens take the registry spelling of an exact match and are otherwise kept as typed"""
+        on_avalanche = {**TRANSFER, "to_chain": "Avalanche"}
+        self.assertEqual(self.state.parse_delta(on_avalanche, "as usdce")["to_token"], "USDC.E")
+        patched = self.state.parse_delta(on_avalanche, "use usdt")
+        self.assertEqual((patched["from_token"], patched["to_token"]), ("USDT", "USDT"))
+
+    def test_token_delta(self):
+        """"use X" changes both tokens of a same-token transfer, "as X" only the received one"""
+        patched = self.state.apply_delta(7, "use USDT instead")
+        self.assertEqual((patched["from_token"], patched["to_token"]), ("USDT", "USDT"))
+        patched = self.state.apply_delta(7, "same but as tether")
+        self.assertEqual((patched["from_token"], patched["to_token"]), ("USDC", "USDT"))
+
+    def test_combined_and_reverse(self):
+        """Several clauses apply together; "the other way" swaps the direction"""
+        patched = self.state.apply_delta(7, "same but 20 usdt to avalanche")
+        self.assertEqual((patched["amount"], patched["from_token"], patched["to_chain"]), (20, "USDT", "Avalanche"))
+        patched = self.state.apply_delta(7, "20 from arbitrum")
+        self.assertEqual((patched["amount"], patched["from_chain"]), (20, "Arbitrum"))
+        patched = self.state.apply_delta(7, "the other way round")
+        self.assertEqual((patched["from_chain"], patched["to_chain"]), ("Arbitrum", "Ethereum"))
+
+    def test_non_deltas_fall_through(self):
+        """Full commands, unknown phrases and expired context go to the normal parser"""
+        self.assertIsNone(self.state.apply_delta(7, "transfer 5 usdc from ethereum to arbitrum"))
+        self.assertIsNone(self.state.apply_delta(7, "check apr"))
+        self.assertIsNone(self.state.apply_delta(7, "now to solana"))
+        self.assertIsNone(self.state.apply_delta(8, "same but 50"))
+        self.clock.now = 61
+        self.assertIsNone(self.state.apply_delta(7, "same but 50"))
+
+    def test_other_actions(self):
+        """Numbers refine deposits and partial withdrawals; "again" repeats"""
+        self.state.remember(7, {"action": "withdraw_partial", "percentage": 25})
+        self.assertEqual(self.state.apply_delta(7, "make it 50%"), {"action": "withdraw_partial", "percentage": 50})
+        self.state.remember(7, {"action": "check_apr"})
+        self.assertEqual(self.state.apply_delta(7, "again"), {"action": "check_apr"})
+        self.assertIsNone(self.state.apply_delta(7, "same but 50"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.token_index import TokenIndex
+from packages.entity_resolver import EntityResolver, suggestions
+
+REGISTRY = {
+    "1": [
+        {"chainId": 1, "address": "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48", "symbol": "USDC", "decimals": 6},
+        {"chainId": 1, "address": "0xdac17f958d2ee523a2206206994597c13d831ec7", "symbol": "USDT", "decimals": 6},
+    ],
+    "43114": [
+        {"chainId": 43114, "address": "0xa7d7079b0fead91f3e65f86e8915cb59c1a4c664", "symbol": "USDC.E", "decimals": 6},
+        {"chainId": 43114, "address": "0x49d5c2bdffac6ce2bfdb6640f4f80f226bc10bab", "symbol": "WETH.E", "decimals": 18},
+    ],
+}
+
+
+class TestEntityResolver(unittest.TestCase):
+    def setUp(self):
+        self.index = TokenIndex.from_registry(REGISTRY)
+        self.resolver = EntityResolver(get_index=lambda: self.index)
+
+    def test_chain_aliases_and_misspellings(self):
+        """Aliases and small typos resolve to CHAIN_IDS names"""
+        self.assertEqual(self.resolver.resolve_chain("BSC"), "Binance Smart Chain")
+        self.assertEqual(self.resolver.resolve_chain("avax c-chain"), "Avalanche")
+        self.assertEqual(self.resolver.resolve_chain("Etherium"), "Ethereum")
+        self.assertEqual(self.resolver.resolve_chain("arbitrun"), "Arbitrum")
+        self.assertIsNone(self.resolver.resolve_chain("solana"))
+        self.assertIsNone(self.resolver.resolve_chain(None))
+
+    def test_token_variants(self):
+        """Spellings and aliases of a symbol resolve to the symbol listed on that chain"""
+        self.assertEqual(self.resolver.resolve_token(43114, "usdc.e"), "USDC.E")
+        self.assertEqual(self.resolver.resolve_token(43114, "usdce"), "USDC.E")
+        self.assertEqual(self.resolver.resolve_token(1, "tether"), "USDT")
+        self.assertIsNone(self.resolver.resolve_token(1, "tether-gold-bar"))
+
+    def test_similar_tokens_are_only_suggested(self):
+        """A close symbol is a different asset, so it's suggested rather than picked"""
+        self.assertIsNone(self.resolver.resolve_token(43114, "weth"))
+        self.assertEqual(suggestions(self.resolver.token_candidates(43114, "weth")), ["WETH.E"])
+        self.assertIsNone(self.resolver.resolve_token(43114, "usdc"))
+        self.assertIsNone(self.resolver.resolve_token(1, "usdx"))
+
+    def test_ambiguous_names_return_ranked_candidates(self):
+        """A name close to several symbols isn't picked, but both are suggested"""
+        self.assertIsNone(self.resolver.resolve_token(1, "usd"))
+        self.assertEqual(set(suggestions(self.resolver.token_candidates(1, "usd"))), {"USDC", "USDT"})
+
+    def test_follows_token_index_swaps(self):
+        """Token lookups use the current index after a registry refresh"""
+        self.assertIsNone(self.resolver.resolve_token(1, "dai"))
+        self.index = TokenIndex.from_registry({
+            "1": REGISTRY["1"] + [{"chainId": 1, "address": "0x6b175474e89094c44da98b954eedeac495271d0f",
+                                   "symbol": "DAI", "decimals": 18}],
+        })
+        self.assertEqual(self.resolver.resolve_token(1, "dai"), "DAI")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.fee_oracle import FeeOracle, compute_fees
+
+GWEI = 10 ** 9
+
+# (eth_feeHistory result, expected fee fields)
+EIP1559_CASES = [
+    # next block's base fee doubled, plus the median tip
+    ({"baseFeePerGas": [10 * GWEI, 12 * GWEI], "reward": [[1 * GWEI], [3 * GWEI], [2 * GWEI]]},
+     {"maxFeePerGas": 26 * GWEI, "maxPriorityFeePerGas": 2 * GWEI}),
+    # an even number of tips takes the mean of the middle two, rounded down
+    ({"baseFeePerGas": [5, 7], "reward": [[1], [2]]},
+     {"maxFeePerGas": 15, "maxPriorityFeePerGas": 1}),
+    # empty blocks report no reward entry and don't count
+    ({"baseFeePerGas": [25 * GWEI], "reward": [[], [4 * GWEI], []]},
+     {"maxFeePerGas": 54 * GWEI, "maxPriorityFeePerGas": 4 * GWEI}),
+    # no tips at all
+    ({"baseFeePerGas": [25 * GWEI], "reward": None},
+     {"maxFeePerGas": 50 * GWEI, "maxPriorityFeePerGas": 0}),
+    ({"baseFeePerGas": [25 * GWEI]},
+     {"maxFeePerGas": 50 * GWEI, "maxPriorityFeePerGas": 0}),
+]
+
+
+class FakeWeb3:
+    def __init__(self, fee_history, gas_price=3 * GWEI):
+        self.history = fee_history
+        self.gas_price = gas_price
+        self.eth = self
+
+    def fee_history(self, block_count, newest_block, reward_percentiles):
+        return self.history
+
+
+class TestComputeFees(unittest.TestCase):
+    def test_eip1559(self):
+        """maxFee is twice the next base fee plus the median tip"""
+        for history, expected in EIP1559_CASES:
+            with self.subTest(history=history):
+                self.assertEqual(compute_fees(history), expected)
+
+    def test_legacy_fallback(self):
+        """Chains without a base fee are priced with gasPrice"""
+        oracle = FeeOracle(providers=None)
+        fees = oracle.refresh(56, FakeWeb3({"baseFeePerGas": [0, 0], "reward": [[0]]}))
+        self.assertEqual(fees, {"gasPrice": 3 * GWEI})
+        fees = oracle.refresh(43114, FakeWeb3(EIP1559_CASES[0][0]))
+        self.assertEqual(fees, EIP1559_CASES[0][1])
+        self.assertEqual(oracle.get_fees(56), {"gasPrice": 3 * GWEI})
+
+
+if __name__ == "__main__":
+    unittest.main()
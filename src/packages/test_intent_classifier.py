@@ -0,0 +1,64 @@
+import unittest
+import json
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from packages.intent_classifier import EXAMPLES_PATH, IntentClassifier
+from packages.nlp import ACTION_FIELDS
+
+
+class TestIntentClassifier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(EXAMPLES_PATH, "r") as f:
+            cls.examples = json.load(f)
+        cls.classifier = IntentClassifier.from_examples(cls.examples)
+
+    def test_examples_cover_every_action(self):
+        """The bundled examples train every action in ACTION_FIELDS"""
+        self.assertEqual(set(self.examples), set(ACTION_FIELDS))
+
+    def test_confident_predictions_on_training_set_are_right(self):
+        """Whenever the classifier is sure about an example, it names the right action"""
+        texts = [text for action in self.examples for text in self.examples[action]]
+        labels = [action for action in self.examples for _ in self.examples[action]]
+        predictions = self.classifier.predict_batch(texts)
+        confident = [(predicted, label) for (predicted, _), label in zip(predictions, labels) if predicted]
+        self.assertGreater(len(confident), len(texts) // 2)
+        self.assertTrue(all(predicted == label for predicted, label in confident))
+
+    def test_leave_one_out(self):
+        """Each example, held out of training, is either routed to its action or left to the LLM"""
+        confident = 0
+        for action, texts in self.examples.items():
+            for held_out, text in enumerate(texts):
+                training = dict(self.examples, **{action: texts[:held_out] + texts[held_out + 1:]})
+                predicted, _ = IntentClassifier.from_examples(training).predict(text)
+                if predicted is not None:
+                    confident += 1
+                    self.assertEqual(predicted, action, text)
+        self.assertGreater(confident, sum(map(len, self.examples.values())) // 3)
+
+    def test_unseen_phrasings(self):
+        """New phrasings route to their action; unrelated chatter is left to the LLM"""
+        self.assertEqual(self.classifier.predict("deposit 8 avax into avayield")[0], "deposits")
+        self.assertEqual(self.classifier.predict("withdraw 60% of shares")[0], "withdraw_partial")
+        self.assertEqual(self.classifier.predict("send 12 usdc from polygon to base")[0], "cross_chain_send&transfer")
+        self.assertIsNone(self.classifier.predict("hello")[0])
+
+    def test_batch_matches_single(self):
+        """Scoring a batch gives the same answers as scoring messages one by one"""
+        texts = ["check apr", "pull everything out", "what is the weather"]
+        for (batch_action, batch_confidence), text in zip(self.classifier.predict_batch(texts), texts):
+            action, confidence = self.classifier.predict(text)
+            self.assertEqual(batch_action, action)
+            self.assertAlmostEqual(batch_confidence, confidence, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
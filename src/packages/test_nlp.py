@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# nlp builds its OpenAI clients at import time; no request is made in these tests
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from packages import nlp
+from packages.nlp import ACTION_FIELDS, command_tool, validate_command
+from packages.llm_usage import LLMUsage, percentile
+
+
+class TestCommandSchema(unittest.TestCase):
+    def test_tool_schema_follows_action_fields(self):
+        """The function schema lists every action and every field"""
+        parameters = command_tool(ACTION_FIELDS)["function"]["parameters"]
+        self.assertEqual(parameters["properties"]["action"]["enum"], list(ACTION_FIELDS))
+        for fields in ACTION_FIELDS.values():
+            for field in fields:
+                self.assertIn(field, parameters["properties"])
+        self.assertEqual(parameters["properties"]["amount"]["type"], ["number", "null"])
+
+    def test_validate_command(self):
+        """Unknown actions and missing or null required fields are rejected"""
+        self.assertIsNone(validate_command({"action": "launch_rocket"}))
+        self.assertIsNone(validate_command({"action": "deposits"}))
+        self.assertIsNone(validate_command({"action": "deposits", "amount_avax": None}))
+        self.assertIsNone(validate_command({"action": "cross_chain_send&transfer", "amount": 100, "from_token": None,
+                                            "to_token": "USDC", "from_chain": "Ethereum", "to_chain": "Arbitrum"}))
+        self.assertEqual(validate_command({"action": "deposits", "amount_avax": 2}),
+                         {"action": "deposits", "amount_avax": 2})
+
+
+class TestClassifierShortcut(unittest.TestCase):
+    def parse(self, text, predicted):
+        """Parse `text` with the classifier predicting `predicted`; returns (result, LLM mock)."""
+        llm = mock.AsyncMock(return_value=None)
+        with mock.patch.object(nlp.intent_classifier, "predict", return_value=(predicted, 0.9)), \
+                mock.patch.object(nlp, "async_parse_command_llm", llm):
+            return asyncio.run(nlp.async_parse_command_nlp(text)), llm
+
+    def test_read_only_pick_skips_llm(self):
+        """A confident read-only pick is answered without the LLM"""
+        parsed, llm = self.parse("whats my apr looking like", "check_apr")
+        self.assertEqual(parsed, {"action": "check_apr"})
+        llm.assert_not_called()
+
+    def test_write_pick_goes_to_llm(self):
+        """Intents that move funds are always checked by the full parser"""
+        for text in ("don't withdraw everything", "how do I withdraw everything?"):
+            with self.subTest(text=text):
+                parsed, llm = self.parse(text, "withdraw_everything")
+                self.assertIsNone(parsed)
+                llm.assert_awaited_once_with(text)
+
+
+class TestLLMUsage(unittest.TestCase):
+    def test_per_action_totals(self):
+        """Tokens and latency percentiles are tracked per action"""
+        usage = LLMUsage()
+        for latency in range(1, 101):
+            usage.record("check_apr", latency / 100, prompt_tokens=200, completion_tokens=10)
+        usage.record(None, 5.0, failed=True)
+
+        stats = usage.stats()
+        self.assertEqual(stats["check_apr"]["prompt_tokens"], 20000)
+        self.assertEqual(stats["check_apr"]["avg_tokens"], 210)
+        self.assertAlmostEqual(stats["check_apr"]["p95_latency"], 0.95)   # the 95th of 100 samples
+        self.assertEqual(stats["unparsed"]["failures"], 1)
+
+    def test_nearest_rank_percentile(self):
+        """The p-th percentile is the ceil(p * n)-th smallest sample"""
+        self.assertEqual(percentile([3, 1, 2], 0.5), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 0.5), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 1.0), 4)
+        self.assertEqual(percentile([7], 0.0), 7)
+        self.assertEqual(percentile([], 0.95), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.nonce_manager import NonceManager
+
+ADDRESS = "0x8B414448de8B609e96bd63Dcf2A8aDbd5ddf7fdd"
+
+
+class TestNonceManager(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.manager = NonceManager(idle_timeout=60, clock=lambda: self.now)
+        self.w3 = mock.Mock()
+        self.w3.eth.get_transaction_count.return_value = 7
+
+    def test_consecutive_allocations_read_the_chain_once(self):
+        """Nonces are counted locally after the first pending read"""
+        self.assertEqual(self.manager.allocate(self.w3, 43114, ADDRESS), 7)
+        self.assertEqual(self.manager.allocate(self.w3, 43114, ADDRESS.lower(), count=2), 8)
+        self.assertEqual(self.manager.allocate(self.w3, 43114, ADDRESS), 10)
+        self.w3.eth.get_transaction_count.assert_called_once_with(ADDRESS, "pending")
+
+    def test_chains_are_tracked_separately(self):
+        """The same address gets independent nonces per chain"""
+        self.assertEqual(self.manager.allocate(self.w3, 1, ADDRESS), 7)
+        self.assertEqual(self.manager.allocate(self.w3, 43114, ADDRESS), 7)
+
+    def test_resync_and_idle_timeout_reread_pending(self):
+        """resync and long idle periods fall back to the chain's pending count"""
+        self.manager.allocate(self.w3, 1, ADDRESS)
+        self.manager.resync(1, ADDRESS)
+        self.assertEqual(self.manager.allocate(self.w3, 1, ADDRESS), 7)
+
+        self.w3.eth.get_transaction_count.return_value = 9
+        self.now = 61
+        self.assertEqual(self.manager.allocate(self.w3, 1, ADDRESS), 9)
+
+    def test_claim_only_succeeds_for_the_next_nonces(self):
+        """Pre-signed transactions can claim their nonces only if nobody used them"""
+        nonce = self.manager.next_nonce(self.w3, 1, ADDRESS)
+        self.assertTrue(self.manager.claim(1, ADDRESS, nonce, count=2))
+        self.assertFalse(self.manager.claim(1, ADDRESS, nonce, count=2))
+        self.assertEqual(self.manager.allocate(self.w3, 1, ADDRESS), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.parse_cache import ParseCache, normalize_command
+from packages.testing import FakeClock
+
+ACTION_FIELDS = {"deposits": ["amount_avax"], "check_apr": []}
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(1000.0)
+        self.cache = ParseCache(ACTION_FIELDS, ttl=60, max_size=2, clock=self.clock)
+
+    def test_normalization(self):
+        """Case, spacing, trailing punctuation and numbers are folded"""
+        self.assertEqual(normalize_command("  Put 2.5 AVAX   in please!"), ("put <num> avax in please", [2.5]))
+
+    def test_numbers_are_filled_from_the_new_message(self):
+        """A cached phrasing serves other amounts"""
+        self.cache.put("Put 2 AVAX in the pool", {"action": "deposits", "amount_avax": 2})
+        self.assertEqual(self.cache.get("put 0.5 avax in the pool"), {"action": "deposits", "amount_avax": 0.5})
+        self.assertIsNone(self.cache.get("put some avax in the pool"))
+
+    def test_stats(self):
+        """Hits, misses, hit rate, size and skipped parses are reported"""
+        self.cache.put("how's the yield", {"action": "check_apr"})
+        self.cache.put("put half a dozen avax in", {"action": "deposits", "amount_avax": 6})
+        self.cache.get("how's the yield")
+        self.cache.get("How's the yield?")
+        self.cache.get("what's my balance")
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"], stats["uncacheable"]), (2, 1, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+    def test_untraceable_numbers_are_not_cached(self):
+        """Parses with numbers that aren't in the message are skipped"""
+        self.cache.put("put half a dozen avax in", {"action": "deposits", "amount_avax": 6})
+        self.assertEqual(self.cache.stats()["uncacheable"], 1)
+        self.assertIsNone(self.cache.get("put half a dozen avax in"))
+
+    def test_ttl_and_schema_invalidation(self):
+        """Entries expire after the TTL and are dropped when the schema changes"""
+        self.cache.put("how's the yield", {"action": "check_apr"})
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get("how's the yield"))
+
+        self.cache.put("how's the yield", {"action": "check_apr"})
+        self.cache.set_schema(ACTION_FIELDS)
+        self.assertIsNotNone(self.cache.get("how's the yield"))
+        self.cache.set_schema({**ACTION_FIELDS, "get_leverage": []})
+        self.assertIsNone(self.cache.get("how's the yield"))
+
+    def test_persistence(self):
+        """Entries survive a restart for the same schema only"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "parse_cache.json")
+            cache = ParseCache(ACTION_FIELDS, path=path, save_delay=60, clock=self.clock)
+            cache.put("how's the yield", {"action": "check_apr"})
+            cache.put("how's my balance", {"action": "check_apr"})
+            self.assertFalse(os.path.exists(path))
+            cache.flush()
+            self.assertIsNone(cache.save_timer)
+
+            reloaded = ParseCache(ACTION_FIELDS, path=path, clock=self.clock)
+            self.assertEqual(reloaded.get("How's the yield?"), {"action": "check_apr"})
+            other_schema = ParseCache({"check_apr": []}, path=path, clock=self.clock)
+            self.assertIsNone(other_schema.get("how's the yield"))
+
+    def test_background_save(self):
+        """Puts are written once, after the save delay, off the caller's thread"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "parse_cache.json")
+            cache = ParseCache(ACTION_FIELDS, path=path, save_delay=0.01, clock=self.clock)
+            cache.put("how's the yield", {"action": "check_apr"})
+            timer = cache.save_timer
+            cache.put("how's my balance", {"action": "check_apr"})
+            self.assertIs(cache.save_timer, timer)
+            timer.join()
+            self.assertIsNone(cache.save_timer)
+            reloaded = ParseCache(ACTION_FIELDS, path=path, clock=self.clock)
+            self.assertEqual(len(reloaded.entries), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.pool_state import PoolState
+from packages.testing import FakeClock
+
+FIELDS = ["totalDeposits", "checkReward", "getActualLeverage", "totalSupply", "MIN_TOKENS_TO_REINVEST"]
+
+
+class FakeReader:
+    """AvaYieldInteractor stand-in: each view value is the block number plus the field's index."""
+
+    def __init__(self):
+        self.block_number = 100
+        self.reads = []
+        self.w3 = SimpleNamespace(eth=self)
+        functions = SimpleNamespace(**{name: (lambda name=name: name) for name in FIELDS})
+        self.contract = SimpleNamespace(functions=functions)
+
+    def read(self, *calls, block_identifier="latest"):
+        self.reads.append(block_identifier)
+        return [block_identifier + FIELDS.index(call) for call in calls]
+
+
+class TestPoolState(unittest.TestCase):
+    def setUp(self):
+        self.reader = FakeReader()
+        self.clock = FakeClock()
+        self.state = PoolState(self.reader, poll_interval=0.001, max_age=30, clock=self.clock)
+
+    def test_refreshes_once_per_block(self):
+        """Polling within a block reuses the snapshot; a new block is read pinned to that block"""
+        snapshot = self.state.refresh()
+        self.assertEqual((snapshot.block_number, snapshot.total_deposits, snapshot.min_reinvest), (100, 100, 104))
+        self.state.refresh()
+        self.reader.block_number = 101
+        self.assertEqual(self.state.refresh().total_rewards, 102)
+        self.assertEqual(self.reader.reads, [100, 101])
+
+    def test_reads_are_served_from_memory(self):
+        """Any number of readers share the snapshot without RPC calls"""
+        self.state.refresh()
+        snapshots = {id(self.state.get()) for _ in range(1000)}
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(len(self.reader.reads), 1)
+
+    def test_stale_or_behind_snapshot_is_refetched(self):
+        """Without the refresh task, old snapshots and ones before min_block are read inline"""
+        self.assertEqual(self.state.get().block_number, 100)
+        self.reader.block_number = 105
+        self.assertEqual(self.state.get().block_number, 100)
+        self.assertEqual(self.state.get(min_block=103).block_number, 105)
+        self.reader.block_number = 106
+        self.clock.now = 31
+        self.assertEqual(self.state.get().block_number, 106)
+
+    def test_older_snapshot_never_replaces_newer(self):
+        """A fetch that finishes after a later block's snapshot was published is dropped"""
+        self.reader.block_number = 110
+        self.state.refresh()
+        self.assertEqual(self.state.fetch(105).block_number, 110)
+        self.assertEqual(self.state.snapshot.total_deposits, 110)
+
+    def test_background_task(self):
+        """The task follows new blocks on its own"""
+        async def run():
+            task = self.state.start()
+            await asyncio.sleep(0.05)
+            self.reader.block_number = 101
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        asyncio.run(run())
+        self.assertEqual(self.state.snapshot.block_number, 101)
+        self.assertEqual(self.reader.reads, [100, 101])
+
+
+if __name__ == "__main__":
+    unittest.main()
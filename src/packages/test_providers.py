@@ -0,0 +1,62 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.providers import DEFAULT_RPC_URLS, ProviderRegistry
+
+
+class TestProviderRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmp.name, "rpc.json")
+        with open(self.config_path, "w") as f:
+            json.dump({"137": "https://polygon.config", "42161": "https://arbitrum.config"}, f)
+        # Only the variables of each test, so a developer's own RPC_URL_* don't leak in
+        environ = {name: value for name, value in os.environ.items()
+                   if not name.startswith("RPC_URL_") and name != "RPC_CONFIG_PATH"}
+        patcher = mock.patch.dict(os.environ, environ, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_defaults(self):
+        """Without configuration every chain uses its public endpoint"""
+        registry = ProviderRegistry.from_env()
+        self.assertEqual(registry.rpc_urls, DEFAULT_RPC_URLS)
+
+    def test_config_file_overrides_defaults(self):
+        """RPC_CONFIG_PATH entries replace the defaults for their chains only"""
+        os.environ["RPC_CONFIG_PATH"] = self.config_path
+        registry = ProviderRegistry.from_env()
+        self.assertEqual(registry.rpc_url(137), "https://polygon.config")
+        self.assertEqual(registry.rpc_url(10), DEFAULT_RPC_URLS[10])
+
+    def test_env_overrides_config_file(self):
+        """RPC_URL_<chain_id> wins over the config file, which wins over the defaults"""
+        os.environ["RPC_CONFIG_PATH"] = self.config_path
+        os.environ["RPC_URL_137"] = "https://polygon.env"
+        os.environ["RPC_URL_99999"] = "https://new-chain.env"
+        os.environ["RPC_URL_POLYGON"] = "https://ignored"
+        registry = ProviderRegistry.from_env()
+        self.assertEqual(registry.rpc_url(137), "https://polygon.env")
+        self.assertEqual(registry.rpc_url(42161), "https://arbitrum.config")
+        self.assertEqual(registry.rpc_url(8453), DEFAULT_RPC_URLS[8453])
+        self.assertEqual(registry.rpc_url(99999), "https://new-chain.env")
+        self.assertNotIn("https://ignored", registry.rpc_urls.values())
+
+    def test_unknown_chain(self):
+        """A chain without an RPC is an error"""
+        with self.assertRaises(ValueError):
+            ProviderRegistry.from_env().rpc_url(12345)
+
+
+if __name__ == "__main__":
+    unittest.main()
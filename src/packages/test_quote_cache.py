@@ -0,0 +1,92 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.quote_cache import QuoteCache
+from packages.testing import FakeClock
+
+
+class TestQuoteCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = QuoteCache(ttl=10, max_size=2, clock=self.clock)
+
+    def test_hit_within_ttl_and_refetch_after(self):
+        """A repeat inside the TTL is a hit; after expiry it fetches again"""
+        calls = []
+        fetch = lambda: calls.append(1) or {"n": len(calls)}
+
+        self.assertEqual(self.cache.get_or_fetch("k", fetch), {"n": 1})
+        self.assertEqual(self.cache.get_or_fetch("k", fetch), {"n": 1})
+        self.clock.now = 11
+        self.assertEqual(self.cache.get_or_fetch("k", fetch), {"n": 2})
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 2, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted once the cache is full"""
+        self.cache.get_or_fetch("a", lambda: 1)
+        self.cache.get_or_fetch("b", lambda: 2)
+        self.cache.get_or_fetch("a", lambda: 1)
+        self.cache.get_or_fetch("c", lambda: 3)
+        self.assertEqual(list(self.cache.entries), ["a", "c"])
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_errors_are_not_cached(self):
+        """A failed fetch is raised and the next call retries"""
+        def failing():
+            raise RuntimeError("upstream down")
+
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_fetch("k", failing)
+        self.assertEqual(self.cache.get_or_fetch("k", lambda: "ok"), "ok")
+
+    def test_concurrent_threads_share_one_fetch(self):
+        """Threads asking for the same key while it is in flight share the call"""
+        release = threading.Event()
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait(5)
+            return "quote"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get_or_fetch("k", slow_fetch)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while self.cache.coalesced < 4:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["quote"] * 5)
+
+    def test_concurrent_coroutines_share_one_fetch(self):
+        """Coroutines asking for the same key while it is in flight share the call"""
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "quote"
+
+        async def run():
+            return await asyncio.gather(*(self.cache.aget_or_fetch("k", fetch) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(run()), ["quote"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.coalesced, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import asyncio
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.rate_limiter import RateLimiter, RateLimitTimeout, EXECUTION, QUOTE
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_then_deadline(self):
+        """The burst is served immediately; a caller past its deadline times out"""
+        limiter = RateLimiter(rate=0.01, burst=2)
+        limiter.acquire(QUOTE)
+        limiter.acquire(QUOTE)
+        with self.assertRaises(RateLimitTimeout):
+            limiter.acquire(QUOTE, timeout=0.05)
+        stats = limiter.stats()
+        self.assertEqual(stats["quote"]["granted"], 2)
+        self.assertEqual(stats["quote"]["timeouts"], 1)
+        self.assertEqual(stats["queued"], 0)
+
+    def test_execution_overtakes_queued_quotes(self):
+        """An execution call queued after quotes is served before them"""
+        limiter = RateLimiter(rate=50, burst=1)
+        order = []
+
+        async def call(name, priority, delay):
+            await asyncio.sleep(delay)
+            await limiter.async_acquire(priority, timeout=5)
+            order.append(name)
+
+        async def run():
+            await limiter.async_acquire(QUOTE)   # drain the bucket
+            await asyncio.gather(
+                call("quote-1", QUOTE, 0),
+                call("quote-2", QUOTE, 0),
+                call("execute", EXECUTION, 0.001),
+            )
+
+        asyncio.run(run())
+        self.assertEqual(order, ["execute", "quote-1", "quote-2"])
+        self.assertEqual(limiter.stats()["execution"]["granted"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
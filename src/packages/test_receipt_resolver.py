@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+import os
+import sys
+from collections import Counter
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from packages.receipt_resolver import ReceiptResolver, tx_key
+from packages.testing import FakeClock
+
+
+class FakeChain:
+    """
+    w3 stand-in that mines a block each time block_number is read.
+
+    A sent transaction lands `delay` blocks later with the given status;
+    `calls` counts the RPC methods used.
+    """
+
+    def __init__(self, delay=1, status=1):
+        self.delay = delay
+        self.status = status
+        self.blocks = [[]]
+        self.mempool = []    # (tx_hash, block it lands in)
+        self.receipts = {}
+        self.calls = Counter()
+        self.eth = self
+
+    def send(self, tx_hash):
+        self.mempool.append((tx_hash, len(self.blocks) - 1 + self.delay))
+
+    def mine(self):
+        number = len(self.blocks)
+        landed = [tx_hash for tx_hash, lands_at in self.mempool if lands_at <= number]
+        self.mempool = [(tx_hash, lands_at) for tx_hash, lands_at in self.mempool if lands_at > number]
+        self.blocks.append(landed)
+        for tx_hash in landed:
+            self.receipts[tx_key(tx_hash)] = {"transactionHash": tx_hash, "blockNumber": number, "status": self.status}
+
+    @property
+    def block_number(self):
+        self.calls["block_number"] += 1
+        self.mine()
+        return len(self.blocks) - 1
+
+    def get_block(self, number):
+        self.calls["get_block"] += 1
+        return {"number": number, "transactions": list(self.blocks[number])}
+
+    def get_transaction_receipt(self, tx_hash):
+        self.calls["get_transaction_receipt"] += 1
+        if tx_key(tx_hash) not in self.receipts:
+            raise TransactionNotFound(f"{tx_hash} not found")
+        return self.receipts[tx_key(tx_hash)]
+
+
+class TestReceiptResolver(unittest.TestCase):
+    def test_resolves_all_pending_from_block_scan(self):
+        """Many waiters cost one scan per block plus at most two receipt lookups each"""
+        chain = FakeChain(delay=20)
+        resolver = ReceiptResolver(chain, poll_interval=0.001)
+        hashes = [i.to_bytes(32, "big") for i in range(100)]
+        for tx_hash in hashes:
+            chain.send(tx_hash)
+        futures = [resolver.submit(tx_hash) for tx_hash in hashes]
+
+        receipts = [future.result(timeout=5) for future in futures]
+        self.assertEqual([receipt["transactionHash"] for receipt in receipts], hashes)
+        self.assertLessEqual(chain.calls["get_transaction_receipt"], 2 * len(hashes))
+        self.assertEqual(resolver.stats()["resolved"], 100)
+        self.assertEqual(resolver.stats()["pending"], 0)
+
+    def test_transaction_mined_before_registration(self):
+        """A hash already mined is found by its first direct lookup"""
+        chain = FakeChain(delay=1)
+        chain.send(b"\x01")
+        chain.mine()
+        chain.mine()
+        resolver = ReceiptResolver(chain, poll_interval=0.001)
+        self.assertEqual(resolver.wait(b"\x01", timeout=5)["blockNumber"], 1)
+        self.assertEqual(chain.calls["get_block"], 0)
+
+    def test_async_wait_and_shared_future(self):
+        """async_wait and wait share one pending entry per hash"""
+        chain = FakeChain(delay=3)
+        resolver = ReceiptResolver(chain, poll_interval=0.001)
+        chain.send(b"\x03")
+
+        async def run():
+            return await asyncio.gather(resolver.async_wait(b"\x03", 5), resolver.async_wait("0X03", 5))
+
+        first, second = asyncio.run(run())
+        self.assertIs(first, second)
+
+    def test_timeouts(self):
+        """wait raises TimeExhausted; unmined hashes are forgotten after max_pending_age"""
+        chain = FakeChain()
+        clock = FakeClock()
+        resolver = ReceiptResolver(chain, poll_interval=0.001, max_pending_age=60, clock=clock)
+        with self.assertRaises(TimeExhausted):
+            resolver.wait(b"\x04", timeout=0.05)
+        future = resolver.submit(b"\x04")
+        clock.now = 61
+        self.assertIsInstance(future.exception(timeout=5), TimeExhausted)
+        self.assertEqual(resolver.stats()["pending"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
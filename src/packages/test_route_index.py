@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.token_index import TokenIndex
+from packages.route_index import RouteIndex
+from packages.testing import FakeClock
+
+USDC_POLYGON = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"
+USDC_ARBITRUM = "0xaf88d065e77c8cC2239327C5EDb3A432268e5831"
+USDC_SOLANA = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+REGISTRY = {
+    "137": [{"chainId": 137, "address": USDC_POLYGON, "symbol": "USDC", "decimals": 6}],
+    "42161": [{"chainId": 42161, "address": USDC_ARBITRUM, "symbol": "USDC", "decimals": 6}],
+    "89999": [{"chainId": 89999, "address": USDC_SOLANA, "symbol": "USDC", "decimals": 6}],
+}
+
+
+class TestRouteIndex(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.index = RouteIndex(TokenIndex.from_registry(REGISTRY), [137, 42161], dead_ttl=600,
+                                dead_after=2, clock=self.clock)
+
+    def test_static_checks(self):
+        """Unsupported chains, unknown tokens and same-token transfers are rejected"""
+        self.assertIsNone(self.index.check(137, USDC_POLYGON, 42161, USDC_ARBITRUM))
+        self.assertIn("not supported", self.index.check(137, USDC_POLYGON, 89999, USDC_SOLANA))
+        self.assertIn("not found", self.index.check(137, USDC_ARBITRUM, 42161, USDC_ARBITRUM))
+        self.assertIn("same token", self.index.check(137, USDC_POLYGON, 137, USDC_POLYGON.lower()))
+        self.assertEqual(self.index.stats()["rejected_unsupported"], 3)
+
+    def test_learns_dead_pairs(self):
+        """Repeated empty quotes mark a pair dead until a routable quote or the TTL clears it"""
+        pair = (137, USDC_POLYGON, 42161, USDC_ARBITRUM)
+        self.index.record(*pair, routable=False)
+        self.assertIsNone(self.index.check(*pair))
+        self.index.record(*pair, routable=False)
+        self.assertIn("No routes", self.index.check(*pair))
+
+        self.index.record(*pair, routable=True)
+        self.assertIsNone(self.index.check(*pair))
+
+        self.index.record(*pair, routable=False)
+        self.index.record(*pair, routable=False)
+        self.clock.now = 601
+        self.assertIsNone(self.index.check(*pair))
+
+    def test_with_token_index(self):
+        """A refreshed index is a new object over the new tokens that keeps learned outcomes"""
+        pair = (137, USDC_POLYGON, 42161, USDC_ARBITRUM)
+        self.index.record(*pair, routable=False)
+        self.index.record(*pair, routable=False)
+        refreshed = self.index.with_token_index(TokenIndex.from_registry({"137": REGISTRY["137"]}))
+        self.assertIsNot(refreshed, self.index)
+        self.assertIn("not supported", refreshed.check(*pair))
+        self.assertIn("No routes", self.index.check(*pair))
+        self.assertIs(refreshed.outcomes, self.index.outcomes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.token_index import TokenIndex
+from packages.token_snapshot import SnapshotTokenIndex, build_snapshot, load_token_index
+
+REGISTRY = {
+    "1": [
+        {"chainId": 1, "address": "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48", "name": "USD Coin", "symbol": "USDC", "decimals": 6},
+        {"chainId": 1, "address": "0xdac17f958d2ee523a2206206994597c13d831ec7", "name": "Tether", "symbol": "USDT", "decimals": 6},
+        {"chainId": 1, "address": "0x1111111111111111111111111111111111111111", "name": "Duplicate", "symbol": "usdc", "decimals": 18},
+    ],
+    "89999": [
+        {"chainId": 89999, "address": "epjfwdd5aufqssqem2qn1xzybapc8g4weggkzwytdt1v", "name": "USD Coin", "symbol": "USDC", "decimals": 6},
+    ],
+}
+
+
+class TestTokenIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TokenIndex.from_registry(REGISTRY)
+
+    def test_symbol_lookup_is_case_insensitive_and_first_wins(self):
+        """Symbol lookups ignore case and keep the first registry entry"""
+        token = self.index.by_symbol(1, "usdc")
+        self.assertEqual(token.address, "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
+        self.assertEqual(token.decimals, 6)
+
+    def test_address_lookup_accepts_any_case(self):
+        """Address lookups work with checksummed and lowercase input"""
+        lower = self.index.by_address(1, "0xdac17f958d2ee523a2206206994597c13d831ec7")
+        checksummed = self.index.by_address(1, "0xdAC17F958D2ee523a2206206994597C13D831ec7")
+        self.assertEqual(lower, checksummed)
+        self.assertEqual(lower.symbol, "USDT")
+
+    def test_unknown_chain_and_token(self):
+        """Unknown chains and tokens return None"""
+        self.assertFalse(self.index.has_chain(56))
+        self.assertIsNone(self.index.by_symbol(56, "USDC"))
+        self.assertIsNone(self.index.by_symbol(1, "DAI"))
+
+    def test_non_evm_addresses_are_kept(self):
+        """Non-EVM addresses are indexed as listed instead of failing to checksum"""
+        token = self.index.by_symbol(89999, "USDC")
+        self.assertEqual(token.address, "epjfwdd5aufqssqem2qn1xzybapc8g4weggkzwytdt1v")
+        self.assertEqual(self.index.by_address(89999, token.address), token)
+
+
+class TestTokenSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, "token_registry.json")
+        self.snapshot_path = os.path.join(self.tmp.name, "token_registry.snapshot")
+        with open(self.json_path, "w") as f:
+            json.dump(REGISTRY, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_snapshot_matches_json_index(self):
+        """A compiled snapshot answers lookups exactly like the JSON index"""
+        build_snapshot(self.json_path, self.snapshot_path)
+        index = load_token_index(self.json_path, self.snapshot_path)
+        expected = TokenIndex.from_registry(REGISTRY)
+
+        self.assertIsInstance(index, SnapshotTokenIndex)
+        self.assertEqual(sorted(index.chain_ids()), sorted(expected.chain_ids()))
+        for chain_id in expected.chain_ids():
+            self.assertEqual(index.chain(chain_id).by_symbol, expected.chain(chain_id).by_symbol)
+            self.assertEqual(index.chain(chain_id).by_address, expected.chain(chain_id).by_address)
+
+    def test_stale_snapshot_falls_back_to_json(self):
+        """Editing the JSON after compiling makes the loader ignore the snapshot"""
+        build_snapshot(self.json_path, self.snapshot_path)
+        with open(self.json_path, "w") as f:
+            json.dump({"1": REGISTRY["1"][:1]}, f)
+
+        index = load_token_index(self.json_path, self.snapshot_path)
+        self.assertNotIsInstance(index, SnapshotTokenIndex)
+        self.assertIsNone(index.by_symbol(1, "USDT"))
+
+    def test_over_width_address_is_rejected(self):
+        """An address that doesn't fit the address column fails the build instead of misaligning it"""
+        with open(self.json_path, "w") as f:
+            json.dump({"1": [{**REGISTRY["1"][0], "address": "0x" + "a" * 60}]}, f)
+        with self.assertRaises(ValueError):
+            build_snapshot(self.json_path, self.snapshot_path)
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
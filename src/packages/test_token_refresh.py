@@ -0,0 +1,82 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.token_index import TokenIndex
+from packages.token_refresh import FileTokenSource, TokenRefresher
+
+USDC = {"chainId": 137, "address": "0x3c499c542cef5e3811e1192ce70d8cc03d5c3359", "symbol": "USDC", "decimals": 6}
+USDT = {"chainId": 137, "address": "0xc2132d05d31c914a87c6611c10748aeb04b58e8f", "symbol": "USDT", "decimals": 6}
+WETH = {"chainId": 137, "address": "0x7ceb23fd6bc0add59e62ac25578270cff1b9f619", "symbol": "WETH", "decimals": 18}
+ARB = {"chainId": 42161, "address": "0x912ce59144191c1204e64559fe8253a0e49e6548", "symbol": "ARB", "decimals": 18}
+
+
+class TestTokenRefresher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tokens.json")
+        self.index = TokenIndex.from_registry({"137": [USDC, USDT], "42161": [ARB]})
+        self.refresher = TokenRefresher(FileTokenSource(self.path), get_index=lambda: self.index,
+                                        publish=self.publish)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def publish(self, index):
+        self.index = index
+
+    def write(self, registry):
+        with open(self.path, "w") as f:
+            json.dump(registry, f)
+
+    def test_diff_and_swap(self):
+        """Changed chains get new tables, untouched chains are carried over"""
+        arbitrum = self.index.chain(42161)
+        self.write({"137": [USDC, USDT, WETH], "42161": [ARB]})
+        report = self.refresher.refresh()
+        self.assertEqual((report["chains"], report["added"], report["removed"], report["changed"]), (1, 1, 0, 0))
+        self.assertEqual(self.index.by_symbol(137, "WETH").decimals, 18)
+        self.assertIs(self.index.chain(42161), arbitrum)
+
+        self.write({"137": [USDC, USDT, dict(WETH, decimals=8)], "42161": [ARB]})
+        report = self.refresher.refresh()
+        self.assertEqual((report["chains"], report["changed"]), (1, 1))
+        self.assertEqual(self.index.by_symbol(137, "WETH").decimals, 8)
+
+    def test_unchanged_source_keeps_index(self):
+        """An unchanged file, or one with the same tokens, doesn't replace the index"""
+        original = self.index
+        self.write({"137": [USDC, USDT], "42161": [ARB]})
+        self.assertEqual(self.refresher.refresh()["chains"], 0)
+        self.assertEqual(self.refresher.refresh()["chains"], 0)
+        self.assertIs(self.index, original)
+
+    def test_removed_token(self):
+        """Tokens dropped from the list are removed from the index, curated ones stay"""
+        self.write({"137": [USDC, USDT, WETH]})
+        self.refresher.refresh()
+        self.write({"137": [USDC]})
+        report = self.refresher.refresh()
+        self.assertEqual(report["removed"], 1)
+        self.assertIsNone(self.index.by_symbol(137, "WETH"))
+        self.assertIsNotNone(self.index.by_symbol(137, "USDT"))
+        self.assertIsNotNone(self.index.by_symbol(42161, "ARB"))
+
+    def test_curated_entries_win(self):
+        """A source token can't re-point or change a curated symbol"""
+        impostor = dict(USDC, address="0x2791bca1f2de4661ed88a30c99a7a9449aa84174")
+        self.write({"137": [impostor, dict(USDT, decimals=18), WETH]})
+        report = self.refresher.refresh()
+        self.assertEqual((report["added"], report["changed"]), (1, 0))
+        self.assertEqual(self.index.by_symbol(137, "USDC").address.lower(), USDC["address"])
+        self.assertIsNone(self.index.by_address(137, impostor["address"]))
+        self.assertEqual(self.index.by_symbol(137, "USDT").decimals, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
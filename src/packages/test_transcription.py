@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# transcription builds its OpenAI client at import time; no request is made in these tests
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from packages.transcription import Transcriber
+
+
+class FakeTranscriptions:
+    """Stands in for client.audio.transcriptions, tracking calls and concurrency."""
+
+    def __init__(self, delay=0.01, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, model, file):
+        self.calls.append(file)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("whisper is down")
+            return SimpleNamespace(text=f" {file[1].decode()} ")
+        finally:
+            self.active -= 1
+
+
+def transcriber(transcriptions, **kwargs):
+    client = SimpleNamespace(audio=SimpleNamespace(transcriptions=transcriptions))
+    return Transcriber(client, **kwargs)
+
+
+def download(payload):
+    async def fetch():
+        return bytearray(payload)
+    return fetch
+
+
+class TestTranscriber(unittest.TestCase):
+    def test_uploads_in_memory_and_caches(self):
+        """The downloaded bytes are uploaded directly and the transcript is reused by file_unique_id"""
+        transcriptions = FakeTranscriptions()
+        voice = transcriber(transcriptions)
+
+        async def run():
+            first = await voice.transcribe("note-1", download(b"send 5 usdc"))
+            again = await voice.transcribe("note-1", download(b"never downloaded"))
+            return first, again
+
+        self.assertEqual(asyncio.run(run()), ("send 5 usdc", "send 5 usdc"))
+        self.assertEqual(transcriptions.calls, [("voice.ogg", b"send 5 usdc")])
+        self.assertEqual(voice.stats()["hits"], 1)
+
+    def test_concurrent_requests_share_one_upload(self):
+        """A note being transcribed isn't uploaded a second time"""
+        transcriptions = FakeTranscriptions()
+        voice = transcriber(transcriptions)
+
+        async def run():
+            return await asyncio.gather(*(voice.transcribe("note-1", download(b"check apr")) for _ in range(3)))
+
+        self.assertEqual(asyncio.run(run()), ["check apr"] * 3)
+        self.assertEqual(len(transcriptions.calls), 1)
+        self.assertEqual(voice.stats()["joined"], 2)
+
+    def test_bounded_concurrency(self):
+        """No more than max_concurrent notes are transcribed at once"""
+        transcriptions = FakeTranscriptions()
+        voice = transcriber(transcriptions, max_concurrent=2)
+
+        async def run():
+            await asyncio.gather(*(voice.transcribe(f"note-{i}", download(b"x")) for i in range(6)))
+
+        asyncio.run(run())
+        self.assertEqual(transcriptions.peak, 2)
+        self.assertEqual(len(transcriptions.calls), 6)
+
+    def test_failures_are_not_cached(self):
+        """A failed transcription raises for every waiter and is retried next time"""
+        transcriptions = FakeTranscriptions(fail=True)
+        voice = transcriber(transcriptions)
+
+        async def run():
+            return await asyncio.gather(*(voice.transcribe("note-1", download(b"x")) for _ in range(2)),
+                                        return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in asyncio.run(run())))
+        transcriptions.fail = False
+        self.assertEqual(asyncio.run(voice.transcribe("note-1", download(b"deposit 2 avax"))), "deposit 2 avax")
+
+    def test_cancelled_fetch_is_retried_by_waiters(self):
+        """Cancelling the request that is transcribing a note doesn't cancel the others waiting on it"""
+        transcriptions = FakeTranscriptions(delay=0.05)
+        voice = transcriber(transcriptions)
+
+        async def run():
+            first = asyncio.create_task(voice.transcribe("note-1", download(b"swap 1 avax")))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(voice.transcribe("note-1", download(b"swap 1 avax")))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            return await waiter
+
+        self.assertEqual(asyncio.run(run()), "swap 1 avax")
+        self.assertEqual(len(transcriptions.calls), 2)
+        self.assertEqual(voice.inflight, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
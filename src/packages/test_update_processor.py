@@ -0,0 +1,42 @@
+import asyncio
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the src directory to Python path so `packages` resolves
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.update_processor import PerUserUpdateProcessor
+
+
+def update(user_id):
+    return SimpleNamespace(effective_user=SimpleNamespace(id=user_id))
+
+
+class TestPerUserUpdateProcessor(unittest.TestCase):
+    def test_serialises_per_user_only(self):
+        """A user's updates run one at a time and in order; other users run alongside"""
+        processor = PerUserUpdateProcessor()
+        events = []
+
+        async def handle(name, delay):
+            events.append(f"start {name}")
+            await asyncio.sleep(delay)
+            events.append(f"end {name}")
+
+        async def run():
+            await asyncio.gather(
+                processor.process_update(update(1), handle("a1", 0.02)),
+                processor.process_update(update(1), handle("a2", 0)),
+                processor.process_update(update(2), handle("b1", 0.01)),
+            )
+
+        asyncio.run(run())
+        self.assertLess(events.index("end a1"), events.index("start a2"))
+        self.assertLess(events.index("start b1"), events.index("end a1"))
+        self.assertEqual(processor.users, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
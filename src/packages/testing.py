@@ -0,0 +1,13 @@
+# ------------------------------
+# Test Helpers
+# ------------------------------
+
+
+class FakeClock:
+    """Stands in for time.time / time.monotonic; tests move `now` by hand."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
@@ -0,0 +1,97 @@
+from typing import NamedTuple
+from web3 import Web3
+
+# ------------------------------
+# Token Index
+# ------------------------------
+
+class TokenRecord(NamedTuple):
+    chain_id: int
+    address: str    # checksummed for EVM chains, as listed otherwise
+    symbol: str
+    decimals: int
+
+
+def normalize_address(address):
+    """Checksum an EVM address, leaving non-EVM addresses (e.g. Solana) untouched."""
+    try:
+        return Web3.to_checksum_address(address)
+    except ValueError:
+        return address
+
+
+class ChainTokens:
+    """Lookup tables for the tokens of a single chain."""
+
+    def __init__(self, records):
+        self.by_symbol = {}
+        self.by_address = {}
+        for record in records:
+            # First entry wins, matching the order of the registry file
+            self.by_symbol.setdefault(record.symbol.lower(), record)
+            self.by_address.setdefault(record.address, record)
+
+    def __len__(self):
+        return len(self.by_address)
+
+
+def records_from_tokens(tokens):
+    """Convert registry token dicts into TokenRecords."""
+    return [
+        TokenRecord(
+            chain_id=int(token["chainId"]),
+            address=normalize_address(token["address"]),
+            symbol=token["symbol"],
+            decimals=int(token["decimals"]),
+        )
+        for token in tokens
+    ]
+
+
+class TokenIndex:
+    """
+    Token registry index built once, with checksummed addresses precomputed.
+
+    Maps (chainId, lowercase symbol) and (chainId, checksum address) straight to
+    a TokenRecord so lookups never scan the registry or hash addresses.
+    """
+
+    def __init__(self, chains=None):
+        self.chains = chains or {}
+
+    @classmethod
+    def from_registry(cls, registry):
+        """Build the index from the {chain_id: [token, ...]} registry layout."""
+        return cls({
+            int(chain_key): ChainTokens(records_from_tokens(tokens))
+            for chain_key, tokens in registry.items()
+        })
+
+    def chain_ids(self):
+        return list(self.chains)
+
+    def chain(self, chain_id):
+        """Return the ChainTokens for a chain, or None if the chain isn't listed."""
+        return self.chains.get(int(chain_id))
+
+    def has_chain(self, chain_id):
+        return int(chain_id) in self.chains
+
+    def by_symbol(self, chain_id, symbol):
+        chain = self.chain(chain_id)
+        if chain is None:
+            return None
+        return chain.by_symbol.get(symbol.lower())
+
+    def by_address(self, chain_id, address):
+        chain = self.chain(chain_id)
+        if chain is None:
+            return None
+        record = chain.by_address.get(address)
+        if record is None:
+            # Only hash the address when the caller didn't pass the checksummed form
+            record = chain.by_address.get(normalize_address(address))
+        return record
+
+    def __len__(self):
+        return sum(len(self.chain(chain_id)) for chain_id in self.chain_ids())
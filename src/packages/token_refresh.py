@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import time
+from packages.token_index import ChainTokens, TokenIndex, records_from_tokens
+from packages.bungee import CHAIN_IDS, bungee_client, get_token_index, set_token_index
+
+# ------------------------------
+# Token Registry Refresh
+# ------------------------------
+
+REFRESH_INTERVAL = int(os.getenv("TOKEN_REFRESH_INTERVAL", "3600"))   # seconds, 0 disables
+REQUEST_DEADLINE = 60   # the refresh is background work, it can wait behind user calls
+
+
+class BungeeTokenSource:
+    """Token lists per chain from the Bungee API, re-downloaded only when they changed."""
+
+    def __init__(self, client=bungee_client, chain_ids=CHAIN_IDS.values()):
+        self.client = client
+        self.chain_ids = [int(chain_id) for chain_id in chain_ids]
+        self.validators = {}   # chain_id -> ETag / Last-Modified of the last download
+
+    def changed_chains(self):
+        """Return {chain_id: [token, ...]} for the chains whose list changed since the last call."""
+        changed = {}
+        for chain_id in self.chain_ids:
+            try:
+                response, self.validators[chain_id] = self.client.conditional_get(
+                    "token-lists/chain", params={"chainId": chain_id},
+                    validators=self.validators.get(chain_id), deadline=REQUEST_DEADLINE,
+                )
+            except Exception as e:
+                print(f"Error fetching token list for chain {chain_id}: {e}")
+                continue
+            if response is not None:
+                changed[chain_id] = response.get("result") or []
+        return changed
+
+
+class FileTokenSource:
+    """Token lists from a JSON file in the token_registry.json layout, re-read when it changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = None   # (mtime, size) of the last read
+
+    def changed_chains(self):
+        stat = os.stat(self.path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self.version:
+            return {}
+        with open(self.path, "r") as f:
+            registry = json.load(f)
+        self.version = version
+        return {int(chain_key): tokens for chain_key, tokens in registry.items()}
+
+
+def diff_chain(old, new):
+    """Compare two ChainTokens (old may be None). Returns (added, removed, changed) counts."""
+    old_tokens = old.by_address if old is not None else {}
+    added = sum(1 for address in new.by_address if address not in old_tokens)
+    removed = sum(1 for address in old_tokens if address not in new.by_address)
+    changed = sum(
+        1 for address, record in new.by_address.items()
+        if address in old_tokens and old_tokens[address] != record
+    )
+    return added, removed, changed
+
+
+class TokenRefresher:
+    """
+    Keeps the shared token index in sync with a token source.
+
+    Only chains whose list actually changed get new lookup tables; every
+    other chain's ChainTokens is carried over as is. The new index is
+    published with one reference swap (`set_token_index`), so lookups in
+    flight finish on the old index and never see a half-built one.
+
+    Source tokens are merged under the curated registry the bot started
+    with: a curated symbol or address always keeps its curated entry, so a
+    refresh can add tokens but never re-point a symbol users already send.
+    """
+
+    def __init__(self, source, get_index=get_token_index, publish=set_token_index):
+        self.source = source
+        self.get_index = get_index
+        self.publish = publish
+        self.curated = None   # index in use at the first refresh, i.e. the shipped registry
+        self.task = None
+
+    def _merged(self, chain_id, tokens):
+        """ChainTokens of the curated entries plus the source tokens that reuse no curated symbol or address."""
+        records = records_from_tokens(tokens)
+        curated = self.curated.chain(chain_id)
+        if curated is None:
+            return ChainTokens(records)
+        added = [record for record in records
+                 if record.symbol.lower() not in curated.by_symbol and record.address not in curated.by_address]
+        return ChainTokens(list(curated.by_address.values()) + added)
+
+    def refresh(self):
+        """Pull changes from the source and swap in a new index if anything changed. Returns a report."""
+        started = time.perf_counter()
+        report = {"chains": 0, "added": 0, "removed": 0, "changed": 0}
+
+        current = self.get_index()
+        if self.curated is None:
+            self.curated = current
+        updated = {}
+        for chain_id, tokens in self.source.changed_chains().items():
+            new_chain = self._merged(chain_id, tokens)
+            added, removed, changed = diff_chain(current.chain(chain_id), new_chain)
+            if added or removed or changed:
+                updated[chain_id] = new_chain
+                report["chains"] += 1
+                report["added"] += added
+                report["removed"] += removed
+                report["changed"] += changed
+
+        if updated:
+            chains = {chain_id: current.chain(chain_id) for chain_id in current.chain_ids()}
+            chains.update(updated)
+            self.publish(TokenIndex(chains))
+
+        report["seconds"] = time.perf_counter() - started
+        return report
+
+    async def run(self, interval=REFRESH_INTERVAL):
+        """Refresh every `interval` seconds in a worker thread until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                report = await asyncio.to_thread(self.refresh)
+                if report["chains"]:
+                    print(f"Token registry refreshed: {report['added']} added, {report['removed']} removed, "
+                          f"{report['changed']} changed on {report['chains']} chains in {report['seconds']:.3f}s")
+            except Exception as e:
+                print(f"Error refreshing token registry: {e}")
+
+    def start(self, interval=REFRESH_INTERVAL):
+        """Start the periodic refresh on the running event loop (no-op when interval is 0)."""
+        if interval and (self.task is None or self.task.done()):
+            self.task = asyncio.create_task(self.run(interval))
+        return self.task
+
+
+def default_source():
+    """TOKEN_LIST_PATH points at a local token list instead of the Bungee API (e.g. for testing)."""
+    path = os.getenv("TOKEN_LIST_PATH")
+    return FileTokenSource(path) if path else BungeeTokenSource()
+
+
+token_refresher = TokenRefresher(default_source())
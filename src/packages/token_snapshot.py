@@ -0,0 +1,192 @@
+"""
+Compiled, memory-mapped snapshot of token_registry.json.
+
+The JSON file stays the source of truth; `python -m packages.token_snapshot`
+compiles it into a compact columnar file that worker processes can mmap and
+share instead of parsing JSON at startup.
+
+Layout (little endian):
+    header          magic, sha256 of the source JSON, chain/token/symbol counts
+    chain table     n_chains x (chain_id u32, first row u32, row count u32)
+    chain column    n_tokens x u32
+    decimals column n_tokens x u8
+    symbol column   n_tokens x u16 (index into the symbol table)
+    address column  n_tokens x 44 bytes ASCII, NUL padded
+    symbol offsets  (n_symbols + 1) x u32
+    symbol blob     interned UTF-8 symbols
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from packages.token_index import ChainTokens, TokenIndex, TokenRecord, records_from_tokens
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REGISTRY_PATH = os.path.join(SRC_DIR, "token_registry.json")
+SNAPSHOT_PATH = os.path.join(SRC_DIR, "token_registry.snapshot")
+
+MAGIC = b"TOKSNAP1"
+HEADER = struct.Struct("<8s32sIIII")   # magic, sha256, n_chains, n_tokens, n_symbols, blob length
+CHAIN_ENTRY = struct.Struct("<III")
+ADDRESS_WIDTH = 44                      # long enough for base58 Solana addresses
+
+
+def source_digest(json_path=REGISTRY_PATH):
+    """sha256 of the registry JSON, used to tell whether a snapshot is stale."""
+    with open(json_path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+# ------------------------------
+# Build Step
+# ------------------------------
+
+def _encode_address(address):
+    """Fixed-width address column entry; a longer address would shift every later row."""
+    encoded = address.encode("ascii")
+    if len(encoded) > ADDRESS_WIDTH:
+        raise ValueError(f"Token address {address} is longer than {ADDRESS_WIDTH} bytes")
+    return encoded.ljust(ADDRESS_WIDTH, b"\0")
+
+
+def build_snapshot(json_path=REGISTRY_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Compile the registry JSON into a snapshot file. Returns the number of tokens written."""
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    registry = json.loads(raw)
+
+    chain_table = []
+    records = []
+    for chain_key, tokens in registry.items():
+        chain_records = records_from_tokens(tokens)
+        chain_table.append((int(chain_key), len(records), len(chain_records)))
+        records.extend(chain_records)
+
+    symbols = {}
+    for record in records:
+        symbols.setdefault(record.symbol, len(symbols))
+    encoded_symbols = [symbol.encode("utf-8") for symbol in symbols]
+    offsets = [0]
+    for encoded in encoded_symbols:
+        offsets.append(offsets[-1] + len(encoded))
+    blob = b"".join(encoded_symbols)
+
+    n = len(records)
+    parts = [
+        HEADER.pack(MAGIC, hashlib.sha256(raw).digest(), len(chain_table), n, len(symbols), len(blob)),
+        b"".join(CHAIN_ENTRY.pack(*entry) for entry in chain_table),
+        struct.pack(f"<{n}I", *(record.chain_id for record in records)),
+        struct.pack(f"<{n}B", *(record.decimals for record in records)),
+        struct.pack(f"<{n}H", *(symbols[record.symbol] for record in records)),
+        b"".join(_encode_address(record.address) for record in records),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        blob,
+    ]
+
+    # Write then rename so running processes never map a half-written file
+    tmp_path = f"{snapshot_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(tmp_path, snapshot_path)
+    return n
+
+
+# ------------------------------
+# Loader
+# ------------------------------
+
+class TokenSnapshot:
+    """Read-only view over a memory-mapped snapshot file."""
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH):
+        with open(snapshot_path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.digest, n_chains, n, n_symbols, _ = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{snapshot_path} is not a token registry snapshot")
+
+        offset = HEADER.size
+        self.chain_table = {}
+        for _ in range(n_chains):
+            chain_id, start, count = CHAIN_ENTRY.unpack_from(self.buffer, offset)
+            self.chain_table[chain_id] = (start, count)
+            offset += CHAIN_ENTRY.size
+
+        self.chain_column = offset
+        self.decimals_column = self.chain_column + 4 * n
+        self.symbol_column = self.decimals_column + n
+        self.address_column = self.symbol_column + 2 * n
+        self.symbol_offsets = self.address_column + ADDRESS_WIDTH * n
+        self.symbol_blob = self.symbol_offsets + 4 * (n_symbols + 1)
+        self.symbols = [None] * n_symbols
+
+    def symbol(self, index):
+        """Decode an interned symbol, once per process."""
+        symbol = self.symbols[index]
+        if symbol is None:
+            start, end = struct.unpack_from("<II", self.buffer, self.symbol_offsets + 4 * index)
+            symbol = self.buffer[self.symbol_blob + start:self.symbol_blob + end].decode("utf-8")
+            self.symbols[index] = symbol
+        return symbol
+
+    def records(self, chain_id):
+        """Yield the TokenRecords of one chain straight from the mapped columns."""
+        start, count = self.chain_table[chain_id]
+        for row in range(start, start + count):
+            (token_chain_id,) = struct.unpack_from("<I", self.buffer, self.chain_column + 4 * row)
+            decimals = self.buffer[self.decimals_column + row]
+            (symbol_index,) = struct.unpack_from("<H", self.buffer, self.symbol_column + 2 * row)
+            address_start = self.address_column + ADDRESS_WIDTH * row
+            address = self.buffer[address_start:address_start + ADDRESS_WIDTH].rstrip(b"\0").decode("ascii")
+            yield TokenRecord(token_chain_id, address, self.symbol(symbol_index), decimals)
+
+
+class SnapshotTokenIndex(TokenIndex):
+    """TokenIndex whose per-chain lookup tables are built on first use from a snapshot."""
+
+    def __init__(self, snapshot):
+        super().__init__()
+        self.snapshot = snapshot
+
+    def chain_ids(self):
+        return list(self.snapshot.chain_table)
+
+    def chain(self, chain_id):
+        chain_id = int(chain_id)
+        chain = self.chains.get(chain_id)
+        if chain is None and chain_id in self.snapshot.chain_table:
+            chain = ChainTokens(self.snapshot.records(chain_id))
+            self.chains[chain_id] = chain
+        return chain
+
+    def has_chain(self, chain_id):
+        return int(chain_id) in self.snapshot.chain_table
+
+
+def load_token_index(json_path=REGISTRY_PATH, snapshot_path=SNAPSHOT_PATH):
+    """
+    Load the token index from the compiled snapshot when it matches the JSON,
+    falling back to parsing the JSON when the snapshot is missing or stale.
+    """
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = TokenSnapshot(snapshot_path)
+            if snapshot.digest == source_digest(json_path):
+                return SnapshotTokenIndex(snapshot)
+            print("Token registry snapshot is stale, run `python -m packages.token_snapshot` to rebuild it.")
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Error loading token registry snapshot: {e}")
+
+    with open(json_path, "r") as f:
+        return TokenIndex.from_registry(json.load(f))
+
+
+if __name__ == "__main__":
+    json_path = sys.argv[1] if len(sys.argv) > 1 else REGISTRY_PATH
+    snapshot_path = sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_PATH
+    count = build_snapshot(json_path, snapshot_path)
+    print(f"Wrote {count} tokens to {snapshot_path} ({os.path.getsize(snapshot_path)} bytes)")
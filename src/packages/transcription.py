@@ -0,0 +1,113 @@
+import asyncio
+import os
+from collections import OrderedDict
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+
+# ------------------------------
+# Voice Transcription
+# ------------------------------
+load_dotenv()
+
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "whisper-1")
+TRANSCRIBE_TIMEOUT = float(os.getenv("TRANSCRIBE_TIMEOUT", "30"))
+VOICE_MAX_CONCURRENT = int(os.getenv("VOICE_MAX_CONCURRENT", "4"))   # transcriptions in flight at once
+VOICE_CACHE_SIZE = int(os.getenv("VOICE_CACHE_SIZE", "256"))         # transcripts kept by file_unique_id
+
+
+class Transcriber:
+    """
+    Async Whisper transcription of voice notes held in memory.
+
+    Transcripts are cached by Telegram's `file_unique_id`, so a forwarded or
+    re-sent note isn't downloaded or transcribed again, and concurrent requests
+    for the same note share one upload. A semaphore bounds how many notes are
+    downloaded and transcribed at once.
+    """
+
+    def __init__(self, client, model=WHISPER_MODEL, max_concurrent=VOICE_MAX_CONCURRENT, cache_size=VOICE_CACHE_SIZE):
+        self.client = client
+        self.model = model
+        self.max_concurrent = max_concurrent
+        self.cache_size = cache_size
+        self.cache = OrderedDict()   # file_unique_id -> transcript
+        self.inflight = {}           # file_unique_id -> Future of the transcript
+        self.semaphore = None
+        self.loop = None
+        self.hits = 0
+        self.joined = 0
+        self.misses = 0
+
+    def _semaphore(self):
+        # asyncio primitives belong to one event loop; build it on the loop that uses it
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self.semaphore
+
+    async def _transcribe(self, download):
+        async with self._semaphore():
+            audio = await download()
+            response = await self.client.audio.transcriptions.create(
+                model=self.model,
+                file=("voice.ogg", bytes(audio)),
+            )
+        return response.text.strip()
+
+    async def transcribe(self, file_unique_id, download):
+        """
+        Transcript of the voice note `file_unique_id`.
+
+        `download` is an async callable returning the audio bytes; it's only
+        called when the transcript isn't cached or already being fetched. If
+        the request fetching it is cancelled, its waiters fetch it themselves.
+        """
+        while True:
+            if file_unique_id in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(file_unique_id)
+                return self.cache[file_unique_id]
+
+            future = self.inflight.get(file_unique_id)
+            if future is None:
+                break
+            self.joined += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise   # this waiter was cancelled, not the fetch
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[file_unique_id] = future
+        try:
+            text = await self._transcribe(download)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()   # mark retrieved; the waiters (if any) re-raise it
+            raise
+        finally:
+            self.inflight.pop(file_unique_id, None)
+
+        future.set_result(text)
+        self.cache[file_unique_id] = text
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return text
+
+    def stats(self):
+        return {
+            "cached": len(self.cache),
+            "in_flight": len(self.inflight),
+            "hits": self.hits,
+            "joined": self.joined,
+            "misses": self.misses,
+        }
+
+
+transcriber = Transcriber(AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=TRANSCRIBE_TIMEOUT, max_retries=1))
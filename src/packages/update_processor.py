@@ -0,0 +1,44 @@
+import asyncio
+from telegram.ext import BaseUpdateProcessor
+
+# ------------------------------
+# Per-User Update Processor
+# ------------------------------
+
+MAX_CONCURRENT_UPDATES = 256
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes updates from different users concurrently, but each user's
+    updates one at a time and in order.
+
+    A slow command (an RPC read, a quote, a broadcast) then doesn't stall
+    other users, while a user's own follow-ups, like tapping Confirm or
+    sending the next command, never race the one still running.
+    """
+
+    def __init__(self, max_concurrent_updates=MAX_CONCURRENT_UPDATES):
+        super().__init__(max_concurrent_updates)
+        self.users = {}   # user_id -> [lock, updates holding or waiting for it]
+
+    async def do_process_update(self, update, coroutine):
+        user = getattr(update, "effective_user", None)
+        if user is None:
+            await coroutine
+            return
+        entry = self.users.setdefault(user.id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.users[user.id]
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
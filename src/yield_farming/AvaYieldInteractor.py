@@ -2,12 +2,79 @@
 
 from web3 import Web3
 from eth_account import Account
+from eth_utils.abi import get_abi_output_types
 from decimal import Decimal
+from collections import OrderedDict
+from functools import lru_cache
 
 import json
 import os
+import sys
+import threading
+
+# Shared helpers live in src/packages; make them importable when run from yield_farming/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from packages.nonce_manager import nonce_manager
+from packages.fee_oracle import fee_oracle
+from packages.receipt_resolver import receipt_resolvers
+from packages.pool_state import PoolSnapshot, PoolState, pool_calls
+
+ABI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'abis', 'ava_yield.json')
+
+# Multicall3 is deployed at the same address on Avalanche and most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
+    {
+        "name": "aggregate3",
+        "type": "function",
+        "stateMutability": "payable",
+        "inputs": [{
+            "name": "calls", "type": "tuple[]",
+            "components": [
+                {"name": "target", "type": "address"},
+                {"name": "allowFailure", "type": "bool"},
+                {"name": "callData", "type": "bytes"},
+            ],
+        }],
+        "outputs": [{
+            "name": "returnData", "type": "tuple[]",
+            "components": [
+                {"name": "success", "type": "bool"},
+                {"name": "returnData", "type": "bytes"},
+            ],
+        }],
+    },
+    {
+        "name": "getEthBalance",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "addr", "type": "address"}],
+        "outputs": [{"name": "balance", "type": "uint256"}],
+    },
+]
+
+
+@lru_cache(maxsize=None)
+def load_abi():
+    """The strategy ABI, read and parsed once per process."""
+    with open(ABI_PATH, "r") as f:
+        return json.load(f)
+
+
+def share_of_rewards(total_rewards, my_shares, total_shares):
+    """The part of the pool's pending rewards (wei) that belongs to my_shares, in AVAX."""
+    if total_shares == 0:
+        return 0
+    return Web3.from_wei((my_shares / total_shares) * total_rewards, 'ether')
+
+
+def daily_rewards(snapshot):
+    """Estimated daily pool rewards in AVAX: the pending `checkReward()` value, which refreshes every ~24 hours."""
+    return Web3.from_wei(snapshot.total_rewards, 'ether')
+
+
 class AvaYieldInteractor:
-    def __init__(self, rpc_url, contract_address, private_key=None):
+    def __init__(self, rpc_url, contract_address, private_key=None, w3=None, contract=None, pool_state=None):
         """
         Initialize the AvaYield interactor
         
@@ -15,20 +82,89 @@ class AvaYieldInteractor:
             rpc_url (str): The Avalanche RPC URL
             contract_address (str): The deployed strategy contract address
             private_key (str, optional): Private key for signing transactions
+            w3 (Web3, optional): Shared Web3 instance (e.g. from packages.providers) to use
+                instead of opening a new provider for rpc_url
+            contract (Contract, optional): Shared contract object for contract_address on w3
+            pool_state (PoolState, optional): Shared pool snapshot to serve pool-wide values
+                from instead of reading them on every call
         """
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.w3 = w3 or Web3(Web3.HTTPProvider(rpc_url))
         self.contract_address = Web3.to_checksum_address(contract_address)
-        
-        base_path = os.path.dirname(os.path.abspath(__file__))
-        abi_path = os.path.join(base_path, 'abis', 'ava_yield.json')
-        with open(abi_path, "r") as f:
-            self.abi = json.load(f)
-
-        self.contract = self.w3.eth.contract(address=self.contract_address, abi=self.abi)
+        self.abi = load_abi()
+        self.contract = contract or self.w3.eth.contract(address=self.contract_address, abi=self.abi)
+        self.multicall = self.w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        self.pool_state = pool_state
         if private_key:
             self.account = Account.from_key(private_key)
         else:
             self.account = None
+        self._chain_id = None
+
+    """
+    ----------------------------------------------------------------------------
+    BATCHED READS
+    ----------------------------------------------------------------------------
+    """
+    def read(self, *calls, block_identifier="latest"):
+        """
+        Run view calls in one round-trip, all against the same block.
+
+        Args:
+            *calls: Bound contract functions, e.g. self.contract.functions.totalSupply()
+                or self.multicall.functions.getEthBalance(address)
+            block_identifier: Block to read at
+
+        Returns:
+            list: Decoded results in call order (a tuple for multi-value outputs).
+            Several calls go out as a single Multicall3 aggregate3 eth_call; if any
+            of them reverts the whole read raises.
+        """
+        if len(calls) == 1:
+            return [calls[0].call(block_identifier=block_identifier)]
+
+        requests = [(call.address, False, self.encode(call)) for call in calls]
+        results = self.multicall.functions.aggregate3(requests).call(block_identifier=block_identifier)
+        values = []
+        for call, (_, data) in zip(calls, results):
+            decoded = self.w3.codec.decode(get_abi_output_types(call.abi), data)
+            values.append(decoded[0] if len(decoded) == 1 else decoded)
+        return values
+
+    def encode(self, call):
+        """Calldata of a bound call on the strategy or Multicall3 contract."""
+        contract = self.multicall if call.address == MULTICALL3_ADDRESS else self.contract
+        return contract.encode_abi(call.fn_name, call.args, call.kwargs)
+
+    def pool_snapshot(self, *calls, min_block=None):
+        """
+        Pool-wide values plus any per-user `calls`, all as of the same block.
+
+        With a shared PoolState attached the pool values come from its snapshot
+        and only `calls` are read, pinned to the snapshot's block; otherwise
+        everything is read now in one batched call. `min_block` makes sure the
+        snapshot includes that block, e.g. a transaction that just confirmed.
+        RPCs that can't serve state at that block (pruned or lagging nodes)
+        get the calls at the latest block instead.
+
+        Returns:
+            PoolSnapshot, or (PoolSnapshot, [values of calls]) when calls are given.
+        """
+        if self.pool_state is not None:
+            snapshot = self.pool_state.get(min_block)
+            values = []
+            if calls:
+                try:
+                    values = self.read(*calls, block_identifier=snapshot.block_number)
+                except Exception as e:
+                    print(f"Read at block {snapshot.block_number} failed, reading the latest block: {e}")
+                    values = self.read(*calls)
+        else:
+            pool = pool_calls(self)
+            values = self.read(*pool, *calls)
+            snapshot = PoolSnapshot(None, *values[:len(pool)], None)
+            values = values[len(pool):]
+        return (snapshot, values) if calls else snapshot
+
     """
     ----------------------------------------------------------------------------
     READ FUNCTIONS (POOL)
@@ -37,25 +173,22 @@ class AvaYieldInteractor:
     """
     def get_apr(self):
         """
-        Fetch and calculate the estimated APR using only self.contract.
+        Fetch and calculate the estimated APR from one batched read.
 
         Returns:
             float: Estimated APR in percentage (%).
         """
         try:
-            # Get total deposits (TVL)
-            total_deposits = self.contract.functions.totalDeposits().call()
-            total_deposits = Web3.from_wei(total_deposits, 'ether')  # Convert to AVAX
+            # Total deposits (TVL) and pending rewards from the same block
+            snapshot = self.pool_snapshot()
+            total_deposits = Web3.from_wei(snapshot.total_deposits, 'ether')  # Convert to AVAX
 
             if total_deposits == 0:
                 print("No deposits in the strategy.")
                 return 0
 
-            # Get estimated daily rewards in AVAX
-            daily_rewards = self.estimate_daily_rewards()
-
             # Estimate yearly rewards (365 days)
-            estimated_annual_rewards = daily_rewards * 365
+            estimated_annual_rewards = daily_rewards(snapshot) * 365
 
             # Compute APR
             apr = (estimated_annual_rewards / total_deposits) * 100  # Convert to percentage
@@ -75,27 +208,16 @@ class AvaYieldInteractor:
             float: Estimated daily rewards in AVAX.
         """
         try:
-            initial_rewards = self.contract.functions.checkReward().call()
-            initial_rewards = Web3.from_wei(initial_rewards, 'ether')  # Convert to AVAX
-
-            # Assume rewards refresh every ~24 hours
-            return initial_rewards
+            return daily_rewards(self.pool_snapshot())
 
         except Exception as e:
             print(f"Error estimating daily rewards: {e}")
             return 0
 
-
-        except Exception as e:
-            print(f"Error fetching APR: {e}")
-            return None
-
-
     def get_pool_deposits(self):
         """Returns the total amount of AVAX deposited in the entire pool"""
         try:
-            total = self.contract.functions.totalDeposits().call()
-            return Web3.from_wei(total, 'ether')
+            return Web3.from_wei(self.pool_snapshot().total_deposits, 'ether')
         except Exception as e:
             print(f"Error getting total deposits: {e}")
             return None
@@ -103,8 +225,7 @@ class AvaYieldInteractor:
     def get_pool_rewards(self):
         """total pending AVAX rewards for the contract (pool as a whole), not just your rewards"""
         try:
-            rewards = self.contract.functions.checkReward().call()
-            return Web3.from_wei(rewards, 'ether')
+            return Web3.from_wei(self.pool_snapshot().total_rewards, 'ether')
         except Exception as e:
             print(f"Error checking rewards: {e}")
             return None
@@ -112,8 +233,7 @@ class AvaYieldInteractor:
     def get_leverage(self):
         """Get current leverage ratio"""
         try:
-            leverage = self.contract.functions.getActualLeverage().call()
-            return Decimal(leverage) / Decimal(1e18)
+            return Decimal(self.pool_snapshot().leverage) / Decimal(1e18)
         except Exception as e:
             print(f"Error getting leverage: {e}")
             return None
@@ -125,24 +245,19 @@ class AvaYieldInteractor:
     def get_my_balance(self):
         """Returns the number of shares you own in the staking pool."""
         try:
-            balance = self.contract.functions.balanceOf(self.account.address).call()
+            balance, = self.read(self.contract.functions.balanceOf(self.account.address))
             return Web3.from_wei(balance, 'ether')
         except Exception as e:
             print(f"Error checking balance: {e}")
             return None
 
-    def get_my_rewards(self):
-        """Returns the estimated pending rewards that belong to YOU."""
+    def get_my_rewards(self, min_block=None):
+        """Returns the estimated pending rewards that belong to YOU (as of min_block or later)."""
         try:
-            total_rewards = self.contract.functions.checkReward().call()  # Total pool rewards
-            my_shares = self.contract.functions.balanceOf(self.account.address).call()  # Your shares
-            total_shares = self.contract.functions.totalSupply().call()  # Total issued shares
-
-            if total_shares == 0:
-                return 0
-
-            my_rewards = (my_shares / total_shares) * total_rewards
-            return Web3.from_wei(my_rewards, 'ether')
+            # Pool rewards and total issued shares from the snapshot, your shares at the same block
+            snapshot, (my_shares,) = self.pool_snapshot(self.contract.functions.balanceOf(self.account.address),
+                                                        min_block=min_block)
+            return share_of_rewards(snapshot.total_rewards, my_shares, snapshot.total_supply)
         except Exception as e:
             print(f"Error checking your rewards: {e}")
             return None
@@ -150,11 +265,39 @@ class AvaYieldInteractor:
     def get_my_leverage(self):
         """Returns the leverage ratio applied to your staked AVAX."""
         try:
-            leverage = self.contract.functions.getActualLeverage().call()
-            return leverage / 1e18  # Convert from wei-based decimal format
+            return self.pool_snapshot().leverage / 1e18  # Convert from wei-based decimal format
         except Exception as e:
             print(f"Error checking leverage: {e}")
             return None
+
+    def get_my_position(self, min_block=None):
+        """
+        Everything the deposit / reinvest / withdraw previews need; pool values come
+        from the snapshot and the wallet and share balances from one batched read.
+
+        Returns:
+            dict: wallet_balance (AVAX in the wallet), my_shares, my_rewards,
+                pool_rewards, total_deposits and min_reinvest, all in AVAX and
+                read at the same block (min_block or later); None on error.
+        """
+        try:
+            address = self.account.address
+            snapshot, (wallet_balance, my_shares) = self.pool_snapshot(
+                self.multicall.functions.getEthBalance(address),
+                self.contract.functions.balanceOf(address),
+                min_block=min_block,
+            )
+            return {
+                "wallet_balance": Web3.from_wei(wallet_balance, 'ether'),
+                "my_shares": Web3.from_wei(my_shares, 'ether'),
+                "my_rewards": share_of_rewards(snapshot.total_rewards, my_shares, snapshot.total_supply),
+                "pool_rewards": Web3.from_wei(snapshot.total_rewards, 'ether'),
+                "total_deposits": Web3.from_wei(snapshot.total_deposits, 'ether'),
+                "min_reinvest": Web3.from_wei(snapshot.min_reinvest, 'ether'),
+            }
+        except Exception as e:
+            print(f"Error reading your position: {e}")
+            return None
         
 
     """
@@ -162,42 +305,69 @@ class AvaYieldInteractor:
     WRITE FUNCTIONS: deposit / withdraw / reinvest
     ----------------------------------------------------------------------------
     """
-    def deposit(self, amount_avax):
+    @property
+    def chain_id(self):
+        """Chain ID of the RPC endpoint, fetched once."""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+
+    def _send(self, contract_function, tx_params, wait=True):
+        """
+        Sign and send a contract call with a nonce from the shared nonce manager.
+
+        With wait=False the tx hash is returned right away, so several steps can
+        be broadcast back-to-back with consecutive nonces.
+        """
+        nonce = nonce_manager.allocate(self.w3, self.chain_id, self.account.address)
+        try:
+            transaction = contract_function.build_transaction({
+                'from': self.account.address,
+                'nonce': nonce,
+                'chainId': self.chain_id,
+                'gas': 2000000,  # gas limit
+                # EIP-1559 fees from the shared oracle, served from memory
+                **fee_oracle.get_fees(self.chain_id, self.w3),
+                **tx_params,
+            })
+
+            signed_txn = self.w3.eth.account.sign_transaction(transaction, self.account.key)
+            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        except Exception:
+            # The nonce wasn't used (or was taken elsewhere); read it from the chain next time
+            nonce_manager.resync(self.chain_id, self.account.address)
+            raise
+
+        if not wait:
+            return tx_hash
+        # One block scan per chain resolves every waiting transaction, instead of a polling loop each
+        return receipt_resolvers.get(self.w3).wait(tx_hash)
+
+    def deposit(self, amount_avax, wait=True):
         """
         Deposit AVAX into the strategy
         
         Args:
             amount_avax (float): Amount of AVAX to deposit
+            wait (bool): Wait for the receipt; if False return the tx hash
         """
         if not self.account:
             raise ValueError("Private key not provided - cannot sign transaction")
         
         try:
             amount_wei = Web3.to_wei(amount_avax, 'ether')
-            
-            transaction = self.contract.functions.deposit().build_transaction({
-                'from': self.account.address,
-                'value': amount_wei,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                'gas': 2000000,  # gas limit
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, self.account.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-
-            
-            return self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            return self._send(self.contract.functions.deposit(), {'value': amount_wei}, wait)
         except Exception as e:
             print(f"Error depositing: {e}")
             return None
 
-    def withdraw(self, amount_shares):
+    def withdraw(self, amount_shares, wait=True):
         """
         Withdraw from the strategy
         
         Args:
             amount_shares (float): Amount of shares to withdraw
+            wait (bool): Wait for the receipt; if False return the tx hash
         """
         if not self.account:
             raise ValueError("Private key not provided - cannot sign transaction")
@@ -207,40 +377,78 @@ class AvaYieldInteractor:
             
         try:
             amount_wei = Web3.to_wei(amount_shares, 'ether')
-            
-            transaction = self.contract.functions.withdraw(amount_wei).build_transaction({
-                'from': self.account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                'gas': 2000000,  # Adjust gas limit as needed
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, self.account.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-            
-            return self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            return self._send(self.contract.functions.withdraw(amount_wei), {}, wait)
         except Exception as e:
             print(f"Error withdrawing: {e}")
             return None
 
-    def reinvest(self):
-        """Reinvest accumulated rewards"""
+    def reinvest(self, wait=True):
+        """Reinvest accumulated rewards. With wait=False return the tx hash without waiting."""
         if not self.account:
             raise ValueError("Private key not provided - cannot sign transaction")
         
         try:
-            transaction = self.contract.functions.reinvest().build_transaction({
-                'from': self.account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                'gas': 2000000,  # Adjust gas limit as needed
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, self.account.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-            
-            return self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            return self._send(self.contract.functions.reinvest(), {}, wait)
         except Exception as e:
             print(f"Error reinvesting: {e}")
             return None
 
+
+class InteractorPool:
+    """
+    Process-wide AvaYieldInteractor handles.
+
+    Web3, the contract object and the PoolState snapshot are built once per
+    (rpc_url, contract_address) and shared; a handle per signing key only adds
+    the account on top, so
+    getting an interactor for a message costs a dict lookup and the RPC
+    connection stays warm. The least recently used handles are dropped
+    beyond max_handles.
+    """
+
+    def __init__(self, max_handles=1024):
+        self.max_handles = max_handles
+        self.lock = threading.Lock()
+        self.contracts = {}           # (rpc_url, contract_address) -> (w3, contract, pool_state)
+        self.handles = OrderedDict()  # (rpc_url, contract_address, private_key) -> AvaYieldInteractor
+
+    def get(self, rpc_url, contract_address, private_key=None, w3=None):
+        """
+        Interactor for `private_key` (read-only without one).
+
+        `w3` is only used the first time (rpc_url, contract_address) is seen;
+        later calls share the Web3 instance from then.
+        """
+        contract_address = Web3.to_checksum_address(contract_address)
+        key = (rpc_url, contract_address, private_key)
+        with self.lock:
+            interactor = self.handles.get(key)
+            if interactor is not None:
+                self.handles.move_to_end(key)
+                return interactor
+
+            w3, contract, pool_state = self._shared(rpc_url, contract_address, w3)
+            interactor = AvaYieldInteractor(rpc_url, contract_address, private_key, w3=w3, contract=contract,
+                                             pool_state=pool_state)
+            self.handles[key] = interactor
+            while len(self.handles) > self.max_handles:
+                self.handles.popitem(last=False)
+            return interactor
+
+    def _shared(self, rpc_url, contract_address, w3=None):
+        shared = self.contracts.get((rpc_url, contract_address))
+        if shared is None:
+            w3 = w3 or Web3(Web3.HTTPProvider(rpc_url))
+            contract = w3.eth.contract(address=contract_address, abi=load_abi())
+            # The snapshot is read through a read-only handle on the same contract
+            reader = AvaYieldInteractor(rpc_url, contract_address, w3=w3, contract=contract)
+            shared = self.contracts[(rpc_url, contract_address)] = (w3, contract, PoolState(reader))
+        return shared
+
+    def pool_state(self, rpc_url, contract_address, w3=None):
+        """The shared PoolState of a strategy contract, e.g. to start its refresh task."""
+        with self.lock:
+            return self._shared(rpc_url, Web3.to_checksum_address(contract_address), w3)[2]
+
+
+interactor_pool = InteractorPool()
@@ -0,0 +1,155 @@
+import unittest
+import os
+import sys
+from eth_abi import decode, encode
+from eth_account import Account
+from web3 import Web3
+from web3.providers import BaseProvider
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from AvaYieldInteractor import AvaYieldInteractor, InteractorPool, MULTICALL3_ADDRESS, load_abi
+
+RPC_URL = "http://127.0.0.1:9"   # never contacted: building contracts makes no RPC calls
+CONTRACT_ADDRESS = "0x8B414448de8B609e96bd63Dcf2A8aDbd5ddf7fdd"
+
+
+class TestInteractorPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = InteractorPool(max_handles=2)
+        self.keys = [Account.create().key.hex() for _ in range(3)]
+
+    def test_handles_share_web3_and_contract(self):
+        """Per-user handles only differ in their signer"""
+        w3 = Web3(Web3.HTTPProvider(RPC_URL))
+        first = self.pool.get(RPC_URL, CONTRACT_ADDRESS, self.keys[0], w3=w3)
+        second = self.pool.get(RPC_URL, CONTRACT_ADDRESS.lower(), self.keys[1])
+        self.assertIs(first.w3, w3)
+        self.assertIs(second.w3, w3)
+        self.assertIs(first.contract, second.contract)
+        self.assertIs(first.abi, load_abi())
+        self.assertNotEqual(first.account.address, second.account.address)
+
+    def test_handles_are_reused(self):
+        """The same key gets the same handle; the least recently used is evicted"""
+        first = self.pool.get(RPC_URL, CONTRACT_ADDRESS, self.keys[0])
+        self.assertIs(self.pool.get(RPC_URL, CONTRACT_ADDRESS, self.keys[0]), first)
+        self.pool.get(RPC_URL, CONTRACT_ADDRESS, self.keys[1])
+        self.pool.get(RPC_URL, CONTRACT_ADDRESS, self.keys[2])
+        self.assertIsNot(self.pool.get(RPC_URL, CONTRACT_ADDRESS, self.keys[0]), first)
+        self.assertEqual(len(self.pool.handles), 2)
+
+    def test_read_only_handle(self):
+        """Without a key the handle has no signer"""
+        self.assertIsNone(self.pool.get(RPC_URL, CONTRACT_ADDRESS).account)
+
+
+# Contract state served by FakeNode, by function signature (every value is a uint256)
+STATE = {
+    "checkReward()": 3 * 10 ** 18,
+    "balanceOf(address)": 2 * 10 ** 18,
+    "totalSupply()": 10 * 10 ** 18,
+    "totalDeposits()": 50 * 10 ** 18,
+    "MIN_TOKENS_TO_REINVEST()": 10 ** 17,
+    "getActualLeverage()": 25 * 10 ** 17,
+    "getEthBalance(address)": 7 * 10 ** 18,
+}
+SELECTORS = {Web3.keccak(text=signature)[:4]: value for signature, value in STATE.items()}
+
+
+class FakeNode(BaseProvider):
+    """JSON-RPC provider answering eth_call for the strategy and Multicall3 from STATE; `calls` lists the eth_calls made."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def _answer(self, data):
+        return encode(["uint256"], [SELECTORS[data[:4]]])
+
+    def make_request(self, method, params):
+        if method == "eth_chainId":
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(43114)}
+        if method == "eth_blockNumber":
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(100)}
+        self.calls.append(method)
+        assert method == "eth_call", method
+        tx = params[0]
+        data = bytes.fromhex(tx["data"][2:])
+        if tx["to"].lower() == MULTICALL3_ADDRESS.lower() and data[:4] == Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]:
+            (requests,) = decode(["(address,bool,bytes)[]"], data[4:])
+            result = encode(["(bool,bytes)[]"], [[(True, self._answer(call_data)) for _, _, call_data in requests]])
+        else:
+            result = self._answer(data)
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x" + result.hex()}
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+class PrunedNode(FakeNode):
+    """FakeNode that only serves eth_call at the latest block, like a node without archive state."""
+
+    def make_request(self, method, params):
+        if method == "eth_call" and params[1] != "latest":
+            self.calls.append(method)
+            return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "missing trie node"}}
+        return super().make_request(method, params)
+
+
+class TestBatchedReads(unittest.TestCase):
+    def setUp(self):
+        self.node = FakeNode()
+        self.strategy = AvaYieldInteractor(RPC_URL, CONTRACT_ADDRESS, Account.create().key.hex(), w3=Web3(self.node))
+
+    def test_read_aggregates_into_one_call(self):
+        """Several view calls cost one eth_call and decode in order"""
+        functions = self.strategy.contract.functions
+        values = self.strategy.read(functions.totalSupply(), functions.checkReward(), functions.totalDeposits())
+        self.assertEqual(values, [STATE["totalSupply()"], STATE["checkReward()"], STATE["totalDeposits()"]])
+        self.assertEqual(self.node.calls, ["eth_call"])
+
+    def test_getters_are_views_over_read(self):
+        """Getters keep their results while using one round-trip each"""
+        self.assertAlmostEqual(float(self.strategy.get_my_rewards()), 0.6)   # 2 of 10 shares of 3 AVAX
+        self.assertEqual(self.strategy.get_apr(), Web3.from_wei(STATE["checkReward()"], "ether") * 365 / 50 * 100)
+        self.assertEqual(self.strategy.get_leverage(), 2.5)
+        self.assertEqual(len(self.node.calls), 3)
+
+    def test_position(self):
+        """The preview figures come from a single aggregate3 call"""
+        position = self.strategy.get_my_position()
+        self.assertEqual(position["wallet_balance"], 7)
+        self.assertEqual(position["my_shares"], 2)
+        self.assertEqual(position["min_reinvest"], Web3.from_wei(10 ** 17, "ether"))
+        self.assertEqual(position["total_deposits"], 50)
+        self.assertEqual(self.node.calls, ["eth_call"])
+
+    def test_pool_values_come_from_the_shared_snapshot(self):
+        """Pooled handles serve pool values from one snapshot; each user only costs their own balance read"""
+        pool = InteractorPool()
+        w3 = Web3(self.node)
+        handles = [pool.get(RPC_URL, CONTRACT_ADDRESS, Account.create().key.hex(), w3=w3) for _ in range(5)]
+        pool.pool_state(RPC_URL, CONTRACT_ADDRESS).refresh()
+        self.node.calls.clear()
+        for handle in handles:
+            self.assertEqual(handle.get_pool_deposits(), 50)
+            self.assertEqual(handle.get_leverage(), 2.5)
+            self.assertEqual(handle.get_my_position()["min_reinvest"], Web3.from_wei(10 ** 17, "ether"))
+        self.assertEqual(self.node.calls, ["eth_call"] * 5)
+
+    def test_pinned_read_falls_back_to_latest(self):
+        """Per-user reads pinned to the snapshot's block are retried at the latest block if the node can't serve it"""
+        node = PrunedNode()
+        pool = InteractorPool()
+        handle = pool.get(RPC_URL, CONTRACT_ADDRESS, Account.create().key.hex(), w3=Web3(node))
+        pool.pool_state(RPC_URL, CONTRACT_ADDRESS).snapshot = self.strategy.pool_snapshot()._replace(
+            block_number=100, checked_at=pool.pool_state(RPC_URL, CONTRACT_ADDRESS).clock())
+        node.calls.clear()
+        self.assertEqual(handle.get_my_position()["my_shares"], 2)
+        self.assertEqual(node.calls, ["eth_call", "eth_call"])
+
+
+if __name__ == "__main__":
+    unittest.main()